@@ -1,16 +1,20 @@
 from flask import Flask, request
 from flask_cors import CORS
-from pymongo import MongoClient
 from pinecone import Pinecone
 from werkzeug.exceptions import HTTPException
 
 from config import Config
+from models.db import get_client
+from models.indexes import ensure_indexes
+from models.vector_outbox import VectorOutbox
 from routes.auth import auth_bp
 from routes.projects import projects_bp
 from routes.matching import matching_bp
 from routes.profile import profile_bp
 from routes.collaboration import collaboration_bp
 from routes.chat import chat_bp
+from services import scheduler
+from services.background_tasks import enqueue_job, queue_stats, start_workers
 from services.websocket_service import WebSocketService
 from utils.api_response import api_error, api_success
 from utils.rate_limit import InMemoryRateLimiter
@@ -25,8 +29,9 @@ def _client_ip() -> str:
 
 def _check_mongo() -> tuple[bool, str]:
     try:
-        client = MongoClient(Config.MONGODB_URI, serverSelectionTimeoutMS=2000)
-        client.admin.command("ping")
+        # Reuse the shared pool — a fresh client per probe means a new
+        # topology monitor and connection handshake every health check
+        get_client().admin.command("ping")
         return True, "ok"
     except Exception as exc:
         return False, str(exc)
@@ -47,6 +52,21 @@ def create_app() -> Flask:
     app = Flask(__name__)
     app.config.from_object(Config)
 
+    if Config.JOB_QUEUE_INPROCESS_WORKERS:
+        start_workers(Config.JOB_QUEUE_INPROCESS_WORKERS)
+
+    if Config.SCHEDULER_ENABLED:
+        scheduler.register_default_schedules()
+        scheduler.start()
+
+    if Config.MONGO_ENSURE_INDEXES:
+        # Off the request path: a slow or unreachable Mongo shouldn't block boot.
+        # One queued run at a time, however often processes restart.
+        try:
+            enqueue_job(ensure_indexes, dedupe_key="ensure-indexes")
+        except Exception as e:
+            print(f"[Indexes] Could not queue ensure_indexes: {e}")
+
     CORS(
         app,
         resources={
@@ -108,6 +128,15 @@ def create_app() -> Flask:
             message="Founding Mindset Portal API",
         )
 
+    @app.route("/api/health/jobs", methods=["GET"])
+    def job_queue_health():
+        try:
+            stats = queue_stats()
+            stats["vector_outbox"] = VectorOutbox.depth()
+        except Exception as exc:
+            return api_error("JOB_QUEUE_UNAVAILABLE", "Job queue stats unavailable", 503, {"error": str(exc)})
+        return api_success(stats, message="Job queue stats")
+
     @app.route("/api/ready", methods=["GET"])
     def readiness_check():
         mongo_ok, mongo_details = _check_mongo()
@@ -6,12 +6,27 @@ load_dotenv()
 class Config:
     MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
     DB_NAME = os.getenv('DB_NAME', 'TalentMatchDB')
+    # Shared MongoClient pool (models/db.py) — one client per process
+    MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', '50'))
+    MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', '0'))
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv('MONGO_MAX_IDLE_TIME_MS', '300000'))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000'))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.getenv('MONGO_CONNECT_TIMEOUT_MS', '5000'))
+    MONGO_SOCKET_TIMEOUT_MS = int(os.getenv('MONGO_SOCKET_TIMEOUT_MS', '0'))  # 0 = no timeout
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', '10000'))
+    MONGO_COMPRESSORS = os.getenv('MONGO_COMPRESSORS', 'zlib')  # e.g. "zstd,snappy,zlib"
+    MONGO_APP_NAME = os.getenv('MONGO_APP_NAME', 'talent-match-api')
+    # Apply models/indexes.py on startup (idempotent); also available via scripts/ensure_indexes.py
+    MONGO_ENSURE_INDEXES = os.getenv('MONGO_ENSURE_INDEXES', 'true').lower() == 'true'
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key')
     FLASK_ENV = os.getenv('FLASK_ENV', 'development')
     IS_PRODUCTION = FLASK_ENV == 'production'
     PORT = int(os.getenv('PORT', '5001'))
     HOST = os.getenv('HOST', '0.0.0.0')
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+    # Process-wide Gemini gateway limits (services/gemini_service.py); 0 rpm = unthrottled
+    GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', '4'))
+    GEMINI_REQUESTS_PER_MINUTE = int(os.getenv('GEMINI_REQUESTS_PER_MINUTE', '60'))
     FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:3000')
     FRONTEND_URLS = [url.strip() for url in os.getenv('FRONTEND_URLS', FRONTEND_URL).split(',') if url.strip()]
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', str(10 * 1024 * 1024)))
@@ -20,8 +35,75 @@ class Config:
     RATE_LIMIT_AUTH_WINDOW_SECONDS = int(os.getenv('RATE_LIMIT_AUTH_WINDOW_SECONDS', '60'))
     RATE_LIMIT_AUTH_MAX_REQUESTS = int(os.getenv('RATE_LIMIT_AUTH_MAX_REQUESTS', '20'))
     JWT_EXPIRATION_HOURS = 24
+    # token_required principal cache (0 disables)
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv('AUTH_PRINCIPAL_CACHE_TTL_SECONDS', '30'))
+    AUTH_PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv('AUTH_PRINCIPAL_CACHE_MAX_ENTRIES', '10000'))
+    # Durable job queue (services/background_tasks.py). In-process workers run
+    # inside the API; set to 0 and run scripts/run_worker.py separately instead.
+    JOB_QUEUE_INPROCESS_WORKERS = int(os.getenv('JOB_QUEUE_INPROCESS_WORKERS', '2'))
+    JOB_POLL_INTERVAL_SECONDS = float(os.getenv('JOB_POLL_INTERVAL_SECONDS', '1.0'))
+    JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', '120'))
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '5'))
+    JOB_RETRY_BASE_SECONDS = int(os.getenv('JOB_RETRY_BASE_SECONDS', '5'))
+    JOB_RETRY_MAX_SECONDS = int(os.getenv('JOB_RETRY_MAX_SECONDS', '900'))
+    JOB_RETENTION_SECONDS = int(os.getenv('JOB_RETENTION_SECONDS', str(24 * 3600)))
+    # Write user changes and their vector outbox entry in one transaction
+    # (needs a replica set); off = outbox entry first, then the user write
+    MONGO_TRANSACTIONS = os.getenv('MONGO_TRANSACTIONS', 'false').lower() == 'true'
+    # Vector outbox drain (services/vector_sync.py): coalescing delay after an
+    # edit, users per index batch, and the safety-net sweep interval
+    VECTOR_SYNC_DELAY_SECONDS = int(os.getenv('VECTOR_SYNC_DELAY_SECONDS', '2'))
+    VECTOR_SYNC_BATCH_SIZE = int(os.getenv('VECTOR_SYNC_BATCH_SIZE', '100'))
+    VECTOR_SYNC_INTERVAL_SECONDS = int(os.getenv('VECTOR_SYNC_INTERVAL_SECONDS', '60'))
+    # VectorService.build_index pipeline: users per encode call, concurrent
+    # upload requests, encoder processes (>1 = sentence-transformers
+    # multi-process pool) and encode-queue capacity in batches
+    VECTOR_ENCODE_BATCH_SIZE = int(os.getenv('VECTOR_ENCODE_BATCH_SIZE', '256'))
+    VECTOR_UPLOAD_WORKERS = int(os.getenv('VECTOR_UPLOAD_WORKERS', '4'))
+    VECTOR_ENCODE_PROCESSES = int(os.getenv('VECTOR_ENCODE_PROCESSES', '1'))
+    VECTOR_PIPELINE_QUEUE_SIZE = int(os.getenv('VECTOR_PIPELINE_QUEUE_SIZE', '4'))
+    # Multi-vector users: vector <id>#0 is the profile, <id>#1.. are
+    # overlapping resume windows (at most VECTOR_MAX_CHUNKS per user). Search
+    # over-fetches chunks and folds them per user: "max" or "softmax"
+    # (log-sum-exp, favours users with several matching chunks)
+    VECTOR_CHUNK_CHARS = int(os.getenv('VECTOR_CHUNK_CHARS', '1500'))
+    VECTOR_CHUNK_OVERLAP = int(os.getenv('VECTOR_CHUNK_OVERLAP', '200'))
+    VECTOR_MAX_CHUNKS = int(os.getenv('VECTOR_MAX_CHUNKS', '12'))
+    VECTOR_CHUNK_AGGREGATION = os.getenv('VECTOR_CHUNK_AGGREGATION', 'max')
+    VECTOR_CHUNK_OVERFETCH = int(os.getenv('VECTOR_CHUNK_OVERFETCH', '4'))
+    # Candidate retrieval for matching: "vector" (embeddings only), "rrf"
+    # (reciprocal rank fusion with the BM25 index in services/lexical_index.py)
+    # or "weighted" (blend of min-max normalised scores); the weights apply
+    # to both fused modes
+    MATCH_RETRIEVAL_MODE = os.getenv('MATCH_RETRIEVAL_MODE', 'rrf')
+    MATCH_VECTOR_WEIGHT = float(os.getenv('MATCH_VECTOR_WEIGHT', '0.7'))
+    MATCH_LEXICAL_WEIGHT = float(os.getenv('MATCH_LEXICAL_WEIGHT', '0.3'))
+    MATCH_RRF_K = int(os.getenv('MATCH_RRF_K', '60'))
+    # Leave other founders out of candidate retrieval (filtered in the index);
+    # off keeps them in the list, flagged is_founder
+    MATCH_EXCLUDE_FOUNDERS = os.getenv('MATCH_EXCLUDE_FOUNDERS', 'false').lower() == 'true'
+    # How often the in-memory BM25 index picks up users synced by other processes
+    LEXICAL_REFRESH_SECONDS = int(os.getenv('LEXICAL_REFRESH_SECONDS', '60'))
+    # ...and drops users deleted elsewhere (an id check of the whole index)
+    LEXICAL_RECONCILE_SECONDS = int(os.getenv('LEXICAL_RECONCILE_SECONDS', '600'))
+    # /api/projects/recommended: live projects ranked per user (top POOL from
+    # the project vector namespace), cached per user and profile vector
+    PROJECT_RECOMMENDATION_POOL = int(os.getenv('PROJECT_RECOMMENDATION_POOL', '200'))
+    PROJECT_RECOMMENDATION_CACHE_SECONDS = int(os.getenv('PROJECT_RECOMMENDATION_CACHE_SECONDS', '300'))
+    # Recurring jobs (services/scheduler.py); an interval of 0 disables the nightly precompute
+    SCHEDULER_ENABLED = os.getenv('SCHEDULER_ENABLED', 'true').lower() == 'true'
+    SESSION_CLEANUP_INTERVAL_SECONDS = int(os.getenv('SESSION_CLEANUP_INTERVAL_SECONDS', '3600'))
+    MATCH_PRECOMPUTE_INTERVAL_SECONDS = int(os.getenv('MATCH_PRECOMPUTE_INTERVAL_SECONDS', str(24 * 3600)))
+    # Match cache: past the soft TTL results are served stale and refreshed in
+    # the background; past the hard TTL they are recomputed before responding
+    MATCH_CACHE_SOFT_TTL_SECONDS = int(os.getenv('MATCH_CACHE_SOFT_TTL_SECONDS', str(6 * 3600)))
+    MATCH_CACHE_HARD_TTL_SECONDS = int(os.getenv('MATCH_CACHE_HARD_TTL_SECONDS', str(7 * 24 * 3600)))
     MAX_RESUME_SIZE = 10 * 1024 * 1024  # 10MB
     RESUME_UPLOAD_FOLDER = 'data/resumes'
+    # Resume text extraction stops once this many characters are collected
+    RESUME_TEXT_MAX_CHARS = int(os.getenv('RESUME_TEXT_MAX_CHARS', '12000'))
+    # Compression for models/resume_text.py: "zstd" (needs the zstandard package) or "zlib"
+    RESUME_TEXT_CODEC = os.getenv('RESUME_TEXT_CODEC', 'zstd')
 
     # Pinecone (replaces FAISS — shared cloud index visible to all devs/servers)
     PINECONE_API_KEY = os.getenv('PINECONE_API_KEY')
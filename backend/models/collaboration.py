@@ -1,11 +1,9 @@
-from pymongo import MongoClient
-from config import Config
+from models.db import get_collection
+from utils.pagination import ID_DESC, keyset_page
 from datetime import datetime
 from bson.objectid import ObjectId
 
-client = MongoClient(Config.MONGODB_URI)
-db = client[Config.DB_NAME]
-collaborations_collection = db['collaborations']
+collaborations_collection = get_collection('collaborations')
 
 class Collaboration:
     @staticmethod
@@ -55,6 +53,16 @@ class Collaboration:
             collab['_id'] = str(collab['_id'])
         return collabs
     
+    @staticmethod
+    def find_by_candidate_page(candidate_id, limit=None, cursor=None):
+        """One keyset page of a candidate's requests, newest first: (collabs, next_cursor)."""
+        collabs, next_cursor = keyset_page(
+            collaborations_collection, {"candidate_id": candidate_id}, ID_DESC, limit, cursor
+        )
+        for collab in collabs:
+            collab['_id'] = str(collab['_id'])
+        return collabs, next_cursor
+    
     @staticmethod
     def find_by_project(project_id):
         """Get all collaborations for a project"""
@@ -70,6 +78,16 @@ class Collaboration:
             collab["_id"] = str(collab["_id"])
         return collabs
     
+    @staticmethod
+    def find_by_founder_page(founder_id, limit=None, cursor=None):
+        """One keyset page of a founder's sent requests, newest first: (collabs, next_cursor)."""
+        collabs, next_cursor = keyset_page(
+            collaborations_collection, {"founder_id": founder_id}, ID_DESC, limit, cursor
+        )
+        for collab in collabs:
+            collab["_id"] = str(collab["_id"])
+        return collabs, next_cursor
+    
     @staticmethod
     def find_pending_by_candidate(candidate_id):
         """Get pending requests for a candidate"""
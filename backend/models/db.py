@@ -0,0 +1,107 @@
+import os
+import threading
+
+import gridfs
+from pymongo import MongoClient
+
+from config import Config
+
+# One pooled MongoClient per process. Models and services go through
+# get_collection() instead of creating their own clients at import time.
+_lock = threading.Lock()
+_client = None
+_client_pid = None
+_gridfs = None
+
+
+def _create_client():
+    options = {
+        "maxPoolSize": Config.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": Config.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": Config.MONGO_MAX_IDLE_TIME_MS,
+        "serverSelectionTimeoutMS": Config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": Config.MONGO_CONNECT_TIMEOUT_MS,
+        "waitQueueTimeoutMS": Config.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "appname": Config.MONGO_APP_NAME,
+        # Don't open sockets until first use so a pre-fork master never
+        # hands live connections to its workers
+        "connect": False,
+    }
+    if Config.MONGO_SOCKET_TIMEOUT_MS:
+        options["socketTimeoutMS"] = Config.MONGO_SOCKET_TIMEOUT_MS
+    if Config.MONGO_COMPRESSORS:
+        options["compressors"] = Config.MONGO_COMPRESSORS
+    return MongoClient(Config.MONGODB_URI, **options)
+
+
+def get_client():
+    global _client, _client_pid, _gridfs
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        with _lock:
+            if _client is None or _client_pid != pid:
+                _client = _create_client()
+                _client_pid = pid
+                _gridfs = None
+    return _client
+
+
+def get_db():
+    return get_client()[Config.DB_NAME]
+
+
+def get_gridfs():
+    global _gridfs
+    get_client()
+    if _gridfs is None:
+        _gridfs = gridfs.GridFS(get_db())
+    return _gridfs
+
+
+def reset_client():
+    """Close this process's client; the next get_client() call builds a fresh one."""
+    global _client, _client_pid, _gridfs
+    with _lock:
+        client, owner_pid = _client, _client_pid
+        _client, _client_pid, _gridfs = None, None, None
+    if client is not None and owner_pid == os.getpid():
+        client.close()
+
+
+def _reset_after_fork():
+    # The parent's sockets are not ours to close — just forget the client.
+    global _client, _client_pid, _gridfs, _lock
+    _lock = threading.Lock()
+    _client, _client_pid, _gridfs = None, None, None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class _LazyCollection:
+    """
+    Stand-in for a pymongo Collection that resolves against the current
+    process's client on every access, so module-level collection handles
+    stay valid across gunicorn's fork.
+    """
+
+    def __init__(self, name):
+        self._name = name
+
+    @property
+    def name(self):
+        return self._name
+
+    def __getattr__(self, attr):
+        return getattr(get_db()[self._name], attr)
+
+    def __getitem__(self, sub_name):
+        return get_db()[self._name][sub_name]
+
+    def __repr__(self):
+        return f"<LazyCollection {Config.DB_NAME}.{self._name}>"
+
+
+def get_collection(name):
+    return _LazyCollection(name)
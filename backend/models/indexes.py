@@ -0,0 +1,170 @@
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import PyMongoError
+
+from models.db import get_db
+
+# Declarative index registry: collection name -> indexes its queries rely on.
+# Every index is named explicitly so ensure_indexes() is idempotent and
+# check_indexes() can diff by name.
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("role", ASCENDING)], name="role"),
+        IndexModel([("resume_file_id", ASCENDING)], name="resume_file_id", sparse=True),
+        # generate_vectors.py --incremental / --since: keyset scan on (updated_at, _id)
+        IndexModel([("updated_at", ASCENDING), ("_id", ASCENDING)], name="updated_id"),
+    ],
+    "projects": [
+        # find_by_founder_page / get_live_projects_page keyset order (created_at, _id)
+        IndexModel([("founder_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="founder_created_id"),
+        IndexModel([("live", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="live_created_id"),
+    ],
+    "collaborations": [
+        # create_or_get_request / check_existing (prefix: project_id, candidate_id)
+        IndexModel(
+            [("project_id", ASCENDING), ("candidate_id", ASCENDING), ("founder_id", ASCENDING), ("status", ASCENDING)],
+            name="project_candidate_founder_status",
+        ),
+        # find_by_candidate, find_pending_by_candidate, get_user_projects
+        IndexModel([("candidate_id", ASCENDING), ("status", ASCENDING)], name="candidate_status"),
+        # find_by_candidate_page / find_by_founder_page keyset order (_id)
+        IndexModel([("candidate_id", ASCENDING), ("_id", DESCENDING)], name="candidate_id"),
+        IndexModel([("founder_id", ASCENDING), ("_id", DESCENDING)], name="founder_id"),
+        # find_by_project, get_team_members
+        IndexModel([("project_id", ASCENDING), ("status", ASCENDING)], name="project_status"),
+    ],
+    "messages": [
+        # get_project_messages (sorted by created_at), get_unread_count
+        IndexModel(
+            [("project_id", ASCENDING), ("dm_recipient_id", ASCENDING), ("created_at", DESCENDING)],
+            name="project_recipient_created",
+        ),
+        # get_dm_messages: each $or branch matches sender + recipient
+        IndexModel(
+            [("project_id", ASCENDING), ("sender_id", ASCENDING), ("dm_recipient_id", ASCENDING), ("created_at", DESCENDING)],
+            name="project_sender_recipient_created",
+        ),
+    ],
+    "sessions": [
+        IndexModel([("session_token", ASCENDING)], name="session_token_unique", unique=True),
+        IndexModel([("user_id", ASCENDING), ("active", ASCENDING)], name="user_active"),
+        # TTL: Mongo removes sessions once expires_at has passed
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    "matching_feedback": [
+        IndexModel(
+            [("project_id", ASCENDING), ("candidate_id", ASCENDING), ("created_at", DESCENDING)],
+            name="project_candidate_created",
+        ),
+        IndexModel([("founder_id", ASCENDING), ("created_at", DESCENDING)], name="founder_created"),
+    ],
+    "match_reasonings": [
+        # MatchCache.save / clear drop a project's reasonings by project_id
+        IndexModel([("project_id", ASCENDING)], name="project"),
+    ],
+    "jobs": [
+        # Worker.claim: ready jobs by priority, then oldest first
+        IndexModel([("status", ASCENDING), ("priority", DESCENDING), ("run_at", ASCENDING)], name="claim"),
+        # requeue_expired_leases
+        IndexModel([("status", ASCENDING), ("lease_until", ASCENDING)], name="status_lease"),
+        # enqueue_job(dedupe_key=...): one live job per key
+        IndexModel([("active_key", ASCENDING)], name="active_key_unique", unique=True, sparse=True),
+        IndexModel([("status", ASCENDING), ("finished_at", DESCENDING)], name="status_finished"),
+        # completed jobs are dropped after JOB_RETENTION_SECONDS; dead ones are kept
+        IndexModel([("expire_at", ASCENDING)], name="expire_at_ttl", expireAfterSeconds=0),
+    ],
+    "vector_outbox": [
+        # VectorOutbox.claim_batch: ready entries, oldest first
+        IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING), ("created_at", ASCENDING)], name="status_ready"),
+        IndexModel([("batch", ASCENDING)], name="batch", sparse=True),
+        # claim_batch: users that already have entries in flight
+        IndexModel([("status", ASCENDING), ("user_id", ASCENDING)], name="status_user"),
+    ],
+    "resume_texts": [
+        IndexModel([("user_id", ASCENDING), ("version", DESCENDING)], name="user_version"),
+    ],
+    "fs.files": [
+        # content-hash dedup lookup in ResumeFile.acquire (models/resume_file.py)
+        IndexModel([("sha256", ASCENDING)], name="sha256", sparse=True),
+    ],
+}
+
+# Representative hot-path queries and the index each should be served by,
+# used by check mode (and tests/test_query_plans.py) to assert the planner
+# picks that index rather than a collection scan.
+QUERY_PLANS = [
+    ("users", {"email": "probe@example.com"}, None, "email_unique"),
+    ("projects", {"founder_id": "probe"}, [("created_at", DESCENDING), ("_id", DESCENDING)], "founder_created_id"),
+    ("projects", {"live": True}, [("created_at", DESCENDING), ("_id", DESCENDING)], "live_created_id"),
+    ("collaborations", {"project_id": "probe", "candidate_id": "probe"}, None, "project_candidate_founder_status"),
+    ("collaborations", {"candidate_id": "probe", "status": "pending"}, None, "candidate_status"),
+    ("collaborations", {"founder_id": "probe"}, [("_id", DESCENDING)], "founder_id"),
+    ("collaborations", {"candidate_id": "probe"}, [("_id", DESCENDING)], "candidate_id"),
+    ("messages", {"project_id": "probe", "dm_recipient_id": None}, [("created_at", DESCENDING)],
+     "project_recipient_created"),
+    ("sessions", {"session_token": "probe", "active": True}, None, "session_token_unique"),
+    ("matching_feedback", {"project_id": "probe", "candidate_id": "probe"}, None, "project_candidate_created"),
+]
+
+
+def ensure_indexes(collections=None):
+    """Create any declared index that doesn't exist yet. Safe to run repeatedly."""
+    db = get_db()
+    created = {}
+    for name, indexes in INDEXES.items():
+        if collections and name not in collections:
+            continue
+        try:
+            created[name] = db[name].create_indexes(indexes)
+        except PyMongoError as e:
+            print(f"[indexes] Could not create indexes on {name}: {e}")
+            created[name] = []
+    return created
+
+
+def check_indexes():
+    """Return {collection: [missing index names]} for indexes not yet present."""
+    db = get_db()
+    missing = {}
+    for name, indexes in INDEXES.items():
+        existing = set(db[name].index_information().keys())
+        absent = [index.document["name"] for index in indexes if index.document["name"] not in existing]
+        if absent:
+            missing[name] = absent
+    return missing
+
+
+def _plan_stages(plan):
+    stages = [plan]
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            stages.extend(_plan_stages(plan[key]))
+    for child in plan.get("inputStages", []):
+        stages.extend(_plan_stages(child))
+    return stages
+
+
+def explain_query(collection, query, sort=None):
+    """
+    Winning plan of a query as (stage names, index names), e.g.
+    (['FETCH', 'IXSCAN'], ['email_unique']).
+    """
+    cursor = get_db()[collection].find(query)
+    if sort:
+        cursor = cursor.sort(sort)
+    plan = cursor.explain().get("queryPlanner", {}).get("winningPlan", {})
+    stages = _plan_stages(plan)
+    return (
+        [stage["stage"] for stage in stages if stage.get("stage")],
+        [stage["indexName"] for stage in stages if stage.get("indexName")],
+    )
+
+
+def check_query_plans():
+    """Return [(collection, query, stages)] for hot queries that COLLSCAN or miss their declared index."""
+    problems = []
+    for collection, query, sort, index_name in QUERY_PLANS:
+        stages, index_names = explain_query(collection, query, sort)
+        if "COLLSCAN" in stages or index_name not in index_names:
+            problems.append((collection, query, stages + index_names))
+    return problems
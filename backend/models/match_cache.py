@@ -0,0 +1,165 @@
+from models.db import get_collection
+from models.user import User
+from pymongo import ReplaceOne
+from datetime import datetime
+
+project_matches_collection = get_collection('project_matches')
+match_reasonings_collection = get_collection('match_reasonings')
+
+
+def _reasoning_ref(project_id, candidate_id):
+    return f"{project_id}:{candidate_id}"
+
+
+def _compact_row(project_id, match, profile_versions):
+    explanation = match.get("explanation", {})
+    return {
+        "candidate_id": match["user_id"],
+        "match_percentage": match.get("match_percentage", 0),
+        "vector_similarity": match.get("vector_similarity", 0),
+        "subscores": explanation.get("subscores", {}),
+        "llm_match_percentage": explanation.get("llm_match_percentage"),
+        "reasoning_ref": _reasoning_ref(project_id, match["user_id"]),
+        "profile_version": profile_versions.get(match["user_id"]),
+    }
+
+
+def _hydrate_row(row, user, reasoning, weights):
+    return {
+        "user_id": row["candidate_id"],
+        "name": user.get("name", ""),
+        "email": user.get("email", ""),
+        "role": user.get("role", "user"),
+        "is_founder": user.get("role", "user") == "founder",
+        "professional_title": user.get("professional_title", ""),
+        "skills": user.get("skills", []),
+        "bio": user.get("bio", ""),
+        "linkedin": user.get("linkedin", ""),
+        "resume": user.get("resume", ""),
+        "experience_years": user.get("experience_years", 0),
+        "match_percentage": row["match_percentage"],
+        "reasoning": reasoning.get("reasoning", ""),
+        "strengths": reasoning.get("strengths", []),
+        "concerns": reasoning.get("concerns", []),
+        "vector_similarity": row["vector_similarity"],
+        "explanation": {
+            "subscores": row["subscores"],
+            "weights": weights,
+            "llm_match_percentage": row["llm_match_percentage"],
+            "final_match_percentage": row["match_percentage"],
+        },
+        # the candidate edited their profile after this row was scored
+        "profile_updated": user.get("updated_at") != row.get("profile_version"),
+    }
+
+
+class MatchCache:
+    """
+    Match results for a project, stored as compact score rows outside the
+    project document. Candidate profile fields are never copied in; load()
+    joins them back from users with one batched query, so cards always show
+    the candidate's current profile. LLM reasoning text lives in
+    match_reasonings and is referenced by "project_id:candidate_id".
+    """
+
+    @staticmethod
+    def save(project_id, matches, weights=None, version=None):
+        project_id = str(project_id)
+        candidate_ids = [match["user_id"] for match in matches]
+        profile_versions = {
+            user_id: user.get("updated_at")
+            for user_id, user in User.find_many_by_ids(candidate_ids, {"updated_at": 1}).items()
+        }
+
+        # deterministic ids: upsert in place so concurrent saves of the same
+        # project never collide and readers never see rows without reasonings
+        if matches:
+            match_reasonings_collection.bulk_write([
+                ReplaceOne(
+                    {"_id": _reasoning_ref(project_id, match["user_id"])},
+                    {
+                        "project_id": project_id,
+                        "reasoning": match.get("reasoning", ""),
+                        "strengths": match.get("strengths", []),
+                        "concerns": match.get("concerns", []),
+                    },
+                    upsert=True,
+                )
+                for match in matches
+            ], ordered=False)
+
+        if weights is None and matches:
+            weights = matches[0].get("explanation", {}).get("weights")
+        project_matches_collection.replace_one(
+            {"_id": project_id},
+            {
+                "_id": project_id,
+                "rows": [_compact_row(project_id, match, profile_versions) for match in matches],
+                "weights": weights or {},
+                # what the rows were computed from; see MatchingService.cache_version
+                "version": version or {},
+                "cached_at": datetime.utcnow(),
+            },
+            upsert=True
+        )
+        # reasonings of candidates that dropped out of this result
+        match_reasonings_collection.delete_many({
+            "project_id": project_id,
+            "_id": {"$nin": [_reasoning_ref(project_id, candidate_id) for candidate_id in candidate_ids]},
+        })
+
+    @staticmethod
+    def load(project_id):
+        """Hydrated matches for a project, or None when nothing is cached."""
+        entry = MatchCache.load_entry(project_id)
+        return entry["matches"] if entry else None
+
+    @staticmethod
+    def load_entry(project_id):
+        """{"matches", "version", "cached_at"} for a project, or None when nothing is cached."""
+        doc = project_matches_collection.find_one({"_id": str(project_id)})
+        if not doc:
+            return None
+        rows = doc.get("rows", [])
+
+        users = User.find_many_by_ids([row["candidate_id"] for row in rows], "match")
+        reasonings = {
+            item["_id"]: item
+            for item in match_reasonings_collection.find({"_id": {"$in": [row["reasoning_ref"] for row in rows]}})
+        }
+
+        matches = []
+        for row in rows:
+            user = users.get(row["candidate_id"])
+            if not user:
+                # candidate account is gone; drop the row rather than show a blank card
+                continue
+            matches.append(_hydrate_row(row, user, reasonings.get(row["reasoning_ref"], {}), doc.get("weights", {})))
+        return {
+            "matches": matches,
+            "version": doc.get("version", {}),
+            "cached_at": doc.get("cached_at"),
+            "invalidated": bool(doc.get("invalidated_at")),
+        }
+
+    @staticmethod
+    def clear(project_id):
+        project_id = str(project_id)
+        match_reasonings_collection.delete_many({"project_id": project_id})
+        result = project_matches_collection.delete_one({"_id": project_id})
+        return result.deleted_count > 0
+
+    @staticmethod
+    def mark_all_stale():
+        """Flag every entry for revalidation without dropping it; the next save clears the flag."""
+        result = project_matches_collection.update_many(
+            {"invalidated_at": None},
+            {"$set": {"invalidated_at": datetime.utcnow()}}
+        )
+        return result.modified_count
+
+    @staticmethod
+    def clear_all():
+        match_reasonings_collection.delete_many({})
+        result = project_matches_collection.delete_many({})
+        return result.deleted_count
@@ -1,11 +1,8 @@
-from pymongo import MongoClient
-from config import Config
+from models.db import get_collection
 from datetime import datetime
 from bson.objectid import ObjectId
 
-client = MongoClient(Config.MONGODB_URI)
-db = client[Config.DB_NAME]
-messages_collection = db['messages']
+messages_collection = get_collection('messages')
 
 class Message:
     @staticmethod
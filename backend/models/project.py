@@ -1,11 +1,14 @@
-from pymongo import MongoClient
-from config import Config
+from models.db import get_collection
+from models.match_cache import MatchCache
+from utils.pagination import NEWEST_FIRST, iter_keyset_pages, keyset_page
 from datetime import datetime
 from bson.objectid import ObjectId
 
-client = MongoClient(Config.MONGODB_URI)
-db = client[Config.DB_NAME]
-projects_collection = db['projects']
+projects_collection = get_collection('projects')
+
+# Match results live in project_matches (models/match_cache.py); older
+# documents may still carry the embedded cached_matches array.
+LIST_PROJECTION = {"cached_matches": 0}
 
 class Project:
     @staticmethod
@@ -18,15 +21,21 @@ class Project:
             "live": False,
             "status": "pending",
             "collaboration_requests": [],
-            "cached_matches": None,
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
         }
 
         result = projects_collection.insert_one(project)
         project['_id'] = str(result.inserted_id)
+        Project._sync_vector(project['_id'])
         return project
 
+    @staticmethod
+    def _sync_vector(project_id):
+        """Queue the project-namespace vector update (services/project_recommendations.py)."""
+        from services.project_recommendations import queue_project_vector_sync
+        queue_project_vector_sync(project_id)
+
     @staticmethod
     def find_by_id(project_id):
         if not project_id or project_id == 'undefined' or project_id == 'null':
@@ -42,18 +51,34 @@ class Project:
             return None
 
     @staticmethod
-    def find_by_founder(founder_id):
-        projects = list(projects_collection.find({"founder_id": founder_id}))
-        for project in projects:
+    def find_many_by_ids(project_ids):
+        """{project_id: project} for all ids in one $in query (unknown/invalid ids are skipped)."""
+        object_ids = list({ObjectId(pid) for pid in project_ids if pid and ObjectId.is_valid(str(pid))})
+        if not object_ids:
+            return {}
+        projects = {}
+        for project in projects_collection.find({"_id": {"$in": object_ids}}):
             project['_id'] = str(project['_id'])
+            projects[project['_id']] = project
         return projects
 
+    @staticmethod
+    def find_by_founder_page(founder_id, limit=None, cursor=None):
+        """One keyset page of a founder's projects, newest first: (projects, next_cursor)."""
+        projects, next_cursor = keyset_page(
+            projects_collection, {"founder_id": founder_id}, NEWEST_FIRST, limit, cursor, LIST_PROJECTION
+        )
+        for project in projects:
+            project['_id'] = str(project['_id'])
+        return projects, next_cursor
+
     @staticmethod
     def update_status(project_id, live=True, status="approved"):
         result = projects_collection.update_one(
             {"_id": ObjectId(project_id)},
             {"$set": {"live": live, "status": status, "updated_at": datetime.utcnow()}}
         )
+        Project._sync_vector(project_id)
         return result.modified_count > 0
 
     @staticmethod
@@ -72,59 +97,72 @@ class Project:
         return result.modified_count > 0
 
     @staticmethod
-    def cache_matches(project_id, matches):
-        """Cache match results so they are consistent on page refresh."""
-        result = projects_collection.update_one(
+    def cache_analysis(project_id, description_hash, analysis):
+        """Store analyze_project_needs output keyed by the description it was computed from."""
+        cached = {"description_hash": description_hash, "result": analysis, "analyzed_at": datetime.utcnow()}
+        projects_collection.update_one(
             {"_id": ObjectId(project_id)},
-            {"$set": {
-                "cached_matches": matches,
-                "matches_cached_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow()
-            }}
+            {"$set": {"analysis": cached}}
         )
-        return result.modified_count > 0
+        # the project vector embeds the analysed skills
+        Project._sync_vector(project_id)
+        return cached
+
+    @staticmethod
+    def get_cached_match_entry(project_id):
+        """Cached matches plus the version and cached_at they were stored with, or None."""
+        return MatchCache.load_entry(project_id)
 
     @staticmethod
-    def clear_cached_matches(project_id):
+    def cache_matches(project_id, matches, version=None):
+        """Cache match results so they are consistent on page refresh."""
+        MatchCache.save(project_id, matches, version=version)
         result = projects_collection.update_one(
             {"_id": ObjectId(project_id)},
-            {"$set": {
-                "cached_matches": None,
-                "matches_cached_at": None,
-                "updated_at": datetime.utcnow()
-            }}
+            {
+                "$set": {"matches_cached_at": datetime.utcnow(), "updated_at": datetime.utcnow()},
+                "$unset": {"cached_matches": ""}
+            }
         )
         return result.modified_count > 0
 
     @staticmethod
-    def clear_all_cached_matches():
-        result = projects_collection.update_many(
-            {},
-            {"$set": {
-                "cached_matches": None,
-                "matches_cached_at": None,
-                "updated_at": datetime.utcnow()
-            }}
-        )
-        return result.modified_count
+    def mark_all_matches_stale():
+        """Candidate data changed: keep serving cached matches but refresh them on next read."""
+        return MatchCache.mark_all_stale()
 
     @staticmethod
     def update_project(project_id, update_fields):
         should_reset_cache = any(field in update_fields for field in ("description", "required_skills", "title"))
         update_fields["updated_at"] = datetime.utcnow()
+        update = {"$set": update_fields}
         if should_reset_cache:
-            update_fields["cached_matches"] = None
+            MatchCache.clear(project_id)
             update_fields["matches_cached_at"] = None
+            update["$unset"] = {"cached_matches": ""}
 
         result = projects_collection.update_one(
             {"_id": ObjectId(project_id)},
-            {"$set": update_fields}
+            update
         )
+        if should_reset_cache:
+            Project._sync_vector(project_id)
         return result.modified_count > 0
 
     @staticmethod
-    def get_all_live_projects():
-        projects = list(projects_collection.find({"live": True}))
+    def iter_live_project_pages(page_size=100):
+        """Stream every live project (full documents), newest first, page_size at a time."""
+        for projects in iter_keyset_pages(projects_collection, {"live": True}, NEWEST_FIRST, page_size):
+            for project in projects:
+                project['_id'] = str(project['_id'])
+            yield projects
+
+    @staticmethod
+    def get_live_projects_page(limit=None, cursor=None, projection=LIST_PROJECTION):
+        """One keyset page of live projects, newest first: (projects, next_cursor)."""
+        projects, next_cursor = keyset_page(
+            projects_collection, {"live": True}, NEWEST_FIRST, limit, cursor, projection
+        )
         for project in projects:
             project['_id'] = str(project['_id'])
-        return projects
+        return projects, next_cursor
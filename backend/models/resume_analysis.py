@@ -0,0 +1,41 @@
+from models.db import get_collection
+from models.resume_text import compress_text, decompress_text
+from bson.binary import Binary
+from datetime import datetime
+
+resume_analyses_collection = get_collection('resume_analyses')
+
+class ResumeAnalysis:
+    """
+    Parse output + LLM insights for a resume, keyed by SHA-256 of the file
+    bytes. The parsed text is stored compressed, as in resume_texts.
+    """
+
+    @staticmethod
+    def find_by_hash(sha256):
+        if not sha256:
+            return None
+        doc = resume_analyses_collection.find_one({"_id": sha256})
+        if doc:
+            doc.pop('_id', None)
+            if "resume_text_data" in doc:
+                doc["resume_text"] = decompress_text(doc.pop("resume_text_codec"), doc.pop("resume_text_data"))
+        return doc
+
+    @staticmethod
+    def save(sha256, resume_result):
+        """Store the user-independent part of a resume analysis."""
+        codec, data = compress_text(resume_result.get("resume_text", ""))
+        doc = {
+            "resume_text_codec": codec,
+            "resume_text_data": Binary(data),
+            "resume_analysis": resume_result.get("resume_analysis", {}),
+            "ai_insights": resume_result.get("ai_insights", {}),
+            "updated_at": datetime.utcnow()
+        }
+        resume_analyses_collection.update_one(
+            {"_id": sha256},
+            {"$set": doc, "$setOnInsert": {"created_at": datetime.utcnow()}, "$unset": {"resume_text": ""}},
+            upsert=True
+        )
+        return doc
@@ -0,0 +1,86 @@
+from models.db import get_collection, get_gridfs
+from bson.objectid import ObjectId
+
+# GridFS file documents (default "fs" bucket)
+resume_files_collection = get_collection('fs.files')
+
+
+class ResumeFile:
+    """
+    Content-addressed resume files in GridFS, shared by every user who
+    uploaded the same bytes. fs.files.refs counts the users pointing at a
+    file and only changes through atomic $inc; a file is deleted only by
+    the release that claims it at zero refs (setting `deleting`), and
+    acquire never reuses a file being deleted. A concurrent upload can
+    therefore not pick up a file that another request is removing.
+    """
+
+    @staticmethod
+    def _seed_refs(file_id):
+        """Files stored before refcounting: start refs at the users referencing them now."""
+        from models.user import User
+        resume_files_collection.update_one(
+            {"_id": file_id, "refs": {"$exists": False}},
+            {"$set": {"refs": User.count_resume_references(file_id)}}
+        )
+
+    @staticmethod
+    def acquire(file_bytes, sha256, filename, content_type, user_id):
+        """
+        File id for these bytes with one more reference: an existing file
+        with the same hash when there is one, otherwise a new GridFS file.
+        Call before pointing the user at it.
+        """
+        existing = resume_files_collection.find_one({"sha256": sha256, "deleting": {"$ne": True}}, {"refs": 1})
+        if existing:
+            if "refs" not in existing:
+                ResumeFile._seed_refs(existing["_id"])
+            reused = resume_files_collection.find_one_and_update(
+                {"_id": existing["_id"], "deleting": {"$ne": True}},
+                {"$inc": {"refs": 1}},
+                {"_id": 1}
+            )
+            if reused:
+                print(f"[ResumeFile] Reusing GridFS file {reused['_id']} for sha256 {sha256[:12]}")
+                return reused["_id"]
+
+        return get_gridfs().put(
+            file_bytes,
+            filename=filename,
+            content_type=content_type,
+            user_id=user_id,
+            sha256=sha256,
+            refs=1,
+        )
+
+    @staticmethod
+    def release(file_id):
+        """
+        Drop one reference (call after the user no longer points at the
+        file) and delete the file once nobody references it.
+        """
+        if not file_id:
+            return
+        file_id = ObjectId(file_id)
+        current = resume_files_collection.find_one({"_id": file_id}, {"refs": 1})
+        if current is None:
+            return
+        if "refs" in current:
+            resume_files_collection.update_one({"_id": file_id}, {"$inc": {"refs": -1}})
+        else:
+            # seeding counts current pointers, which already excludes the releasing user
+            ResumeFile._seed_refs(file_id)
+
+        claimed = resume_files_collection.find_one_and_update(
+            {"_id": file_id, "refs": {"$lte": 0}, "deleting": {"$ne": True}},
+            {"$set": {"deleting": True}},
+            {"_id": 1}
+        )
+        if not claimed:
+            print(f"[ResumeFile] GridFS file {file_id} still shared, keeping it")
+            return
+        try:
+            get_gridfs().delete(file_id)
+            print(f"[ResumeFile] Deleted GridFS file {file_id}")
+        except Exception as e:
+            print(f"[ResumeFile] Could not delete GridFS file {file_id}: {e}")
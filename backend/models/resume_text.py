@@ -0,0 +1,127 @@
+from models.db import get_collection
+from config import Config
+from datetime import datetime
+from bson.binary import Binary
+from pymongo.errors import BulkWriteError
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # optional: zlib is always available
+    zstandard = None
+
+resume_texts_collection = get_collection('resume_texts')
+
+# Version allocation retries when concurrent saves for one user collide
+SAVE_ATTEMPTS = 5
+DUPLICATE_KEY = 11000
+
+
+def _codec():
+    if Config.RESUME_TEXT_CODEC == "zstd" and zstandard is not None:
+        return "zstd"
+    return "zlib"
+
+
+def compress_text(text):
+    """(codec, bytes) for a text, with the configured codec."""
+    raw = text.encode('utf-8')
+    codec = _codec()
+    if codec == "zstd":
+        return codec, zstandard.ZstdCompressor(level=3).compress(raw)
+    return codec, zlib.compress(raw, 6)
+
+
+def decompress_text(codec, data):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("resume text stored with zstd but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(bytes(data)).decode('utf-8')
+    return zlib.decompress(bytes(data)).decode('utf-8')
+
+
+class ResumeText:
+    """
+    Parsed resume text, compressed and kept out of the users collection.
+    One document per (user_id, version); the latest two versions are retained.
+    Only the ATS, embedding and ranking paths load it.
+    """
+
+    @staticmethod
+    def _doc(user_id, version, text):
+        codec, data = compress_text(text)
+        return {
+            "_id": f"{user_id}:{version}",
+            "user_id": str(user_id),
+            "version": version,
+            "codec": codec,
+            "data": Binary(data),
+            "length": len(text),
+            "created_at": datetime.utcnow()
+        }
+
+    @staticmethod
+    def save(user_id, text):
+        """Store a new version of a user's resume text and return its version number."""
+        return ResumeText.save_many([(user_id, text)])[str(user_id)]
+
+    @staticmethod
+    def save_many(items):
+        """Bulk variant of save: [(user_id, text)] -> {user_id: version}."""
+        pending = {str(user_id): text for user_id, text in items}
+        versions = {}
+        for _ in range(SAVE_ATTEMPTS):
+            if not pending:
+                break
+            latest = {}
+            for doc in resume_texts_collection.find({"user_id": {"$in": list(pending)}}, {"user_id": 1, "version": 1}):
+                latest[doc["user_id"]] = max(latest.get(doc["user_id"], 0), doc["version"])
+            attempt = {user_id: latest.get(user_id, 0) + 1 for user_id in pending}
+            docs = [ResumeText._doc(user_id, attempt[user_id], text) for user_id, text in pending.items()]
+            conflicts = set()
+            try:
+                resume_texts_collection.insert_many(docs, ordered=False)
+            except BulkWriteError as e:
+                for error in e.details.get("writeErrors", []):
+                    if error.get("code") != DUPLICATE_KEY:
+                        raise
+                    # a concurrent save took this version; read the latest again
+                    conflicts.add(docs[error["index"]]["user_id"])
+            versions.update({user_id: version for user_id, version in attempt.items() if user_id not in conflicts})
+            pending = {user_id: pending[user_id] for user_id in conflicts}
+        if pending:
+            raise RuntimeError(f"Could not allocate resume text versions for {len(pending)} users")
+
+        # keep the previous version too: a concurrent save that lost the
+        # race may still point its user at it
+        resume_texts_collection.delete_many({
+            "$or": [{"user_id": user_id, "version": {"$lt": version - 1}} for user_id, version in versions.items()]
+        })
+        return versions
+
+    @staticmethod
+    def load(user_id, version=None):
+        """Latest (or a specific) version of a user's resume text, or ""."""
+        if version:
+            doc = resume_texts_collection.find_one({"_id": f"{user_id}:{version}"})
+        else:
+            doc = resume_texts_collection.find_one({"user_id": str(user_id)}, sort=[("version", -1)])
+        return decompress_text(doc["codec"], doc["data"]) if doc else ""
+
+    @staticmethod
+    def load_many(user_ids):
+        """{user_id: latest text} for every user that has one — a single query."""
+        user_ids = [str(user_id) for user_id in user_ids]
+        if not user_ids:
+            return {}
+        newest = {}
+        for doc in resume_texts_collection.find({"user_id": {"$in": user_ids}}):
+            current = newest.get(doc["user_id"])
+            if current is None or doc["version"] > current["version"]:
+                newest[doc["user_id"]] = doc
+        return {user_id: decompress_text(doc["codec"], doc["data"]) for user_id, doc in newest.items()}
+
+    @staticmethod
+    def delete_for_user(user_id):
+        result = resume_texts_collection.delete_many({"user_id": str(user_id)})
+        return result.deleted_count
@@ -1,11 +1,53 @@
-from pymongo import MongoClient
+from models.db import get_collection
+from models.resume_text import ResumeText
+from models.vector_outbox import VectorOutbox
 from config import Config
+from utils.pagination import ID_ASC, iter_keyset_pages
+from utils.ttl_cache import TTLCache
+from pymongo.errors import DuplicateKeyError
 import bcrypt
 from datetime import datetime
 
-client = MongoClient(Config.MONGODB_URI)
-db = client[Config.DB_NAME]
-users_collection = db['users']
+users_collection = get_collection('users')
+
+# Named read models for the user document. resume_text alone can be tens
+# of KB, so callers ask for the smallest profile that covers what they read.
+PROJECTIONS = {
+    # token_required principal: everything except the password hash and resume text
+    "auth": {"password": 0, "resume_text": 0},
+    # people cards in collaboration/team/project views
+    "card": {
+        "name": 1, "email": 1, "role": 1, "bio": 1, "skills": 1, "professional_title": 1,
+    },
+    # embedding + matching: every field _user_to_text / find_matches reads.
+    # resume_text itself lives in resume_texts (see attach_resume_text); the
+    # inline field is only present on documents not yet migrated.
+    "index": {
+        "name": 1, "email": 1, "role": 1, "bio": 1, "skills": 1, "professional_title": 1,
+        "location": 1, "experience_years": 1, "linkedin": 1, "resume": 1, "resume_text": 1,
+        "resume_version": 1, "updated_at": 1, "vector_synced_at": 1, "vector_text_hash": 1,
+    },
+    # hydrating cached match rows (models/match_cache.py)
+    "match": {
+        "name": 1, "email": 1, "role": 1, "bio": 1, "skills": 1, "professional_title": 1,
+        "linkedin": 1, "resume": 1, "experience_years": 1, "updated_at": 1,
+    },
+    "full": None,
+}
+
+# Fields whose change alters a user's vector text or metadata; writes that
+# touch one of them go through the vector outbox.
+VECTOR_FIELDS = {
+    "name", "email", "role", "bio", "skills", "professional_title", "location",
+    "experience_years", "linkedin", "resume", "resume_text", "resume_version",
+}
+
+# (user_id, jwt iat) -> principal. Short TTL bounds staleness across
+# workers; writes in this process invalidate immediately.
+principal_cache = TTLCache(
+    ttl_seconds=Config.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=Config.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES,
+)
 
 class User:
     @staticmethod
@@ -33,24 +75,100 @@ class User:
             "updated_at": datetime.utcnow()
         }
         
-        result = users_collection.insert_one(user)
-        user['_id'] = str(result.inserted_id)
+        # the outbox entry references the id, so assign it up front
+        from bson.objectid import ObjectId
+        user['_id'] = ObjectId()
+        try:
+            VectorOutbox.write_with_entry(
+                user['_id'], user['updated_at'],
+                lambda session: users_collection.insert_one(user, session=session)
+            )
+        except DuplicateKeyError:
+            # a concurrent signup won the unique email index; the stray outbox
+            # entry drains as a no-op removal
+            return None
+        user['_id'] = str(user['_id'])
         return user
     
     @staticmethod
-    def find_by_email(email):
-        user = users_collection.find_one({"email": email})
+    def projection(profile):
+        """Resolve a profile name ("auth", "card", "index", "match", "full") or pass a dict through."""
+        if profile is None or isinstance(profile, dict):
+            return profile
+        return PROJECTIONS[profile]
+
+    @staticmethod
+    def find_by_email(email, projection="full"):
+        user = users_collection.find_one({"email": email}, User.projection(projection))
         if user:
             user['_id'] = str(user['_id'])
         return user
     
     @staticmethod
-    def find_by_id(user_id):
+    def find_by_id(user_id, projection="full"):
         from bson.objectid import ObjectId
-        user = users_collection.find_one({"_id": ObjectId(user_id)})
+        user = users_collection.find_one({"_id": ObjectId(user_id)}, User.projection(projection))
         if user:
             user['_id'] = str(user['_id'])
         return user
+
+    @staticmethod
+    def find_many_by_ids(user_ids, projection="full"):
+        """{user_id: user} for all ids in one $in query (unknown/invalid ids are skipped)."""
+        from bson.objectid import ObjectId
+        object_ids = list({ObjectId(uid) for uid in user_ids if uid and ObjectId.is_valid(str(uid))})
+        if not object_ids:
+            return {}
+        users = {}
+        for user in users_collection.find({"_id": {"$in": object_ids}}, User.projection(projection)):
+            user['_id'] = str(user['_id'])
+            users[user['_id']] = user
+        return users
+
+    @staticmethod
+    def existing_ids(user_ids):
+        """The subset of user_ids that still exist, as strings (one $in query)."""
+        from bson.objectid import ObjectId
+        object_ids = [ObjectId(uid) for uid in user_ids if uid and ObjectId.is_valid(str(uid))]
+        if not object_ids:
+            return set()
+        return {str(user["_id"]) for user in users_collection.find({"_id": {"$in": object_ids}}, {"_id": 1})}
+
+    @staticmethod
+    def get_principal(user_id, issued_at=None):
+        """Slim user doc for token_required, served from a short-TTL cache."""
+        key = (str(user_id), issued_at)
+        cached = principal_cache.get(key)
+        if cached is not None:
+            return dict(cached)
+
+        user = User.find_by_id(user_id, "auth")
+        if user and Config.AUTH_PRINCIPAL_CACHE_TTL_SECONDS > 0:
+            principal_cache.set(key, user)
+        return dict(user) if user else None
+
+    @staticmethod
+    def invalidate_principal(user_id):
+        principal_cache.invalidate_group(str(user_id))
+
+    @staticmethod
+    def get_resume_text(user_id):
+        """Load resume text from side storage, falling back to a legacy inline field."""
+        from bson.objectid import ObjectId
+        text = ResumeText.load(user_id)
+        if text:
+            return text
+        user = users_collection.find_one({"_id": ObjectId(user_id)}, {"resume_text": 1})
+        return (user or {}).get("resume_text", "")
+
+    @staticmethod
+    def attach_resume_text(users):
+        """Fill user["resume_text"] for a list of users with one side-storage query."""
+        texts = ResumeText.load_many([u["_id"] for u in users if u.get("resume_version")])
+        for user in users:
+            if str(user["_id"]) in texts:
+                user["resume_text"] = texts[str(user["_id"])]
+        return users
     
     @staticmethod
     def verify_password(stored_password, provided_password):
@@ -58,38 +176,89 @@ class User:
     
     @staticmethod
     def update_role(user_id, new_role):
-        from bson.objectid import ObjectId
-        result = users_collection.update_one(
-            {"_id": ObjectId(user_id)},
-            {"$set": {"role": new_role, "updated_at": datetime.utcnow()}}
-        )
-        return result.modified_count > 0
+        return User.update_profile(user_id, {"role": new_role})
     
     @staticmethod
-    def update_profile(user_id, update_data):
+    def update_profile(user_id, update_data, unset_fields=None):
         """Update user profile fields"""
         from bson.objectid import ObjectId
         
         update_data['updated_at'] = datetime.utcnow()
-        
-        result = users_collection.update_one(
-            {"_id": ObjectId(user_id)},
-            {"$set": update_data}
-        )
+        update = {"$set": update_data}
+        if unset_fields:
+            update["$unset"] = {field: "" for field in unset_fields}
+
+        def write(session):
+            return users_collection.update_one({"_id": ObjectId(user_id)}, update, session=session)
+
+        if VECTOR_FIELDS.intersection(update_data) or VECTOR_FIELDS.intersection(unset_fields or []):
+            result = VectorOutbox.write_with_entry(user_id, update_data['updated_at'], write)
+        else:
+            result = write(None)
+        User.invalidate_principal(user_id)
         return result.modified_count > 0
+
+    @staticmethod
+    def swap_resume_file(user_id, update_data, unset_fields=None):
+        """
+        update_profile for writes that repoint resume_file_id. The swap is
+        one find_one_and_update, so it returns exactly the resume_file_id
+        this write replaced (None if there was none): concurrent uploads and
+        deletes each release only the file they displaced.
+        """
+        from bson.objectid import ObjectId
+        from pymongo import ReturnDocument
+
+        update_data['updated_at'] = datetime.utcnow()
+        update = {"$set": update_data}
+        if unset_fields:
+            update["$unset"] = {field: "" for field in unset_fields}
+
+        def write(session):
+            return users_collection.find_one_and_update(
+                {"_id": ObjectId(user_id)}, update, {"resume_file_id": 1},
+                return_document=ReturnDocument.BEFORE, session=session
+            )
+
+        previous = VectorOutbox.write_with_entry(user_id, update_data['updated_at'], write)
+        User.invalidate_principal(user_id)
+        return (previous or {}).get("resume_file_id")
+
+    @staticmethod
+    def mark_vector_synced(user_id, synced_updated_at, text_hash=None):
+        """Record that the index holds the user's state as of synced_updated_at (never moves back)."""
+        from bson.objectid import ObjectId
+        update = {"vector_synced_at": synced_updated_at}
+        if text_hash:
+            update["vector_text_hash"] = text_hash
+        users_collection.update_one(
+            {"_id": ObjectId(user_id), "$or": [
+                {"vector_synced_at": None},
+                {"vector_synced_at": {"$lte": synced_updated_at}}
+            ]},
+            {"$set": update}
+        )
     
     @staticmethod
-    def get_all_users(exclude_user_id=None, role_filter=None):
-        query = {}
+    def count_resume_references(file_id, exclude_user_id=None):
+        """How many users point at a (possibly shared) GridFS resume file."""
+        query = {"resume_file_id": str(file_id)}
         if exclude_user_id:
             from bson.objectid import ObjectId
             query["_id"] = {"$ne": ObjectId(exclude_user_id)}
-        if role_filter:
-            query["role"] = role_filter
-        
-        users = list(users_collection.find(query))
-        for user in users:
-            user['_id'] = str(user['_id'])
-            if 'password' in user:
-                del user['password']
-        return users
\ No newline at end of file
+        return users_collection.count_documents(query)
+    
+    @staticmethod
+    def iter_user_pages(projection="index", page_size=500, query=None, order=ID_ASC, after=None):
+        """
+        Stream users in keyset `order`, page_size at a time, for batch jobs.
+        Memory stays bounded by one page regardless of collection size.
+        """
+        fields = User.projection(projection)
+        if fields is None:
+            fields = {"password": 0}
+        for users in iter_keyset_pages(users_collection, query or {}, order, page_size, fields, after):
+            for user in users:
+                user['_id'] = str(user['_id'])
+                user.pop('password', None)
+            yield users
@@ -0,0 +1,180 @@
+from models.db import get_client, get_collection
+from config import Config
+from datetime import datetime, timedelta
+from bson.objectid import ObjectId
+import random
+
+vector_outbox_collection = get_collection('vector_outbox')
+
+PENDING = "pending"
+PROCESSING = "processing"
+DEAD = "dead"
+
+# Dedupe key of the drain job, shared by notify() and the scheduled sweep so
+# at most one drain is queued or running
+SYNC_JOB_KEY = "vector-outbox-sync"
+
+
+class VectorOutbox:
+    """
+    Pending vector-index changes, one entry per user mutation. Entries are
+    written together with the user write (in a transaction when
+    MONGO_TRANSACTIONS is on) and drained by services/vector_sync.py. Each
+    entry carries the user's updated_at so replays are idempotent.
+    """
+
+    @staticmethod
+    def record(user_id, updated_at, op="upsert", session=None):
+        vector_outbox_collection.insert_one({
+            "user_id": str(user_id),
+            "op": op,
+            "updated_at": updated_at,
+            "status": PENDING,
+            "attempts": 0,
+            "next_attempt_at": datetime.utcnow(),
+            "created_at": datetime.utcnow()
+        }, session=session)
+
+    @staticmethod
+    def record_many(items, op="upsert"):
+        """Bulk record: one entry per (user_id, updated_at), for batch writers such as imports."""
+        now = datetime.utcnow()
+        docs = [
+            {
+                "user_id": str(user_id),
+                "op": op,
+                "updated_at": updated_at,
+                "status": PENDING,
+                "attempts": 0,
+                "next_attempt_at": now,
+                "created_at": now
+            }
+            for user_id, updated_at in items
+        ]
+        if docs:
+            vector_outbox_collection.insert_many(docs, ordered=False)
+
+    @staticmethod
+    def write_with_entry(user_id, updated_at, write, op="upsert"):
+        """
+        Run write(session) and record an outbox entry atomically. Without
+        transactions the entry goes first: a stray entry only causes a
+        redundant re-sync of the current user state, a missing one would
+        leave the index stale.
+        """
+        if Config.MONGO_TRANSACTIONS:
+            with get_client().start_session() as session:
+                def run(txn_session):
+                    result = write(txn_session)
+                    VectorOutbox.record(user_id, updated_at, op, session=txn_session)
+                    return result
+                result = session.with_transaction(run)
+        else:
+            VectorOutbox.record(user_id, updated_at, op)
+            result = write(None)
+        VectorOutbox.notify()
+        return result
+
+    @staticmethod
+    def notify():
+        """Queue a drain soon; edits made before it runs share one batch."""
+        from services.background_tasks import enqueue_job
+        from services.vector_sync import sync_vector_outbox
+        try:
+            enqueue_job(sync_vector_outbox, delay_seconds=Config.VECTOR_SYNC_DELAY_SECONDS, dedupe_key=SYNC_JOB_KEY)
+        except Exception as e:
+            # the scheduled drain picks the entry up regardless
+            print(f"[VectorOutbox] Could not queue sync: {e}")
+
+    @staticmethod
+    def claim_batch(limit):
+        """
+        Lease up to `limit` due entries. Users with entries already being
+        processed are skipped, so two drains never write one user's vectors
+        concurrently (and an older state can't land after a newer one).
+        """
+        now = datetime.utcnow()
+        vector_outbox_collection.update_many(
+            {"status": PROCESSING, "lease_until": {"$lt": now}},
+            {"$set": {"status": PENDING}}
+        )
+        busy = vector_outbox_collection.distinct("user_id", {"status": PROCESSING})
+        ids = [
+            doc["_id"] for doc in vector_outbox_collection.find(
+                {"status": PENDING, "next_attempt_at": {"$lte": now}, "user_id": {"$nin": busy}}, {"_id": 1}
+            ).sort("created_at", 1).limit(limit)
+        ]
+        if not ids:
+            return []
+        batch = ObjectId()
+        vector_outbox_collection.update_many(
+            {"_id": {"$in": ids}, "status": PENDING},
+            {"$set": {
+                "status": PROCESSING,
+                "batch": batch,
+                "lease_until": now + timedelta(seconds=Config.JOB_LEASE_SECONDS)
+            }}
+        )
+        claimed = list(vector_outbox_collection.find({"batch": batch, "status": PROCESSING}))
+
+        # another drain may have claimed entries of the same users in between
+        contested = set(vector_outbox_collection.distinct("user_id", {
+            "user_id": {"$in": list({entry["user_id"] for entry in claimed})},
+            "status": PROCESSING,
+            "batch": {"$ne": batch},
+        }))
+        if contested:
+            vector_outbox_collection.update_many(
+                {"batch": batch, "user_id": {"$in": list(contested)}},
+                {"$set": {"status": PENDING}, "$unset": {"batch": ""}}
+            )
+            claimed = [entry for entry in claimed if entry["user_id"] not in contested]
+        return claimed
+
+    @staticmethod
+    def complete(entry_ids):
+        if entry_ids:
+            vector_outbox_collection.delete_many({"_id": {"$in": list(entry_ids)}})
+
+    @staticmethod
+    def defer(entries):
+        """Put entries back for another look shortly (their user write hasn't landed yet)."""
+        for entry in entries:
+            vector_outbox_collection.update_one(
+                {"_id": entry["_id"]},
+                {
+                    "$set": {
+                        "status": PENDING,
+                        "next_attempt_at": datetime.utcnow() + timedelta(seconds=Config.VECTOR_SYNC_DELAY_SECONDS),
+                    },
+                    "$inc": {"attempts": 1},
+                    "$unset": {"batch": ""},
+                }
+            )
+
+    @staticmethod
+    def retry(entries, error):
+        """Back off failed entries; returns the user ids whose entries are now dead."""
+        dead_users = set()
+        for entry in entries:
+            attempts = entry.get("attempts", 0) + 1
+            if attempts >= Config.JOB_MAX_ATTEMPTS:
+                update = {"status": DEAD, "attempts": attempts, "last_error": error}
+                dead_users.add(entry["user_id"])
+            else:
+                delay = min(Config.JOB_RETRY_MAX_SECONDS, Config.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+                update = {
+                    "status": PENDING,
+                    "attempts": attempts,
+                    "last_error": error,
+                    "next_attempt_at": datetime.utcnow() + timedelta(seconds=delay * random.uniform(0.8, 1.2)),
+                }
+            vector_outbox_collection.update_one({"_id": entry["_id"]}, {"$set": update, "$unset": {"batch": ""}})
+        return dead_users
+
+    @staticmethod
+    def depth():
+        counts = {PENDING: 0, PROCESSING: 0, DEAD: 0}
+        for row in vector_outbox_collection.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}]):
+            counts[row["_id"]] = row["count"]
+        return counts
@@ -1,20 +1,13 @@
 from flask import Blueprint, request
 from models.user import User
 from config import Config
-from services.vector_service import VectorService
 import jwt
 from datetime import datetime, timedelta
 from functools import wraps
 from utils.api_response import api_error, api_success, validation_error
 from utils.validation import validate_required_fields
-from services.background_tasks import enqueue
 
 auth_bp = Blueprint('auth', __name__)
-try:
-    vector_service = VectorService()
-except Exception as exc:
-    vector_service = None
-    print(f"[Auth] Vector service unavailable at startup: {exc}")
 
 
 def token_required(f):
@@ -30,7 +23,7 @@ def token_required(f):
                 token = token.split(' ')[1]
             
             data = jwt.decode(token, Config.SECRET_KEY, algorithms=["HS256"])
-            current_user = User.find_by_id(data['user_id'])
+            current_user = User.get_principal(data['user_id'], data.get('iat'))
             
             if not current_user:
                 return api_error("USER_NOT_FOUND", "User not found", 401)
@@ -45,14 +38,13 @@ def token_required(f):
     return decorated
 
 
-def _vectorize_new_user(user: dict):
-    if vector_service is None:
-        return
-    try:
-        vector_service.upsert_user(user)
-        print(f"[Auth] Vectorized new user {user['_id']}")
-    except Exception as e:
-        print(f"[Auth] Warning: Failed to vectorize new user {user['_id']}: {e}")
+def _issue_token(user_id):
+    now = datetime.utcnow()
+    return jwt.encode({
+        'user_id': user_id,
+        'iat': now,
+        'exp': now + timedelta(hours=Config.JWT_EXPIRATION_HOURS)
+    }, Config.SECRET_KEY, algorithm="HS256")
 
 
 @auth_bp.route('/signup', methods=['POST'])
@@ -76,18 +68,14 @@ def signup():
     if not user:
         return api_error("USER_EXISTS", "User already exists", 409)
 
-    # Vectorize in background — signup doesn't wait for Pinecone
-    enqueue(_vectorize_new_user, user)
+    # User.create queued the vector upsert via the outbox — signup doesn't wait for Pinecone
 
     # Remove password from response
     if 'password' in user:
         del user['password']
     
     # Generate token
-    token = jwt.encode({
-        'user_id': user['_id'],
-        'exp': datetime.utcnow() + timedelta(hours=Config.JWT_EXPIRATION_HOURS)
-    }, Config.SECRET_KEY, algorithm="HS256")
+    token = _issue_token(user['_id'])
     
     return api_success({
         "user": user,
@@ -118,10 +106,7 @@ def login():
         del user['password']
     
     # Generate token
-    token = jwt.encode({
-        'user_id': user['_id'],
-        'exp': datetime.utcnow() + timedelta(hours=Config.JWT_EXPIRATION_HOURS)
-    }, Config.SECRET_KEY, algorithm="HS256")
+    token = _issue_token(user['_id'])
     
     return api_success({"user": user, "token": token}, message="Login successful", code="LOGIN_SUCCESS")
 
@@ -5,16 +5,20 @@ from models.project import Project
 from models.user import User
 from routes.auth import token_required
 from services.websocket_service import ws_service
-from utils.api_response import api_error, api_success, unauthorized_error
+from utils.api_response import api_error, api_success, unauthorized_error, validation_error
 from utils.authz import has_project_access, require_founder
+from utils.loaders import project_loader, user_loader
+from utils.pagination import InvalidCursor, parse_page_args
 from utils.validation import validate_required_fields
 
 collaboration_bp = Blueprint("collaboration", __name__)
 
 
 def _enrich_request(req: dict):
-    project = Project.find_by_id(req["project_id"])
-    founder = User.find_by_id(req["founder_id"])
+    # Callers prime the loaders with every request's ids, so a whole list
+    # resolves with one projects query and one users query
+    project = project_loader().load(req["project_id"])
+    founder = user_loader().load(req["founder_id"])
     if not project or not founder:
         return None
     return {
@@ -51,7 +55,7 @@ def _send_collaboration_request_impl(current_user, data):
     if not require_founder(project, current_user["_id"]):
         return unauthorized_error("You can only send requests for your own projects", {"project_id": project_id})
 
-    candidate = User.find_by_id(candidate_id)
+    candidate = User.find_by_id(candidate_id, "card")
     if not candidate:
         return api_error("CANDIDATE_NOT_FOUND", "Candidate not found", 404)
     if candidate.get("role") == "founder":
@@ -98,9 +102,18 @@ def send_collaboration_request(current_user):
 @collaboration_bp.route("/my-requests", methods=["GET"])
 @token_required
 def get_my_requests(current_user):
-    requests = Collaboration.find_by_candidate(current_user["_id"])
+    limit, cursor = parse_page_args(request.args)
+    try:
+        requests, next_cursor = Collaboration.find_by_candidate_page(current_user["_id"], limit=limit, cursor=cursor)
+    except InvalidCursor as exc:
+        return validation_error(str(exc))
+    project_loader().prime(req["project_id"] for req in requests)
+    user_loader().prime(req["founder_id"] for req in requests)
     enriched_requests = [item for item in (_enrich_request(req) for req in requests) if item]
-    return api_success({"requests": enriched_requests}, message="Requests fetched")
+    return api_success(
+        {"requests": enriched_requests, "paging": {"limit": limit, "next_cursor": next_cursor}},
+        message="Requests fetched",
+    )
 
 
 @collaboration_bp.route("/sent-requests/<project_id>", methods=["GET"])
@@ -125,10 +138,23 @@ def get_sent_requests_for_project(current_user, project_id):
 @collaboration_bp.route("/history", methods=["GET"])
 @token_required
 def request_history(current_user):
-    sent = Collaboration.find_by_founder(current_user["_id"])
-    received = Collaboration.find_by_candidate(current_user["_id"])
+    # sent and received page independently: ?sent_cursor= / ?received_cursor=
+    limit, _ = parse_page_args(request.args)
+    try:
+        sent, sent_next = Collaboration.find_by_founder_page(
+            current_user["_id"], limit=limit, cursor=request.args.get("sent_cursor") or None
+        )
+        received, received_next = Collaboration.find_by_candidate_page(
+            current_user["_id"], limit=limit, cursor=request.args.get("received_cursor") or None
+        )
+    except InvalidCursor as exc:
+        return validation_error(str(exc))
     return api_success(
-        {"sent": sent, "received": received},
+        {
+            "sent": sent,
+            "received": received,
+            "paging": {"limit": limit, "sent_next_cursor": sent_next, "received_next_cursor": received_next},
+        },
         message="Request history fetched",
     )
 
@@ -233,9 +259,10 @@ def get_team_members(current_user, project_id):
         return unauthorized_error("Unauthorized")
 
     collaborations = Collaboration.get_team_members(project_id)
+    users = user_loader().prime([project["founder_id"]] + [c["candidate_id"] for c in collaborations])
     team_members = []
     for collab in collaborations:
-        member = User.find_by_id(collab["candidate_id"])
+        member = users.load(collab["candidate_id"])
         if member:
             team_members.append(
                 {
@@ -250,7 +277,7 @@ def get_team_members(current_user, project_id):
                 }
             )
 
-    founder = User.find_by_id(project["founder_id"])
+    founder = users.load(project["founder_id"])
     founder_info = {
         "collaboration_id": None,
         "user_id": founder["_id"],
@@ -319,7 +346,7 @@ def remove_member(current_user):
     if not success:
         return api_error("REMOVE_MEMBER_FAILED", "Failed to remove member", 500)
 
-    removed_user = User.find_by_id(collaboration["candidate_id"])
+    removed_user = User.find_by_id(collaboration["candidate_id"], "card")
     ws_service.emit_member_left(
         collaboration["project_id"],
         {
@@ -349,11 +376,19 @@ def remove_member(current_user):
 @token_required
 def get_my_projects(current_user):
     collaborations = Collaboration.get_user_projects(current_user["_id"])
+    projects_by_id = project_loader().prime(c["project_id"] for c in collaborations)
+    founders = user_loader().prime(
+        project["founder_id"]
+        for project in projects_by_id.load_many(c["project_id"] for c in collaborations)
+        if project
+    )
     projects = []
     for collab in collaborations:
-        project = Project.find_by_id(collab["project_id"])
+        project = projects_by_id.load(collab["project_id"])
         if project:
-            founder = User.find_by_id(project["founder_id"])
+            founder = founders.load(project["founder_id"])
+            if not founder:
+                continue
             projects.append(
                 {
                     "collaboration_id": collab["_id"],
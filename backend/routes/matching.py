@@ -32,17 +32,16 @@ def get_matches(current_user, project_id):
     if not project.get("live", False):
         return api_error("PROJECT_NOT_LIVE", "Project is not live yet", 400)
 
-    if project.get("cached_matches"):
-        return api_success(
-            {"project_id": project_id, "matches": project["cached_matches"], "cached": True},
-            message="Matches fetched from cache",
-        )
-
-    matches = get_matching_service().find_matches(project, current_user["_id"])
-    Project.cache_matches(project_id, matches)
+    result = get_matching_service().get_matches(project, current_user["_id"])
     return api_success(
-        {"project_id": project_id, "matches": matches, "cached": False},
-        message="Matches generated",
+        {
+            "project_id": project_id,
+            "matches": result["matches"],
+            "cached": result["cached"],
+            "stale": result["stale"],
+            "cached_at": result["cached_at"].isoformat() if result["cached_at"] else None,
+        },
+        message="Matches fetched from cache" if result["cached"] else "Matches generated",
     )
 
 
@@ -1,34 +1,25 @@
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify, Response
 from models.user import User
 from routes.auth import token_required
 from services.ats_service import ATSService
-from services.vector_service import VectorService
 from services.websocket_service import ws_service
 from werkzeug.utils import secure_filename
-from pymongo import MongoClient
 from bson.objectid import ObjectId
-from config import Config
+from models.db import get_gridfs
 import gridfs
 import tempfile
+import hashlib
 import os
-import io
 from models.project import Project
+from models.resume_analysis import ResumeAnalysis
+from models.resume_file import ResumeFile
+from models.resume_text import ResumeText
 from utils.api_response import api_error, api_success, validation_error
 from utils.validation import validate_required_fields
-from services.background_tasks import enqueue
 
 profile_bp = Blueprint("profile", __name__)
 ats_service = ATSService()
-try:
-    vector_service = VectorService()
-except Exception as exc:
-    vector_service = None
-    print(f"[profile] Vector service unavailable at startup: {exc}")
 
-# GridFS — same MongoDB the rest of the app uses
-_client = MongoClient(Config.MONGODB_URI)
-_db = _client[Config.DB_NAME]
-fs = gridfs.GridFS(_db)
 
 ALLOWED_EXTENSIONS = {"pdf", "docx", "doc"}
 
@@ -38,28 +29,71 @@ def allowed_file(filename: str) -> bool:
 
 
 # ------------------------------------------------------------------
-# Background: push updated vector to Pinecone
+# Content-addressed resume storage + analysis cache
 # ------------------------------------------------------------------
 
-def _upsert_user_vector_bg(user_id: str):
-    if vector_service is None:
-        ws_service.emit_vector_update(user_id, "failed")
-        return
+def _file_sha256(file_bytes: bytes) -> str:
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+def _resume_etag(grid_out) -> str:
+    """Content hash for the ETag: sha256 (set at upload), then GridFS md5, then id+length."""
+    return (
+        getattr(grid_out, "sha256", None)
+        or getattr(grid_out, "md5", None)
+        or f"{grid_out._id}-{grid_out.length}"
+    )
+
+
+def _set_resume_cache_headers(response, grid_out, etag: str):
+    response.set_etag(etag)
+    if grid_out.upload_date:
+        response.last_modified = grid_out.upload_date
+    response.headers["Accept-Ranges"] = "bytes"
+    # Resumes sit behind auth: browsers may keep a private copy but must revalidate
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
+def _stream_grid_out(grid_out, start: int, length: int):
+    """Yield a byte range of a GridFS file one chunk at a time."""
     try:
-        user = User.find_by_id(user_id)
-        if user:
-            ok = vector_service.upsert_user(user)
-            status = "completed" if ok else "failed"
-        else:
-            status = "failed"
-        ws_service.emit_vector_update(user_id, status)
-    except Exception as e:
-        print(f"[profile] Vector upsert error: {e}")
-        ws_service.emit_vector_update(user_id, "failed")
+        grid_out.seek(start)
+        remaining = length
+        while remaining > 0:
+            data = grid_out.read(min(grid_out.chunk_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+    finally:
+        grid_out.close()
 
 
-def _start_vector_upsert(user_id: str):
-    enqueue(_upsert_user_vector_bg, user_id)
+def _analyze_resume_bytes(file_bytes: bytes, filename: str, sha256: str):
+    """
+    Return (resume_result, cache_hit). Parsing + LLM analysis only run when
+    these exact bytes have never been analysed before.
+    """
+    cached = ResumeAnalysis.find_by_hash(sha256)
+    if cached:
+        return cached, True
+
+    # Write to temp file for parsing (temp file is local, deleted right after)
+    suffix = ".pdf" if filename.lower().endswith(".pdf") else ".docx"
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+            tmp.write(file_bytes)
+            tmp_path = tmp.name
+        result = ats_service.analyze_resume_file(tmp_path)
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+    # Only cache complete analyses so a transient LLM failure is retried next time
+    if result.get("resume_text") and result.get("ai_insights"):
+        ResumeAnalysis.save(sha256, result)
+    return result, False
 
 
 # ------------------------------------------------------------------
@@ -98,11 +132,10 @@ def update_profile(current_user):
     if not success:
         return api_error("PROFILE_UPDATE_FAILED", "Failed to update profile", 500)
 
-    updated_user = User.find_by_id(current_user["_id"])
+    updated_user = User.find_by_id(current_user["_id"], "auth")
     updated_user.pop("password", None)
 
-    _start_vector_upsert(current_user["_id"])
-    Project.clear_all_cached_matches()
+    Project.mark_all_matches_stale()
 
     ws_service.emit_profile_update(current_user["_id"], {
         "message": "Profile updated successfully",
@@ -126,14 +159,14 @@ def update_profile(current_user):
 def upload_resume(current_user):
     """
     Upload flow:
-    1. Read file bytes from request
-    2. Delete old GridFS file if exists
-    3. Store new file in GridFS (MongoDB) → file_id
-    4. Write bytes to temp file for parsing
-    5. Gemini LLM analysis: skills, experience, summary
-    6. Store resume_text + file_id on user document in MongoDB
-    7. Upsert Pinecone vector in background (includes resume_text)
-    8. Delete temp file
+    1. Read file bytes from request, hash them (SHA-256)
+    2. Store in GridFS (MongoDB) → file_id, reusing any file with the same hash
+    3. Look up the parse + LLM analysis cached for that hash; on a miss,
+       parse a temp copy and run the Gemini analysis, then cache it
+    4. Merge with the user's profile skills
+    5. Store resume text (compressed, resume_texts) + file_id + hash in MongoDB
+    6. Release the previous GridFS file unless another user shares it
+    7. Pinecone vector is re-synced from the outbox entry written in step 5
 
     The file binary lives in MongoDB GridFS — shared across
     every developer and every server using the same database.
@@ -159,50 +192,31 @@ def upload_resume(current_user):
     filename = secure_filename(f"{current_user['_id']}_{file.filename}")
     content_type = file.content_type or "application/octet-stream"
     file_bytes = file.read()
+    sha256 = _file_sha256(file_bytes)
 
-    # Delete previous GridFS file so we don't accumulate old resumes
-    old_file_id = current_user.get("resume_file_id")
-    if old_file_id:
-        try:
-            fs.delete(ObjectId(old_file_id))
-            print(f"[profile] Deleted old GridFS file {old_file_id}")
-        except Exception as e:
-            print(f"[profile] Could not delete old GridFS file: {e}")
-
-    # Store in GridFS
-    file_id = fs.put(
-        file_bytes,
-        filename=filename,
-        content_type=content_type,
-        user_id=str(current_user["_id"]),
-    )
+    # Store in GridFS (deduplicated by content hash, reference counted)
+    file_id = ResumeFile.acquire(file_bytes, sha256, filename, content_type, str(current_user["_id"]))
     print(f"[profile] Stored resume in GridFS with id: {file_id}")
 
-    # Write to temp file for parsing (temp file is local, deleted right after)
-    suffix = ".pdf" if filename.lower().endswith(".pdf") else ".docx"
-    tmp_path = None
-
     try:
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-            tmp.write(file_bytes)
-            tmp_path = tmp.name
-
-        # Full LLM analysis via Gemini
-        analysis = ats_service.comprehensive_profile_analysis(current_user, tmp_path)
-
+        resume_result, cache_hit = _analyze_resume_bytes(file_bytes, filename, sha256)
+        analysis = ats_service.build_profile_analysis(current_user, resume_result)
+        analysis["cache_hit"] = cache_hit
     except Exception as e:
+        ResumeFile.release(file_id)
         return api_error("RESUME_ANALYSIS_FAILED", f"Failed to analyse resume: {str(e)}", 500)
 
-    finally:
-        if tmp_path and os.path.exists(tmp_path):
-            os.unlink(tmp_path)
-
     # Update user document in MongoDB
     update_data = {
         "resume_file_id": str(file_id),
+        "resume_sha256": sha256,
         "resume": filename,          # display name only
         "resume_parsed": True,
-        "resume_text": analysis.get("resume_text", ""),  # full text for ATS + Pinecone
+        # full text for ATS + Pinecone lives compressed in resume_texts
+        "resume_version": (
+            ResumeText.save(current_user["_id"], analysis["resume_text"])
+            if analysis.get("resume_text") else None
+        ),
     }
 
     if analysis.get("merged_skills"):
@@ -215,13 +229,19 @@ def upload_resume(current_user):
     if extracted_exp and extracted_exp > current_user.get("experience_years", 0):
         update_data["experience_years"] = extracted_exp
 
-    User.update_profile(current_user["_id"], update_data)
+    # Drop the previous reference only after the user points at the new
+    # file, and only the one this swap displaced (current_user may be a
+    # cached principal); re-uploading the same file releases the extra
+    # reference acquire took
+    old_file_id = User.swap_resume_file(current_user["_id"], update_data, unset_fields=["resume_text"])
+    if old_file_id:
+        ResumeFile.release(old_file_id)
 
-    # Pinecone upsert in background (vector now includes full resume text)
-    _start_vector_upsert(current_user["_id"])
-    Project.clear_all_cached_matches()
+    # update_profile wrote a vector outbox entry; the sync worker re-embeds
+    # with the new resume text
+    Project.mark_all_matches_stale()
 
-    updated_user = User.find_by_id(current_user["_id"])
+    updated_user = User.find_by_id(current_user["_id"], "auth")
     updated_user.pop("password", None)
 
     return api_success({
@@ -244,8 +264,11 @@ def get_resume(current_user, user_id):
     Serve a user's resume file directly from GridFS.
     Works on any developer's machine — file is in MongoDB, not local disk.
     Founders can use this to download candidate resumes.
+
+    Streamed chunk by chunk (memory stays flat), with ETag / Last-Modified
+    so repeat downloads revalidate to 304, and single-range Range requests.
     """
-    target_user = User.find_by_id(user_id)
+    target_user = User.find_by_id(user_id, {"resume_file_id": 1, "resume": 1})
     if not target_user:
         return api_error("USER_NOT_FOUND", "User not found", 404)
 
@@ -254,18 +277,52 @@ def get_resume(current_user, user_id):
         return api_error("RESUME_NOT_FOUND", "No resume uploaded for this user", 404)
 
     try:
-        grid_out = fs.get(ObjectId(file_id))
-        return send_file(
-            io.BytesIO(grid_out.read()),
-            mimetype=grid_out.content_type or "application/pdf",
-            download_name=grid_out.filename,
-            as_attachment=True,
-        )
+        grid_out = get_gridfs().get(ObjectId(file_id))
     except gridfs.errors.NoFile:
         return api_error("RESUME_NOT_FOUND", "Resume file not found in storage", 404)
     except Exception as e:
         return api_error("RESUME_FETCH_FAILED", f"Failed to retrieve resume: {str(e)}", 500)
 
+    etag = _resume_etag(grid_out)
+    if request.if_none_match.contains_weak(etag):
+        not_modified = Response(status=304)
+        _set_resume_cache_headers(not_modified, grid_out, etag)
+        return not_modified
+
+    total = grid_out.length
+    start, stop = 0, total
+    status = 200
+    # If-Range: only honour the range when the client's copy is still current
+    if_range = request.if_range
+    range_ok = not (if_range.etag or if_range.date) or if_range.etag == etag
+    # Multi-range requests are answered with the full body (allowed by RFC 9110)
+    if request.range and len(request.range.ranges) == 1 and range_ok:
+        byte_range = request.range.range_for_length(total)
+        if byte_range is None:
+            unsatisfiable = api_error("RANGE_NOT_SATISFIABLE", "Requested range not satisfiable", 416, {"length": total})
+            unsatisfiable[0].headers["Content-Range"] = f"bytes */{total}"
+            return unsatisfiable
+        start, stop = byte_range
+        status = 206
+
+    response = Response(
+        _stream_grid_out(grid_out, start, stop - start),
+        status=status,
+        mimetype=grid_out.content_type or "application/pdf",
+        direct_passthrough=True,
+    )
+    response.content_length = stop - start
+    if status == 206:
+        response.headers["Content-Range"] = f"bytes {start}-{stop - 1}/{total}"
+    # Files are shared between users with identical resumes, so the
+    # display name comes from the owning user's document
+    response.headers.set(
+        "Content-Disposition", "attachment",
+        filename=target_user.get("resume") or grid_out.filename or "resume",
+    )
+    _set_resume_cache_headers(response, grid_out, etag)
+    return response
+
 
 # ------------------------------------------------------------------
 # DELETE /profile/delete-resume
@@ -281,23 +338,19 @@ def delete_resume(current_user):
     if not current_user.get("resume_file_id") and not current_user.get("resume"):
         return api_error("RESUME_NOT_FOUND", "No resume to delete", 404)
 
-    file_id = current_user.get("resume_file_id")
-    if file_id:
-        try:
-            fs.delete(ObjectId(file_id))
-            print(f"[profile] Deleted GridFS file {file_id}")
-        except Exception as e:
-            print(f"[profile] GridFS delete error: {e}")
-
-    User.update_profile(current_user["_id"], {
+    file_id = User.swap_resume_file(current_user["_id"], {
         "resume": "",
         "resume_file_id": None,
+        "resume_sha256": None,
         "resume_parsed": False,
-        "resume_text": "",
-    })
+        "resume_version": None,
+    }, unset_fields=["resume_text"])
+    ResumeText.delete_for_user(current_user["_id"])
+
+    if file_id:
+        ResumeFile.release(file_id)
 
-    _start_vector_upsert(current_user["_id"])
-    Project.clear_all_cached_matches()
+    Project.mark_all_matches_stale()
 
     return api_success({
         "message": "Resume deleted successfully",
@@ -335,8 +388,10 @@ def calculate_ats_score(current_user, project_id):
         f"Location: {current_user.get('location', '')}",
     ]
 
-    if current_user.get("resume_text"):
-        user_text_parts.append(f"Resume:\n{current_user['resume_text'][:3000]}")
+    # The auth principal omits resume_text; load it only for this path
+    resume_text = User.get_resume_text(current_user["_id"]) if current_user.get("resume_parsed") else ""
+    if resume_text:
+        user_text_parts.append(f"Resume:\n{resume_text[:3000]}")
 
     candidate_text = "\n".join(filter(None, user_text_parts))
 
@@ -363,42 +418,45 @@ def calculate_ats_score(current_user, project_id):
 def analyze_current_resume(current_user):
     """
     Re-run LLM analysis on the stored resume.
-    Reads from GridFS first (shared), falls back to stored resume_text.
+    Served from the hash-keyed analysis cache when the file is unchanged;
+    otherwise reads from GridFS (shared), falling back to stored resume_text.
     """
     file_id = current_user.get("resume_file_id")
-    resume_text_stored = current_user.get("resume_text", "")
 
-    if not file_id and not resume_text_stored:
+    if not file_id and not current_user.get("resume_parsed"):
         return api_error("RESUME_NOT_FOUND", "No resume uploaded", 404)
 
-    tmp_path = None
-    try:
-        if file_id:
-            try:
-                grid_out = fs.get(ObjectId(file_id))
-                file_bytes = grid_out.read()
-                filename = grid_out.filename or "resume.pdf"
-                suffix = ".pdf" if filename.lower().endswith(".pdf") else ".docx"
-
-                with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-                    tmp.write(file_bytes)
-                    tmp_path = tmp.name
-
-                analysis = ats_service.comprehensive_profile_analysis(current_user, tmp_path)
-
-            except gridfs.errors.NoFile:
-                # GridFS file gone but text is in MongoDB — use it
-                if not resume_text_stored:
-                    return api_error("RESUME_NOT_FOUND", "Resume file not found in storage", 404)
-                ai_insights = ats_service.analyze_resume_with_ai(resume_text_stored)
-                analysis = {"ai_insights": ai_insights, "resume_text": resume_text_stored}
-        else:
+    cached = ResumeAnalysis.find_by_hash(current_user.get("resume_sha256"))
+    if cached:
+        analysis = ats_service.build_profile_analysis(current_user, cached)
+        analysis["cache_hit"] = True
+    elif file_id:
+        try:
+            grid_out = get_gridfs().get(ObjectId(file_id))
+            file_bytes = grid_out.read()
+            filename = grid_out.filename or "resume.pdf"
+            sha256 = getattr(grid_out, "sha256", None) or _file_sha256(file_bytes)
+
+            resume_result, cache_hit = _analyze_resume_bytes(file_bytes, filename, sha256)
+            analysis = ats_service.build_profile_analysis(current_user, resume_result)
+            analysis["cache_hit"] = cache_hit
+
+            if current_user.get("resume_sha256") != sha256:
+                User.update_profile(current_user["_id"], {"resume_sha256": sha256})
+
+        except gridfs.errors.NoFile:
+            # GridFS file gone but text is in MongoDB — use it
+            resume_text_stored = User.get_resume_text(current_user["_id"])
+            if not resume_text_stored:
+                return api_error("RESUME_NOT_FOUND", "Resume file not found in storage", 404)
             ai_insights = ats_service.analyze_resume_with_ai(resume_text_stored)
             analysis = {"ai_insights": ai_insights, "resume_text": resume_text_stored}
-
-    finally:
-        if tmp_path and os.path.exists(tmp_path):
-            os.unlink(tmp_path)
+    else:
+        resume_text_stored = User.get_resume_text(current_user["_id"])
+        if not resume_text_stored:
+            return api_error("RESUME_NOT_FOUND", "No resume uploaded", 404)
+        ai_insights = ats_service.analyze_resume_with_ai(resume_text_stored)
+        analysis = {"ai_insights": ai_insights, "resume_text": resume_text_stored}
 
     return api_success({
         "message": "Resume analysed successfully",
@@ -436,10 +494,7 @@ Respond ONLY with valid JSON — no markdown fences:
 }}
 """
     try:
-        response = ats_service.gemini_service.client.models.generate_content(
-            model=ats_service.gemini_service.model,
-            contents=prompt,
-        )
+        response = ats_service.gemini_service.generate(prompt)
         result = ats_service.gemini_service._extract_json(response.text)
         return api_success(result if result else {"suggested_skills": []}, message="Skill suggestions fetched")
     except Exception as e:
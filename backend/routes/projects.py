@@ -1,22 +1,68 @@
 from flask import Blueprint, request
-import time
+from datetime import datetime
 
 from models.project import Project
 from models.user import User
 from routes.auth import token_required
-from services.background_tasks import enqueue
+from routes.matching import get_matching_service
+from services.background_tasks import background_task, enqueue, enqueue_job
+from services.project_recommendations import recommend_projects
+from services.websocket_service import ws_service
 from utils.api_response import api_error, api_success, unauthorized_error, validation_error
 from utils.authz import require_founder
+from utils.pagination import InvalidCursor, parse_page_args
 from utils.validation import validate_required_fields
 
 projects_bp = Blueprint("projects", __name__)
 
 
+REVIEW_SECONDS = 10
+
+
+def _prewarm_matches(project_id, user_id):
+    """Analyze the project and cache a first match list while it is in review."""
+    project = Project.find_by_id(project_id)
+    if not project:
+        return None
+    try:
+        return get_matching_service().refresh_matches(project, user_id)
+    except Exception as e:
+        print(f"[Projects] Match pre-warm failed for project {project_id}: {e}")
+        return None
+
+
+@background_task()
 def simulate_review(project_id, user_id):
-    time.sleep(10)
+    """Review stage: pre-warm matches, then schedule go-live for the end of the review window."""
+    matches = _prewarm_matches(project_id, user_id)
+    # a delayed job holds no worker while it waits
+    enqueue_job(
+        complete_review,
+        (project_id, user_id, len(matches or []), matches[0]["match_percentage"] if matches else None),
+        delay_seconds=max(0.0, REVIEW_SECONDS - _seconds_in_review(project_id)),
+        dedupe_key=f"complete-review:{project_id}",
+    )
+
+
+@background_task(priority=5)
+def complete_review(project_id, user_id, match_count=0, top_match_percentage=None):
     Project.update_status(project_id, live=True, status="approved")
     User.update_role(user_id, "founder")
 
+    if match_count:
+        ws_service.emit_match_found(user_id, {
+            "project_id": str(project_id),
+            "match_count": match_count,
+            "top_match_percentage": top_match_percentage,
+        })
+
+
+def _seconds_in_review(project_id):
+    project = Project.find_by_id(project_id)
+    if not project or not project.get("created_at"):
+        return 0.0
+    return (datetime.utcnow() - project["created_at"]).total_seconds()
+
 
 @projects_bp.route("", methods=["POST"])
 @token_required
@@ -56,8 +102,15 @@ def create_project(current_user):
 @projects_bp.route("/my-projects", methods=["GET"])
 @token_required
 def get_my_projects(current_user):
-    projects = Project.find_by_founder(current_user["_id"])
-    return api_success({"projects": projects}, message="Projects fetched")
+    limit, cursor = parse_page_args(request.args)
+    try:
+        projects, next_cursor = Project.find_by_founder_page(current_user["_id"], limit=limit, cursor=cursor)
+    except InvalidCursor as exc:
+        return validation_error(str(exc))
+    return api_success(
+        {"projects": projects, "paging": {"limit": limit, "next_cursor": next_cursor}},
+        message="Projects fetched",
+    )
 
 
 @projects_bp.route("/<project_id>", methods=["GET"])
@@ -105,5 +158,29 @@ def update_project(current_user, project_id):
 @projects_bp.route("/live", methods=["GET"])
 @token_required
 def get_live_projects(current_user):
-    projects = Project.get_all_live_projects()
-    return api_success({"projects": projects}, message="Live projects fetched")
+    limit, cursor = parse_page_args(request.args)
+    try:
+        projects, next_cursor = Project.get_live_projects_page(limit=limit, cursor=cursor)
+    except InvalidCursor as exc:
+        return validation_error(str(exc))
+    return api_success(
+        {"projects": projects, "paging": {"limit": limit, "next_cursor": next_cursor}},
+        message="Live projects fetched",
+    )
+
+
+@projects_bp.route("/recommended", methods=["GET"])
+@token_required
+def get_recommended_projects(current_user):
+    """Live projects ranked for the current user by their profile vector."""
+    limit, cursor = parse_page_args(request.args)
+    try:
+        projects, next_cursor, ranked = recommend_projects(
+            get_matching_service().vector_service, current_user, limit, cursor
+        )
+    except InvalidCursor as exc:
+        return validation_error(str(exc))
+    return api_success(
+        {"projects": projects, "ranked": ranked, "paging": {"limit": limit, "next_cursor": next_cursor}},
+        message="Recommended projects fetched",
+    )
@@ -0,0 +1,40 @@
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.indexes import INDEXES, check_indexes, check_query_plans, ensure_indexes
+
+
+def run_check():
+    print("=== Mongo Index Check ===")
+    missing = check_indexes()
+    for collection, names in missing.items():
+        print(f"✗ {collection}: missing {', '.join(names)}")
+
+    scans = check_query_plans()
+    for collection, query, plan in scans:
+        print(f"✗ {collection}: {query} → {' > '.join(plan)}")
+
+    if not missing and not scans:
+        print("✓ All declared indexes present; hot queries use them.")
+        return 0
+    return 1
+
+
+def run_apply(collections=None):
+    print("=== Applying Mongo Indexes ===")
+    created = ensure_indexes(collections)
+    for collection, names in created.items():
+        print(f"  {collection:<20} {', '.join(names) if names else '(none)'}")
+    print("✓ Done.")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create or verify the declared MongoDB indexes.")
+    parser.add_argument("--check", action="store_true", help="Report missing indexes and hot queries not using their index; exit 1 if any")
+    parser.add_argument("--collection", action="append", choices=sorted(INDEXES), help="Limit to a collection (repeatable)")
+    args = parser.parse_args()
+
+    sys.exit(run_check() if args.check else run_apply(args.collection))
@@ -1,35 +1,157 @@
+import argparse
 import sys
 import os
+import time
+from datetime import datetime
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from models.db import get_collection
 from services.vector_service import VectorService
 from models.user import User
+from models.project import Project
+from utils.pagination import UPDATED_ASC
 
+# Persisted progress of incremental runs: the (updated_at, _id) keyset
+# position of the last user in the last committed batch.
+index_state_collection = get_collection('vector_index_state')
+STATE_ID = "generate_vectors"
 
-def generate_vectors():
-    print("=== Pinecone Vector Generation ===")
-    print("Fetching all users from MongoDB...")
 
-    users = User.get_all_users()
-    if not users:
-        print("No users found. Run ingest_data.py first.")
-        return
+def _load_watermark():
+    state = index_state_collection.find_one({"_id": STATE_ID})
+    if not state or not state.get("updated_at"):
+        return None
+    return [state["updated_at"], state["last_id"]]
+
+
+def _save_watermark(user):
+    from bson.objectid import ObjectId
+    index_state_collection.update_one(
+        {"_id": STATE_ID},
+        {"$set": {"updated_at": user["updated_at"], "last_id": ObjectId(user["_id"]), "saved_at": datetime.utcnow()}},
+        upsert=True
+    )
+
+
+def _full_rebuild(vs, page_size, pipeline):
+    """Stream every user through build_index; returns the count, or None on failure."""
+    counted = [0]
+
+    def users():
+        for page in User.iter_user_pages(projection="index", page_size=page_size):
+            User.attach_resume_text(page)
+            counted[0] += len(page)
+            yield from page
 
-    print(f"Found {len(users)} users. Building Pinecone index...")
+    def committed(batch):
+        for user in batch:
+            User.mark_vector_synced(user["_id"], user.get("updated_at"), vs.text_hash(user))
 
+    if not vs.build_index(users(), on_committed=committed, **pipeline):
+        return None if counted[0] else 0
+    return counted[0]
+
+
+def generate_project_vectors(batch_size=100):
+    """Backfill the project namespace with every live project (later changes sync on write)."""
+    print("=== Project Vector Generation ===")
     vs = VectorService()
-    ok = vs.build_index(users)
-
-    if ok:
-        stats = vs.get_index_stats()
-        print(f"\n✓ Pinecone index updated successfully!")
-        print(f"  Index name : {stats.get('index_name')}")
-        print(f"  Total vectors: {stats.get('total_vector_count')}")
-        print(f"  Dimension  : {stats.get('dimension')}")
-        print("\nAll developers querying this index will now see the updated data.")
+    indexed = 0
+    for projects in Project.iter_live_project_pages(page_size=batch_size):
+        if not vs.upsert_projects(projects):
+            print("✗ Indexing failed. Check logs above.")
+            return False
+        indexed += len(projects)
+        print(f"  indexed {indexed} projects")
+    if not indexed:
+        print("No live projects to index.")
+        return True
+    print(f"\n✓ Indexed {indexed} live projects into namespace '{vs.PROJECT_NAMESPACE}'")
+    return True
+
+
+def generate_vectors(incremental=False, since=None, page_size=500, force=False, **pipeline):
+    """pipeline: build_index tuning (encode_batch_size, upload_workers, encode_processes)."""
+    print("=== Pinecone Vector Generation ===")
+    vs = VectorService()
+
+    query, after = {}, None
+    if since:
+        query = {"updated_at": {"$gte": since}}
+        print(f"Re-indexing users updated since {since.isoformat()}...")
+    elif incremental:
+        after = _load_watermark()
+        print(f"Re-indexing users updated after {after[0].isoformat()}..." if after
+              else "No watermark yet — indexing every user once...")
     else:
-        print("✗ Indexing failed. Check logs above.")
+        print("Re-indexing every user...")
+
+    started = time.time()
+    if not (incremental or since):
+        # full rebuild: one pipelined build_index over a streaming cursor
+        scanned = indexed = _full_rebuild(vs, page_size, pipeline)
+        skipped = 0
+        if scanned is None:
+            print("✗ Indexing failed. Check logs above.")
+            return False
+    else:
+        scanned = indexed = skipped = 0
+        for users in User.iter_user_pages(projection="index", page_size=page_size, query=query,
+                                          order=UPDATED_ASC, after=after):
+            scanned += len(users)
+            User.attach_resume_text(users)
+
+            # skip users whose embedding text is what the index already holds
+            hashes = {user["_id"]: vs.text_hash(user) for user in users}
+            changed = users if force else [u for u in users if u.get("vector_text_hash") != hashes[u["_id"]]]
+            skipped += len(users) - len(changed)
+
+            if changed and not vs.build_index(changed, **pipeline):
+                print("✗ Indexing failed. Watermark left at the last committed batch; re-run to resume.")
+                return False
+            for user in changed:
+                User.mark_vector_synced(user["_id"], user.get("updated_at"), hashes[user["_id"]])
+            indexed += len(changed)
+
+            _save_watermark(users[-1])
+            print(f"  scanned {scanned}, re-embedded {indexed}, unchanged {skipped}")
+
+    elapsed = time.time() - started
+    if not scanned:
+        print("No users to index." if not (incremental or since) else "✓ Index already up to date.")
+        return True
+
+    stats = vs.get_index_stats()
+    print(f"\n✓ Pinecone index updated successfully!")
+    print(f"  Users scanned  : {scanned} ({scanned / elapsed if elapsed else 0:.1f}/s)")
+    print(f"  Re-embedded    : {indexed}")
+    print(f"  Unchanged      : {skipped}")
+    print(f"  Index name     : {stats.get('index_name')}")
+    print(f"  Total vectors  : {stats.get('total_vector_count')}")
+    print(f"  Dimension      : {stats.get('dimension')}")
+    print("\nAll developers querying this index will now see the updated data.")
+    return True
 
 
 if __name__ == "__main__":
-    generate_vectors()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Embed users and upsert them into the Pinecone index.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only users updated after the persisted watermark; advances it per batch")
+    parser.add_argument("--since", type=datetime.fromisoformat,
+                        help="Only users updated at/after this ISO timestamp (overrides the watermark)")
+    parser.add_argument("--page-size", type=int, default=500, help="Users read and upserted per batch")
+    parser.add_argument("--force", action="store_true", help="With --incremental/--since, re-embed even when the embedding text is unchanged")
+    parser.add_argument("--encode-batch-size", type=int, help="Users per embedding call")
+    parser.add_argument("--upload-workers", type=int, help="Concurrent Pinecone upsert requests")
+    parser.add_argument("--encode-processes", type=int, help="Embedding processes (>1 uses a multi-process pool)")
+    parser.add_argument("--projects", action="store_true", help="Index live projects (recommendations) instead of users")
+    args = parser.parse_args()
+
+    if args.projects:
+        sys.exit(0 if generate_project_vectors() else 1)
+    ok = generate_vectors(
+        incremental=args.incremental, since=args.since, page_size=args.page_size, force=args.force,
+        encode_batch_size=args.encode_batch_size, upload_workers=args.upload_workers,
+        encode_processes=args.encode_processes,
+    )
+    sys.exit(0 if ok else 1)
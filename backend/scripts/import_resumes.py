@@ -0,0 +1,418 @@
+import argparse
+import hashlib
+import json
+import mimetypes
+import os
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bcrypt
+from bson.objectid import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+
+from models.user import users_collection
+from models.resume_analysis import ResumeAnalysis
+from models.resume_file import ResumeFile
+from models.match_cache import MatchCache
+from models.resume_text import ResumeText
+from models.vector_outbox import VectorOutbox
+from services.ats_service import ATSService
+from utils.stage_stats import StageStats
+
+RESUME_EXTENSIONS = (".pdf", ".docx", ".doc")
+ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz")
+
+# One parser per worker process, created by the pool initializer
+_parser = None
+
+
+# ------------------------------------------------------------------
+# Input discovery
+# ------------------------------------------------------------------
+
+def _safe_extract(archive_path, target_dir):
+    """Extract a zip/tar archive, refusing members that escape target_dir."""
+    root = os.path.realpath(target_dir)
+
+    def _check(member_name):
+        dest = os.path.realpath(os.path.join(root, member_name))
+        if os.path.commonpath([root, dest]) != root:
+            raise ValueError(f"Unsafe path in archive: {member_name}")
+
+    if archive_path.lower().endswith(".zip"):
+        with zipfile.ZipFile(archive_path) as zf:
+            for name in zf.namelist():
+                _check(name)
+            zf.extractall(root)
+    else:
+        with tarfile.open(archive_path) as tf:
+            members = [m for m in tf.getmembers() if m.isfile() or m.isdir()]
+            for member in members:
+                _check(member.name)
+            tf.extractall(root, members=members)
+
+
+def _discover_files(input_dir):
+    paths = []
+    for dirpath, _, filenames in os.walk(input_dir):
+        for filename in filenames:
+            if filename.lower().endswith(RESUME_EXTENSIONS) and not filename.startswith("."):
+                paths.append(os.path.join(dirpath, filename))
+    return sorted(paths)
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _name_from_filename(path):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    words = stem.replace("_", " ").replace("-", " ").split()
+    words = [w for w in words if w.lower() not in ("resume", "cv")]
+    return " ".join(w.capitalize() for w in words) or stem
+
+
+# ------------------------------------------------------------------
+# Checkpoint
+# ------------------------------------------------------------------
+
+def _load_checkpoint(path):
+    if not os.path.exists(path):
+        return {"completed": [], "failed": {}}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _save_checkpoint(path, checkpoint):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+# ------------------------------------------------------------------
+# Stages
+# ------------------------------------------------------------------
+
+def _init_parser():
+    global _parser
+    _parser = ATSService()
+
+
+def _parse_stage(item):
+    """Runs in a worker process: extract text from one resume file."""
+    started = time.perf_counter()
+    extracted = _parser.extract_resume(item["path"])
+    return {
+        **item,
+        "text": extracted["text"],
+        "page_count": extracted["page_count"],
+        "truncated": extracted["truncated"],
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def _analyze_stage(ats_service, parsed, skip_analysis):
+    """Runs in a thread: LLM analysis, served from the hash cache when possible."""
+    started = time.perf_counter()
+    result = ResumeAnalysis.find_by_hash(parsed["sha256"])
+    if not result:
+        if skip_analysis:
+            result = {"resume_text": parsed["text"], "resume_analysis": {}, "ai_insights": {}}
+        else:
+            result = ats_service.analyze_resume_text(
+                parsed["text"], page_count=parsed["page_count"], truncated=parsed["truncated"]
+            )
+            if result.get("resume_text") and result.get("ai_insights"):
+                ResumeAnalysis.save(parsed["sha256"], result)
+    return {**parsed, "result": result, "seconds": time.perf_counter() - started}
+
+
+def _build_user_update(analyzed, user_id, resume_version, hashed_password, overwrite, now):
+    """
+    Update for an upsert keyed by the email found in the resume. New accounts get
+    everything via $setOnInsert (including the pre-assigned _id their
+    resume text and outbox entry already use), so a concurrently created
+    account with the same email is never modified; with overwrite, the
+    resume fields replace an existing account's.
+    """
+    ai_insights = analyzed["result"].get("ai_insights") or {}
+    resume_fields = {
+        "resume_file_id": str(analyzed["file_id"]),
+        "resume_sha256": analyzed["sha256"],
+        "resume": os.path.basename(analyzed["path"]),
+        "resume_parsed": True,
+        "resume_version": resume_version,
+        "updated_at": now,
+    }
+    profile_fields = {
+        "_id": user_id,
+        "password": hashed_password,
+        "name": _name_from_filename(analyzed["path"]),
+        "bio": ai_insights.get("summary", ""),
+        "role": "user",
+        "linkedin": "",
+        "professional_title": (ai_insights.get("roles") or [""])[0],
+        "location": "",
+        "founding_mindset_score": 0,
+        "created_at": now,
+        "skills": ai_insights.get("skills") or [],
+        "experience_years": ai_insights.get("experience_years") or 0,
+    }
+    if not overwrite:
+        return {"$setOnInsert": {**profile_fields, **resume_fields}}
+
+    # overwrite: refresh skills/experience when the resume yields them
+    set_fields = dict(resume_fields)
+    for field in ("skills", "experience_years"):
+        if profile_fields[field]:
+            set_fields[field] = profile_fields.pop(field)
+    return {"$set": set_fields, "$setOnInsert": profile_fields, "$unset": {"resume_text": ""}}
+
+
+def _store_file(analyzed):
+    with open(analyzed["path"], "rb") as f:
+        file_bytes = f.read()
+    return ResumeFile.acquire(
+        file_bytes,
+        analyzed["sha256"],
+        os.path.basename(analyzed["path"]),
+        mimetypes.guess_type(analyzed["path"])[0] or "application/octet-stream",
+        None,
+    )
+
+
+def _write_batch(batch, ats_service, hashed_password, stats, overwrite=False):
+    """
+    Bulk upsert users and their resume texts. Vectors go through the
+    vector outbox like every other user write: entries are recorded before
+    the users (see VectorOutbox.write_with_entry) and drained by
+    services/vector_sync.py. Returns (done paths, failed).
+    """
+    failed = {}
+
+    started = time.perf_counter()
+    by_email = {}
+    for analyzed in batch:
+        email = (ats_service.extract_email(analyzed["result"].get("resume_text", "")) or "").lower()
+        if not email:
+            failed[analyzed["rel_path"]] = "no email found in resume"
+        elif email in by_email:
+            failed[analyzed["rel_path"]] = f"duplicate email {email} in batch"
+        else:
+            by_email[email] = analyzed
+
+    # real accounts keep their uploaded resume unless --overwrite
+    existing = {
+        user["email"]: user
+        for user in users_collection.find({"email": {"$in": list(by_email)}}, {"email": 1, "resume_file_id": 1})
+    }
+    if not overwrite:
+        for email in existing:
+            failed[by_email.pop(email)["rel_path"]] = "account already exists (use --overwrite)"
+        existing = {}
+
+    done = []
+    if by_email:
+        now = datetime.utcnow()
+        # ids are known up front, so resume texts and outbox entries can be
+        # written before the users that reference them
+        user_ids = {email: existing[email]["_id"] if email in existing else ObjectId() for email in by_email}
+        for analyzed in by_email.values():
+            analyzed["file_id"] = _store_file(analyzed)
+        versions = ResumeText.save_many([
+            (user_ids[email], analyzed["result"].get("resume_text", "")) for email, analyzed in by_email.items()
+        ])
+        VectorOutbox.record_many([(user_id, now) for user_id in user_ids.values()])
+
+        updates = {
+            email: _build_user_update(by_email[email], user_ids[email], versions[str(user_ids[email])],
+                                      hashed_password, overwrite, now)
+            for email in by_email
+        }
+        # overwritten accounts swap their resume pointer one at a time, so the
+        # file released is exactly the one this write displaced (as a re-upload does)
+        for email in existing:
+            previous = users_collection.find_one_and_update(
+                {"email": email}, updates[email], {"resume_file_id": 1},
+                upsert=True, return_document=ReturnDocument.BEFORE,
+            )
+            ResumeFile.release((previous or {}).get("resume_file_id"))
+            done.append(by_email[email]["rel_path"])
+
+        emails = [email for email in by_email if email not in existing]
+        result = users_collection.bulk_write(
+            [UpdateOne({"email": email}, updates[email], upsert=True) for email in emails], ordered=False
+        ) if emails else None
+        for i, email in enumerate(emails):
+            analyzed = by_email[email]
+            if i in result.upserted_ids:
+                done.append(analyzed["rel_path"])
+            else:
+                # an account with this email appeared after the existence check;
+                # leave it alone (its stray outbox entry drains as a no-op removal)
+                ResumeFile.release(analyzed["file_id"])
+                ResumeText.delete_for_user(user_ids[email])
+                failed[analyzed["rel_path"]] = "account already exists (use --overwrite)"
+        VectorOutbox.notify()
+
+    elapsed = time.perf_counter() - started
+    for analyzed in batch:
+        stats["write"].record(elapsed / len(batch), ok=analyzed["rel_path"] not in failed)
+    return done, failed
+
+
+# ------------------------------------------------------------------
+# Driver
+# ------------------------------------------------------------------
+
+def import_resumes(
+    source,
+    checkpoint_path=None,
+    parse_workers=None,
+    analyze_concurrency=4,
+    batch_size=50,
+    default_password="Test@123",
+    skip_analysis=False,
+    skip_vectors=False,
+    overwrite=False,
+):
+    print("=== Bulk Resume Import ===")
+    started_at = time.perf_counter()
+
+    extract_dir = None
+    if os.path.isfile(source) and source.lower().endswith(ARCHIVE_EXTENSIONS):
+        extract_dir = tempfile.mkdtemp(prefix="resume-import-")
+        print(f"Extracting {source} ...")
+        _safe_extract(source, extract_dir)
+        input_dir = extract_dir
+    elif os.path.isdir(source):
+        input_dir = source
+    else:
+        print(f"✗ {source} is neither a directory nor a .zip/.tar archive")
+        return
+
+    checkpoint_path = checkpoint_path or f"{source.rstrip(os.sep)}.import-checkpoint.json"
+    checkpoint = _load_checkpoint(checkpoint_path)
+    completed = set(checkpoint["completed"])
+
+    pending = []
+    for path in _discover_files(input_dir):
+        sha256 = _file_sha256(path)
+        if sha256 in completed:
+            continue
+        pending.append({"path": path, "rel_path": os.path.relpath(path, input_dir), "sha256": sha256})
+
+    print(f"Found {len(pending)} resumes to import ({len(completed)} already done per checkpoint)")
+    if not pending:
+        return
+
+    ats_service = ATSService()
+    hashed_password = bcrypt.hashpw(default_password.encode("utf-8"), bcrypt.gensalt())
+
+    stats = {name: StageStats(name) for name in ("parse", "analyze", "write", "index")}
+    parse_workers = parse_workers or os.cpu_count() or 2
+    parse_window = parse_workers * 4
+    analyze_window = analyze_concurrency * 2
+    sha_by_path = {item["rel_path"]: item["sha256"] for item in pending}
+
+    def _flush(batch):
+        done, failed = _write_batch(batch, ats_service, hashed_password, stats, overwrite)
+        completed.update(sha_by_path[rel_path] for rel_path in done)
+        checkpoint["completed"] = sorted(completed)
+        checkpoint["failed"].update(failed)
+        _save_checkpoint(checkpoint_path, checkpoint)
+        print(f"  committed {len(done)} (failed {len(failed)}) — total done {len(completed)}")
+
+    # Parse (processes) → analyze (threads) → write (main thread); each stage
+    # keeps a bounded window in flight so the next one always has work ready.
+    with ProcessPoolExecutor(max_workers=parse_workers, initializer=_init_parser) as parse_pool, \
+            ThreadPoolExecutor(max_workers=analyze_concurrency, thread_name_prefix="resume-analyze") as analyze_pool:
+        todo = deque(pending)
+        parsing = deque()
+        analyzing = deque()
+        batch = []
+
+        while todo or parsing or analyzing:
+            while todo and len(parsing) < parse_window:
+                parsing.append(parse_pool.submit(_parse_stage, todo.popleft()))
+
+            if parsing and len(analyzing) < analyze_window:
+                parsed = parsing.popleft().result()
+                stats["parse"].record(parsed["seconds"], ok=bool(parsed["text"]))
+                if parsed["text"]:
+                    analyzing.append(analyze_pool.submit(_analyze_stage, ats_service, parsed, skip_analysis))
+                else:
+                    checkpoint["failed"][parsed["rel_path"]] = "no text extracted"
+                continue
+
+            analyzed = analyzing.popleft().result()
+            stats["analyze"].record(analyzed["seconds"], ok=bool(analyzed["result"].get("ai_insights")) or skip_analysis)
+            batch.append(analyzed)
+            if len(batch) >= batch_size:
+                _flush(batch)
+                batch = []
+
+        if batch:
+            _flush(batch)
+        else:
+            _save_checkpoint(checkpoint_path, checkpoint)
+
+    # imported candidates can change every project's matches
+    MatchCache.mark_all_stale()
+    if not skip_vectors:
+        # drain now instead of waiting for the workers; anything left over
+        # (or everything, with --skip-vectors) is picked up by their drain
+        from services.vector_sync import sync_vector_outbox
+        started = time.perf_counter()
+        synced = sync_vector_outbox()
+        stats["index"].record(time.perf_counter() - started, count=synced)
+
+    wall = time.perf_counter() - started_at
+    print(f"\n✓ Import finished in {wall:.1f}s")
+    for stage in stats.values():
+        print(stage.report(wall))
+    if checkpoint["failed"]:
+        print(f"  {len(checkpoint['failed'])} files failed — see {checkpoint_path}")
+
+    if extract_dir:
+        import shutil
+        shutil.rmtree(extract_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import PDF/DOCX resumes as user profiles.")
+    parser.add_argument("source", help="Directory or .zip/.tar(.gz) archive of resumes")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <source>.import-checkpoint.json)")
+    parser.add_argument("--parse-workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument("--analyze-concurrency", type=int, default=4, help="Concurrent LLM analyses")
+    parser.add_argument("--batch-size", type=int, default=50, help="Resumes per Mongo/vector write batch")
+    parser.add_argument("--default-password", default="Test@123", help="Password for newly created accounts")
+    parser.add_argument("--skip-analysis", action="store_true", help="Parse only, no LLM analysis")
+    parser.add_argument("--skip-vectors", action="store_true", help="Leave vector indexing to the outbox workers")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="Replace the resume of existing accounts whose email matches (default: skip them)")
+    args = parser.parse_args()
+
+    import_resumes(
+        args.source,
+        checkpoint_path=args.checkpoint,
+        parse_workers=args.parse_workers,
+        analyze_concurrency=args.analyze_concurrency,
+        batch_size=args.batch_size,
+        default_password=args.default_password,
+        skip_analysis=args.skip_analysis,
+        skip_vectors=args.skip_vectors,
+        overwrite=args.overwrite,
+    )
@@ -0,0 +1,49 @@
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo import UpdateOne
+
+from models.resume_text import ResumeText
+from models.user import users_collection
+
+
+def migrate_resume_text(batch_size=200):
+    """Move inline users.resume_text into compressed resume_texts documents."""
+    print("=== Migrating resume_text to side storage ===")
+    query = {"resume_text": {"$exists": True}}
+    cursor = users_collection.find(query, {"resume_text": 1}).batch_size(batch_size)
+
+    moved = 0
+    batch = []
+
+    def _flush(batch):
+        with_text = [(str(u["_id"]), u["resume_text"]) for u in batch if u.get("resume_text")]
+        versions = ResumeText.save_many(with_text)
+        ops = []
+        for user in batch:
+            update = {"$unset": {"resume_text": ""}}
+            if str(user["_id"]) in versions:
+                update["$set"] = {"resume_version": versions[str(user["_id"])]}
+            ops.append(UpdateOne({"_id": user["_id"]}, update))
+        users_collection.bulk_write(ops, ordered=False)
+        return len(with_text)
+
+    for user in cursor:
+        batch.append(user)
+        if len(batch) >= batch_size:
+            moved += _flush(batch)
+            print(f"  migrated {moved} resumes...")
+            batch = []
+    if batch:
+        moved += _flush(batch)
+
+    print(f"✓ Migrated {moved} resume texts.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move inline users.resume_text into compressed side storage.")
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+    migrate_resume_text(args.batch_size)
@@ -0,0 +1,40 @@
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.match_precompute import precompute_all_matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute cached matches for all live projects.")
+    parser.add_argument("--page-size", type=int, default=50, help="Projects per page")
+    parser.add_argument("--search-concurrency", type=int, default=8, help="Concurrent vector searches")
+    parser.add_argument("--rank-workers", type=int, default=4, help="Concurrent analyze/rank workers (LLM gateway still applies)")
+    parser.add_argument("--top-k", type=int, default=10, help="Vector candidates per project")
+    parser.add_argument("--only-stale", action="store_true", help="Skip projects whose match cache is still fresh")
+    args = parser.parse_args()
+
+    print("=== Precomputing Matches ===")
+    result = precompute_all_matches(
+        page_size=args.page_size,
+        search_concurrency=args.search_concurrency,
+        rank_workers=args.rank_workers,
+        top_k=args.top_k,
+        only_stale=args.only_stale,
+    )
+
+    wall = result["wall_seconds"]
+    rate = result["projects"] / wall if wall else 0.0
+    print(f"\n✓ {result['projects']} projects in {wall:.1f}s ({rate:.2f}/s), "
+          f"{result['skipped']} skipped, {len(result['failed'])} failed")
+    for stage in result["stats"].values():
+        print(stage.report(wall))
+    if result["failed"]:
+        print(f"✗ Failed: {', '.join(result['failed'])}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.vector_reconcile import reconcile
+from services.vector_service import VectorService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare MongoDB users with the Pinecone index and repair drift.")
+    parser.add_argument("--repair", action="store_true", help="Upsert missing/stale users and delete orphaned vectors")
+    parser.add_argument("--page-size", type=int, default=500, help="Users read from MongoDB per page")
+    args = parser.parse_args()
+
+    print("=== Vector Index Reconciliation ===")
+    vs = VectorService()
+    report = reconcile(vs, page_size=args.page_size, repair=args.repair)
+
+    print(f"\n  Users scanned   : {report['users_scanned']}")
+    print(f"  Vectors scanned : {report['vectors_scanned']}")
+    for kind in ("missing", "stale", "orphaned"):
+        sample = ", ".join(report["samples"][kind])
+        print(f"  {kind.capitalize():<15} : {report[kind]}" + (f"  (e.g. {sample})" if sample else ""))
+    if args.repair:
+        print(f"  Repaired        : {report['repaired']} upserted, {report['deleted']} deleted")
+    print(f"  Took            : {report['wall_seconds']:.1f}s")
+
+    drift = report["missing"] + report["stale"] + report["orphaned"]
+    if report["errors"]:
+        print(f"✗ {report['errors']} batches failed. Check logs above.")
+        return 1
+    if drift and not args.repair:
+        print("✗ Index has drifted from MongoDB. Re-run with --repair to fix only the differences.")
+        return 1
+    print("✓ Index matches MongoDB." if not drift else "✓ Differences repaired.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+import argparse
+import json
+import signal
+import sys
+import os
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import scheduler
+from services.background_tasks import queue_stats, start_workers
+
+
+def run_stats():
+    print("=== Job Queue ===")
+    print(json.dumps(queue_stats(), indent=2, default=str))
+    return 0
+
+
+def run_workers(concurrency, with_scheduler=False):
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    print(f"=== Job worker pid {os.getpid()}: {concurrency} threads ===")
+    threads = start_workers(concurrency, stop)
+    if with_scheduler:
+        scheduler.register_default_schedules()
+        scheduler.start(stop)
+    stop.wait()
+    print("Stopping — letting in-flight jobs finish...")
+    for thread in threads:
+        thread.join()
+    print("✓ Stopped.")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run background job workers against the Mongo job queue.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Worker threads in this process")
+    parser.add_argument("--scheduler", action="store_true", help="Also run the recurring-job scheduler in this process")
+    parser.add_argument("--stats", action="store_true", help="Print queue depth and latency, then exit")
+    args = parser.parse_args()
+
+    sys.exit(run_stats() if args.stats else run_workers(args.concurrency, args.scheduler))
@@ -2,7 +2,8 @@ import os
 import re
 import PyPDF2
 import docx
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
+from config import Config
 from services.gemini_service import GeminiService
 
 
@@ -14,34 +15,77 @@ class ATSService:
     # File parsing (still deterministic — that's fine)
     # ------------------------------------------------------------------
 
-    def parse_resume_pdf(self, file_path: str) -> str:
+    def iter_pdf_pages(self, reader) -> Iterator[str]:
+        """Yield page text lazily so callers can stop before the last page."""
+        for page in reader.pages:
+            yield page.extract_text() or ""
+
+    def extract_pdf_text(self, file_path: str, max_chars: Optional[int] = None) -> Dict:
+        """
+        Stream pages out of a PDF until max_chars of text have been collected.
+
+        Downstream consumers only look at the first few thousand characters
+        of a resume, so extraction stops as soon as the budget is met instead
+        of walking every page of a long document.
+        """
+        budget = Config.RESUME_TEXT_MAX_CHARS if max_chars is None else max_chars
+        result = {"text": "", "page_count": 0, "pages_parsed": 0, "truncated": False}
         try:
-            text = ""
             with open(file_path, "rb") as f:
                 reader = PyPDF2.PdfReader(f)
-                for page in reader.pages:
-                    text += page.extract_text() or ""
-            return text.strip()
+                result["page_count"] = len(reader.pages)
+
+                chunks = []
+                collected = 0
+                for page_text in self.iter_pdf_pages(reader):
+                    result["pages_parsed"] += 1
+                    chunks.append(page_text)
+                    collected += len(page_text)
+                    if budget and collected >= budget:
+                        break
+
+            result["truncated"] = bool(budget) and (
+                collected > budget or result["pages_parsed"] < result["page_count"]
+            )
+            text = "".join(chunks).strip()
+            result["text"] = text[:budget] if budget else text
+            return result
         except Exception as e:
             print(f"[ATSService] PDF parse error: {e}")
-            return ""
+            return result
+
+    def parse_resume_pdf(self, file_path: str, max_chars: Optional[int] = None) -> str:
+        return self.extract_pdf_text(file_path, max_chars)["text"]
 
-    def parse_resume_docx(self, file_path: str) -> str:
+    def parse_resume_docx(self, file_path: str, max_chars: Optional[int] = None) -> str:
+        budget = Config.RESUME_TEXT_MAX_CHARS if max_chars is None else max_chars
         try:
             doc = docx.Document(file_path)
-            return "\n".join(p.text for p in doc.paragraphs).strip()
+            text = "\n".join(p.text for p in doc.paragraphs).strip()
+            return text[:budget] if budget else text
         except Exception as e:
             print(f"[ATSService] DOCX parse error: {e}")
             return ""
 
-    def parse_resume(self, file_path: str) -> str:
+    def extract_resume(self, file_path: str, max_chars: Optional[int] = None) -> Dict:
+        """Like parse_resume, but also reports page count (PDF only)."""
+        if file_path and file_path.lower().endswith(".pdf"):
+            return self.extract_pdf_text(file_path, max_chars)
+        return {
+            "text": self.parse_resume(file_path, max_chars),
+            "page_count": None,
+            "pages_parsed": None,
+            "truncated": False,
+        }
+
+    def parse_resume(self, file_path: str, max_chars: Optional[int] = None) -> str:
         """Dispatch to the right parser based on file extension."""
         if not file_path:
             return ""
         if file_path.lower().endswith(".pdf"):
-            return self.parse_resume_pdf(file_path)
+            return self.parse_resume_pdf(file_path, max_chars)
         if file_path.lower().endswith((".docx", ".doc")):
-            return self.parse_resume_docx(file_path)
+            return self.parse_resume_docx(file_path, max_chars)
         return ""
 
     # Lightweight regex for contact info — no need to burn LLM tokens on this
@@ -88,10 +132,7 @@ Respond ONLY with valid JSON — no markdown fences:
 }}
 """
         try:
-            response = self.gemini_service.client.models.generate_content(
-                model=self.gemini_service.model,
-                contents=prompt,
-            )
+            response = self.gemini_service.generate(prompt)
             result = self.gemini_service._extract_json(response.text)
             return result or {}
         except Exception as e:
@@ -145,10 +186,7 @@ Respond ONLY with valid JSON — no markdown fences:
 }}
 """
         try:
-            response = self.gemini_service.client.models.generate_content(
-                model=self.gemini_service.model,
-                contents=prompt,
-            )
+            response = self.gemini_service.generate(prompt)
             result = self.gemini_service._extract_json(response.text)
             return result or {
                 "overall_score": 0,
@@ -200,10 +238,7 @@ Respond ONLY with valid JSON — no markdown fences:
 }}
 """
         try:
-            response = self.gemini_service.client.models.generate_content(
-                model=self.gemini_service.model,
-                contents=prompt,
-            )
+            response = self.gemini_service.generate(prompt)
             result = self.gemini_service._extract_json(response.text)
             return result.get("optimization_tips", []) if result else []
         except Exception as e:
@@ -235,10 +270,7 @@ Respond ONLY with valid JSON — no markdown fences:
 }}
 """
         try:
-            response = self.gemini_service.client.models.generate_content(
-                model=self.gemini_service.model,
-                contents=prompt,
-            )
+            response = self.gemini_service.generate(prompt)
             result = self.gemini_service._extract_json(response.text)
             return result.get("skills", []) if result else []
         except Exception as e:
@@ -249,16 +281,50 @@ Respond ONLY with valid JSON — no markdown fences:
     # Comprehensive analysis (called on resume upload)
     # ------------------------------------------------------------------
 
-    def comprehensive_profile_analysis(
-        self, user_data: Dict, resume_path: Optional[str] = None
-    ) -> Dict:
+    def analyze_resume_file(self, resume_path: str) -> Dict:
         """
-        Full analysis pipeline:
-        1. Parse resume file → raw text
-        2. Gemini extracts structured info
-        3. Merge with existing profile skills
-        4. Return everything to the caller (route saves what it needs)
+        User-independent half of the pipeline: parse the file and run the LLM.
+        The result depends only on the file bytes, so routes cache it by hash.
         """
+        extracted = self.extract_resume(resume_path)
+        return self.analyze_resume_text(
+            extracted["text"],
+            page_count=extracted["page_count"],
+            truncated=extracted["truncated"],
+        )
+
+    def analyze_resume_text(
+        self, resume_text: str, page_count: Optional[int] = None, truncated: bool = False
+    ) -> Dict:
+        """Analysis step of analyze_resume_file for text that is already parsed."""
+        result = {"resume_text": "", "resume_analysis": {}, "ai_insights": {}}
+        if not resume_text:
+            return result
+
+        result["resume_text"] = resume_text
+
+        # Contact extraction (cheap regex)
+        result["resume_analysis"] = {
+            "text_preview": resume_text[:500] + "..." if len(resume_text) > 500 else resume_text,
+            "email": self.extract_email(resume_text),
+            "phone": self.extract_phone(resume_text),
+            "page_count": page_count,
+            "text_truncated": truncated,
+        }
+
+        # Full LLM analysis
+        ai_insights = self.analyze_resume_with_ai(resume_text)
+        result["ai_insights"] = ai_insights
+
+        if ai_insights:
+            result["resume_analysis"]["estimated_experience"] = ai_insights.get(
+                "experience_years", 0
+            )
+
+        return result
+
+    def build_profile_analysis(self, user_data: Dict, resume_result: Optional[Dict] = None) -> Dict:
+        """Merge a (possibly cached) resume analysis with the user's profile."""
         analysis = {
             "basic_info": {
                 "name": user_data.get("name", ""),
@@ -274,31 +340,15 @@ Respond ONLY with valid JSON — no markdown fences:
             "recommendations": [],
         }
 
-        if not resume_path:
-            return analysis
-
-        resume_text = self.parse_resume(resume_path)
-        if not resume_text:
+        if not resume_result or not resume_result.get("resume_text"):
             return analysis
 
-        analysis["resume_text"] = resume_text
-
-        # Contact extraction (cheap regex)
-        analysis["resume_analysis"] = {
-            "text_preview": resume_text[:500] + "..." if len(resume_text) > 500 else resume_text,
-            "email": self.extract_email(resume_text),
-            "phone": self.extract_phone(resume_text),
-        }
-
-        # Full LLM analysis
-        ai_insights = self.analyze_resume_with_ai(resume_text)
+        analysis["resume_text"] = resume_result["resume_text"]
+        analysis["resume_analysis"] = dict(resume_result.get("resume_analysis") or {})
+        ai_insights = resume_result.get("ai_insights") or {}
         analysis["ai_insights"] = ai_insights
 
         if ai_insights:
-            analysis["resume_analysis"]["estimated_experience"] = ai_insights.get(
-                "experience_years", 0
-            )
-
             # Merge skills: existing profile + extracted from resume, deduped
             extracted_skills = ai_insights.get("skills", [])
             existing_skills = user_data.get("skills", [])
@@ -307,4 +357,17 @@ Respond ONLY with valid JSON — no markdown fences:
 
             analysis["recommendations"] = ai_insights.get("key_achievements", [])
 
-        return analysis
\ No newline at end of file
+        return analysis
+
+    def comprehensive_profile_analysis(
+        self, user_data: Dict, resume_path: Optional[str] = None
+    ) -> Dict:
+        """
+        Full analysis pipeline:
+        1. Parse resume file → raw text
+        2. Gemini extracts structured info
+        3. Merge with existing profile skills
+        4. Return everything to the caller (route saves what it needs)
+        """
+        resume_result = self.analyze_resume_file(resume_path) if resume_path else None
+        return self.build_profile_analysis(user_data, resume_result)
@@ -1,8 +1,278 @@
-from concurrent.futures import ThreadPoolExecutor
+import importlib
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
 
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
-executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="bg-task")
+from config import Config
+from models.db import get_collection
+
+# Durable job queue. Jobs live in the `jobs` collection so they survive
+# restarts; workers claim them with findOneAndUpdate and hold a lease that
+# is extended while the task runs. A worker that dies simply lets its lease
+# lapse and the job is picked up again.
+#
+# Tasks are referenced by import path ("module:qualname"), so anything passed
+# to enqueue() must be a module-level function and BSON-serializable args.
+
+jobs_collection = get_collection('jobs')
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+DEAD = "dead"
+
+
+def background_task(priority=0, max_attempts=None, lease_seconds=None):
+    """Default job options for a task; higher priority is claimed first."""
+    def decorate(task):
+        task.job_options = {
+            "priority": priority,
+            "max_attempts": max_attempts,
+            "lease_seconds": lease_seconds,
+        }
+        return task
+    return decorate
+
+
+def task_path(task):
+    return f"{task.__module__}:{task.__qualname__}"
+
+
+def resolve_task(path):
+    module_name, _, qualname = path.partition(":")
+    target = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        target = getattr(target, part)
+    return target
+
+
+# ------------------------------------------------------------------
+# Producing
+# ------------------------------------------------------------------
+
+def enqueue_job(task, args=(), kwargs=None, priority=None, run_at=None, delay_seconds=0,
+                max_attempts=None, dedupe_key=None):
+    """
+    Persist a job and return its id. With dedupe_key, a job with the same key
+    that is still queued or running is reused instead of adding another.
+    """
+    options = getattr(task, "job_options", {})
+    now = datetime.utcnow()
+    job = {
+        "task": task_path(task),
+        "args": list(args),
+        "kwargs": kwargs or {},
+        "status": QUEUED,
+        "priority": priority if priority is not None else options.get("priority", 0),
+        "run_at": run_at or now + timedelta(seconds=delay_seconds),
+        "attempts": 0,
+        "max_attempts": max_attempts or options.get("max_attempts") or Config.JOB_MAX_ATTEMPTS,
+        "lease_seconds": options.get("lease_seconds") or Config.JOB_LEASE_SECONDS,
+        "created_at": now,
+    }
+    if dedupe_key:
+        # unique+sparse index: only one live job per key
+        job["active_key"] = dedupe_key
+    try:
+        return str(jobs_collection.insert_one(job).inserted_id)
+    except DuplicateKeyError:
+        existing = jobs_collection.find_one({"active_key": dedupe_key}, {"_id": 1})
+        return str(existing["_id"]) if existing else None
 
 
 def enqueue(task, *args, **kwargs):
-    return executor.submit(task, *args, **kwargs)
+    """Run task(*args, **kwargs) on a worker with the task's default options."""
+    return enqueue_job(task, args, kwargs)
+
+
+# ------------------------------------------------------------------
+# Consuming
+# ------------------------------------------------------------------
+
+def _retry_delay(attempts):
+    delay = min(Config.JOB_RETRY_MAX_SECONDS, Config.JOB_RETRY_BASE_SECONDS * (2 ** max(0, attempts - 1)))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def requeue_expired_leases():
+    """
+    Return jobs whose worker stopped renewing its lease to the queue. A job
+    that already used its last attempt is dead-lettered instead: a task
+    that crashes its worker never reaches _fail and would otherwise be
+    re-claimed forever.
+    """
+    now = datetime.utcnow()
+    expired = {"status": RUNNING, "lease_until": {"$lt": now}}
+    dead = jobs_collection.update_many(
+        {**expired, "$expr": {"$gte": ["$attempts", "$max_attempts"]}},
+        {
+            "$set": {"status": DEAD, "failed_at": now, "last_error": "lease expired on the final attempt"},
+            "$unset": {"lease_until": "", "active_key": ""},
+        }
+    )
+    if dead.modified_count:
+        print(f"[Jobs] Dead-lettered {dead.modified_count} jobs whose final attempt lost its worker")
+    result = jobs_collection.update_many(
+        expired,
+        {"$set": {"status": QUEUED}, "$unset": {"worker": "", "lease_until": ""}}
+    )
+    return result.modified_count
+
+
+class Worker:
+    def __init__(self, name=None, poll_interval=None):
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+        self.poll_interval = poll_interval or Config.JOB_POLL_INTERVAL_SECONDS
+
+    def claim(self):
+        now = datetime.utcnow()
+        # pipeline update: the first lease uses the job's own lease_seconds
+        return jobs_collection.find_one_and_update(
+            {"status": QUEUED, "run_at": {"$lte": now}},
+            [{"$set": {
+                "status": RUNNING,
+                "worker": {"$literal": self.name},
+                "started_at": now,
+                "lease_until": {"$add": [
+                    now, {"$multiply": [{"$ifNull": ["$lease_seconds", Config.JOB_LEASE_SECONDS]}, 1000]}
+                ]},
+                "attempts": {"$add": [{"$ifNull": ["$attempts", 0]}, 1]},
+            }}],
+            sort=[("priority", -1), ("run_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    def _renew_lease(self, job, done):
+        # renew well inside the lease the claim granted
+        interval = max(1.0, job["lease_seconds"] / 3)
+        while not done.wait(interval):
+            jobs_collection.update_one(
+                {"_id": job["_id"], "worker": self.name, "status": RUNNING},
+                {"$set": {"lease_until": datetime.utcnow() + timedelta(seconds=job["lease_seconds"])}}
+            )
+
+    def _finish(self, job, started):
+        finished = datetime.utcnow()
+        jobs_collection.update_one(
+            {"_id": job["_id"], "worker": self.name},
+            {
+                "$set": {
+                    "status": DONE,
+                    "finished_at": finished,
+                    "wait_ms": int((job["started_at"] - job["run_at"]).total_seconds() * 1000),
+                    "run_ms": int((time.monotonic() - started) * 1000),
+                    "expire_at": finished + timedelta(seconds=Config.JOB_RETENTION_SECONDS),
+                },
+                "$unset": {"lease_until": "", "active_key": ""},
+            }
+        )
+
+    def _fail(self, job, error):
+        if job["attempts"] >= job["max_attempts"]:
+            print(f"[Jobs] {job['task']} ({job['_id']}) dead after {job['attempts']} attempts: {error}")
+            update = {
+                "$set": {"status": DEAD, "failed_at": datetime.utcnow(), "last_error": error},
+                "$unset": {"lease_until": "", "active_key": ""},
+            }
+        else:
+            delay = _retry_delay(job["attempts"])
+            print(f"[Jobs] {job['task']} ({job['_id']}) attempt {job['attempts']} failed, retry in {delay:.0f}s")
+            update = {
+                "$set": {
+                    "status": QUEUED,
+                    "run_at": datetime.utcnow() + timedelta(seconds=delay),
+                    "last_error": error,
+                },
+                "$unset": {"lease_until": "", "worker": ""},
+            }
+        jobs_collection.update_one({"_id": job["_id"], "worker": self.name}, update)
+
+    def run_one(self):
+        """Claim and run one ready job. Returns False when the queue had nothing ready."""
+        job = self.claim()
+        if not job:
+            return False
+
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._renew_lease, args=(job, done), daemon=True)
+        heartbeat.start()
+        started = time.monotonic()
+        try:
+            resolve_task(job["task"])(*job["args"], **job["kwargs"])
+            self._finish(job, started)
+        except Exception:
+            self._fail(job, traceback.format_exc(limit=5))
+        finally:
+            done.set()
+        return True
+
+    def run_forever(self, stop_event=None):
+        stop_event = stop_event or threading.Event()
+        last_reclaim = 0.0
+        while not stop_event.is_set():
+            try:
+                if time.monotonic() - last_reclaim > Config.JOB_LEASE_SECONDS / 2:
+                    requeue_expired_leases()
+                    last_reclaim = time.monotonic()
+                if not self.run_one():
+                    stop_event.wait(self.poll_interval)
+            except Exception as e:
+                print(f"[Jobs] Worker {self.name} error: {e}")
+                stop_event.wait(self.poll_interval)
+
+
+def start_workers(count, stop_event=None):
+    """Start `count` daemon worker threads in this process."""
+    threads = []
+    for i in range(count):
+        worker = Worker(name=f"{socket.gethostname()}:{os.getpid()}:w{i}")
+        thread = threading.Thread(target=worker.run_forever, args=(stop_event,), daemon=True, name=f"job-worker-{i}")
+        thread.start()
+        threads.append(thread)
+    return threads
+
+
+# ------------------------------------------------------------------
+# Observability
+# ------------------------------------------------------------------
+
+def queue_stats(window_minutes=15):
+    """Depth per status, age of the oldest ready job, and recent wait/run latency."""
+    now = datetime.utcnow()
+    counts = {status: 0 for status in (QUEUED, RUNNING, DONE, DEAD)}
+    for row in jobs_collection.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}]):
+        counts[row["_id"]] = row["count"]
+
+    ready = jobs_collection.count_documents({"status": QUEUED, "run_at": {"$lte": now}})
+    oldest = jobs_collection.find_one(
+        {"status": QUEUED, "run_at": {"$lte": now}}, {"run_at": 1}, sort=[("priority", -1), ("run_at", 1)]
+    )
+
+    latency = next(jobs_collection.aggregate([
+        {"$match": {"status": DONE, "finished_at": {"$gte": now - timedelta(minutes=window_minutes)}}},
+        {"$group": {
+            "_id": None,
+            "completed": {"$sum": 1},
+            "avg_wait_ms": {"$avg": "$wait_ms"},
+            "max_wait_ms": {"$max": "$wait_ms"},
+            "avg_run_ms": {"$avg": "$run_ms"},
+        }},
+    ]), {})
+
+    return {
+        "counts": counts,
+        "ready": ready,
+        "oldest_ready_seconds": (now - oldest["run_at"]).total_seconds() if oldest else 0,
+        "window_minutes": window_minutes,
+        "completed": latency.get("completed", 0),
+        "avg_wait_ms": round(latency.get("avg_wait_ms") or 0),
+        "max_wait_ms": latency.get("max_wait_ms") or 0,
+        "avg_run_ms": round(latency.get("avg_run_ms") or 0),
+    }
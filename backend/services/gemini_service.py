@@ -2,6 +2,29 @@ from google import genai
 from config import Config
 import json
 import re
+import threading
+import time
+
+
+# Process-wide LLM gateway shared by every GeminiService instance: at most
+# GEMINI_MAX_CONCURRENCY calls in flight, started no faster than
+# GEMINI_REQUESTS_PER_MINUTE, so batch jobs can fan out without tripping 429s.
+_llm_slots = threading.BoundedSemaphore(max(1, Config.GEMINI_MAX_CONCURRENCY))
+_rate_lock = threading.Lock()
+_next_call_at = 0.0
+
+
+def _wait_for_rate_slot():
+    global _next_call_at
+    if Config.GEMINI_REQUESTS_PER_MINUTE <= 0:
+        return
+    interval = 60.0 / Config.GEMINI_REQUESTS_PER_MINUTE
+    with _rate_lock:
+        now = time.monotonic()
+        start_at = max(now, _next_call_at)
+        _next_call_at = start_at + interval
+    if start_at > now:
+        time.sleep(start_at - now)
 
 
 class GeminiService:
@@ -9,6 +32,15 @@ class GeminiService:
         self.client = genai.Client(api_key=Config.GEMINI_API_KEY)
         self.model = "gemini-2.5-flash"
 
+    def generate(self, prompt):
+        """Single entry point for Gemini calls; goes through the rate-limited gateway."""
+        with _llm_slots:
+            _wait_for_rate_slot()
+            return self.client.models.generate_content(
+                model=self.model,
+                contents=prompt
+            )
+
     # ----------------------------
     # Utility: Safe JSON extraction
     # ----------------------------
@@ -52,10 +84,7 @@ Respond ONLY in valid JSON format:
 }}
 """
         try:
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=prompt
-            )
+            response = self.generate(prompt)
             result = self._extract_json(response.text)
             if result:
                 return result
@@ -166,10 +195,7 @@ IMPORTANT: Every candidate_index must be a valid integer from 0 to {len(candidat
 """
 
         try:
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=prompt
-            )
+            response = self.generate(prompt)
             result = self._extract_json(response.text)
 
             if result and "rankings" in result:
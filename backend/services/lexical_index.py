@@ -0,0 +1,279 @@
+import heapq
+import math
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from config import Config
+from utils.metadata_filter import candidate_filter, filter_fields, matches_filter, merge_filters
+
+# Keeps tech spellings intact: c++, c#, node.js, ci/cd splits into ci + cd
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the their this to was we "
+    "were will with you your who what which into over per using use work working experience years year "
+    "team looking need needs someone strong good".split()
+)
+# Term-frequency multiplier per user field; skills and title are the
+# precise signals, bio and resume are long and noisy
+FIELD_WEIGHTS = (("skills", 3), ("professional_title", 2), ("bio", 1), ("resume_text", 1))
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_RE.findall((text or "").lower()) if token not in STOPWORDS]
+
+
+def _user_terms(user: Dict) -> Counter:
+    terms = Counter()
+    for field, weight in FIELD_WEIGHTS:
+        value = user.get(field)
+        if isinstance(value, list):
+            value = " ".join(value)
+        for token in tokenize(value):
+            terms[token] += weight
+    return terms
+
+
+class LexicalIndex:
+    """
+    In-memory BM25 index over user skills, title, bio and resume text —
+    the keyword half of hybrid candidate retrieval (exact terms such as
+    "Kafka" are often diluted in the sentence embedding).
+
+    Built from MongoDB on first use (in the background, search returns []
+    until ready), updated by VectorService's upsert/remove calls in this
+    process and topped up from users.updated_at every
+    LEXICAL_REFRESH_SECONDS for writes synced by other processes. Deletes
+    leave no updated_at trail, so every LEXICAL_RECONCILE_SECONDS the
+    indexed ids are checked against MongoDB and missing users dropped.
+    """
+
+    K1 = 1.2
+    B = 0.75
+    # Only the rarest query terms are scored: their postings are short, which
+    # keeps a long project description query around a millisecond
+    MAX_QUERY_TERMS = 16
+    # Recompute stored BM25 impacts once the average document length has
+    # drifted this far from the one they were computed with
+    RENORMALIZE_DRIFT = 0.1
+    # Indexed ids checked per MongoDB query when reconciling deletes
+    RECONCILE_BATCH = 1000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # term -> {user_id: BM25 tf component}, precomputed so a query is one
+        # dict walk per term
+        self._postings: Dict[str, Dict[str, float]] = {}
+        # user_id -> (length, Counter of terms, updated_at, filter fields)
+        self._docs: Dict[str, tuple] = {}
+        self._total_length = 0
+        self._norm_length = 0.0  # average length the stored impacts use
+        self._watermark = None
+        self._refreshed_at = 0.0
+        self._reconciled_at = 0.0
+        self._loading = False
+        self.ready = False
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _remove_locked(self, user_id: str):
+        doc = self._docs.pop(user_id, None)
+        if doc is None:
+            return
+        length, terms = doc[0], doc[1]
+        self._total_length -= length
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(user_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def _upsert_locked(self, user: Dict):
+        user_id = str(user["_id"])
+        updated_at = user.get("updated_at")
+        current = self._docs.get(user_id)
+        # a bulk load can read a user after a newer upsert already landed
+        if current and current[2] and updated_at and current[2] > updated_at:
+            return
+        self._remove_locked(user_id)
+        terms = _user_terms(user)
+        length = sum(terms.values())
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[user_id] = self._impact(tf, length)
+        self._docs[user_id] = (length, terms, updated_at, filter_fields(user))
+        self._total_length += length
+        if updated_at and (self._watermark is None or updated_at > self._watermark):
+            self._watermark = updated_at
+
+    def _impact(self, tf: int, length: int) -> float:
+        norm = self.K1 * (1 - self.B + self.B * length / (self._norm_length or length or 1))
+        return tf * (self.K1 + 1) / (tf + norm)
+
+    def _renormalize_locked(self):
+        if not self._docs:
+            return
+        average = self._total_length / len(self._docs)
+        if self._norm_length and abs(average - self._norm_length) <= self.RENORMALIZE_DRIFT * self._norm_length:
+            return
+        self._norm_length = average
+        for user_id, (length, terms, _, _) in self._docs.items():
+            for term, tf in terms.items():
+                self._postings[term][user_id] = self._impact(tf, length)
+
+    def upsert_many(self, users: Iterable[Dict]):
+        """Index (or re-index) users. No-op until the index is loading or loaded."""
+        if not (self.ready or self._loading):
+            return
+        with self._lock:
+            for user in users:
+                self._upsert_locked(user)
+            self._renormalize_locked()
+
+    def upsert(self, user: Dict):
+        self.upsert_many([user])
+
+    def remove(self, user_id: str):
+        with self._lock:
+            self._remove_locked(str(user_id))
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _index_pages(self, query=None, order=None):
+        from models.user import User
+        from utils.pagination import ID_ASC
+        for users in User.iter_user_pages(projection="index", page_size=500, query=query, order=order or ID_ASC):
+            User.attach_resume_text(users)
+            self.upsert_many(users)
+
+    def load(self):
+        """Build the index from every user in MongoDB (blocking)."""
+        started = time.time()
+        self._loading = True
+        try:
+            self._index_pages()
+            self.ready = True
+            self._refreshed_at = self._reconciled_at = time.time()
+            print(f"[LexicalIndex] Indexed {len(self._docs)} users, {len(self._postings)} terms "
+                  f"in {time.time() - started:.1f}s")
+        except Exception as e:
+            print(f"[LexicalIndex] Load failed: {e}")
+        finally:
+            self._loading = False
+
+    def refresh(self):
+        """Pick up users written since the newest updated_at already indexed."""
+        from utils.pagination import UPDATED_ASC
+        self._refreshed_at = time.time()
+        try:
+            query = {"updated_at": {"$gte": self._watermark}} if self._watermark else None
+            self._index_pages(query, UPDATED_ASC)
+            if time.time() - self._reconciled_at >= Config.LEXICAL_RECONCILE_SECONDS:
+                self._drop_deleted()
+        except Exception as e:
+            print(f"[LexicalIndex] Refresh failed: {e}")
+
+    def _drop_deleted(self):
+        """Remove indexed users that no longer exist in MongoDB."""
+        from models.user import User
+        self._reconciled_at = time.time()
+        with self._lock:
+            user_ids = list(self._docs)
+        # ids indexed after the snapshot are newer than any delete it could miss
+        deleted = []
+        for start in range(0, len(user_ids), self.RECONCILE_BATCH):
+            batch = user_ids[start:start + self.RECONCILE_BATCH]
+            existing = User.existing_ids(batch)
+            deleted.extend(user_id for user_id in batch if user_id not in existing)
+        if deleted:
+            with self._lock:
+                for user_id in deleted:
+                    self._remove_locked(user_id)
+                self._renormalize_locked()
+            print(f"[LexicalIndex] Dropped {len(deleted)} deleted users")
+
+    def ensure_loaded(self):
+        """Start a background load or refresh when due; never blocks the caller."""
+        with self._lock:
+            if self._loading:
+                return
+            due = not self.ready or time.time() - self._refreshed_at >= Config.LEXICAL_REFRESH_SECONDS
+            if not due:
+                return
+            self._loading = True
+        target = self.refresh if self.ready else self.load
+
+        def run():
+            try:
+                target()
+            finally:
+                self._loading = False
+
+        threading.Thread(target=run, daemon=True, name="lexical-index").start()
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search(self, query_text: str, k: int = 10, exclude_ids: Optional[List[str]] = None,
+               boost_terms: Optional[List[str]] = None, metadata_filter: Optional[Dict] = None) -> List[Dict]:
+        """
+        BM25 top-k users for query_text; boost_terms (e.g. required skills)
+        get extra query weight. metadata_filter takes the same syntax as
+        VectorService.search. Returns [{"user_id", "score"}], best first, or
+        [] while the index is still loading.
+        """
+        self.ensure_loaded()
+        if not self.ready:
+            return []
+
+        weights = Counter(tokenize(query_text))
+        for term in tokenize(" ".join(boost_terms or [])):
+            weights[term] += 2
+        query_filter = merge_filters(candidate_filter(exclude_ids=exclude_ids), metadata_filter)
+
+        with self._lock:
+            doc_count = len(self._docs)
+            if not doc_count or not weights:
+                return []
+            terms = [term for term in weights if term in self._postings]
+            terms = heapq.nsmallest(self.MAX_QUERY_TERMS, terms, key=lambda term: len(self._postings[term]))
+
+            scores = {}
+            for term in terms:
+                postings = self._postings[term]
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                term_weight = weights[term] * idf
+                for user_id, impact in postings.items():
+                    scores[user_id] = scores.get(user_id, 0.0) + term_weight * impact
+
+            # filter best-first over a growing top-n window instead of sorting
+            # every scored user; the window widens only when the filter
+            # rejects too many of the best
+            results = []
+            checked = 0
+            window = k
+            while True:
+                top = heapq.nlargest(window, scores.items(), key=lambda item: item[1])
+                for user_id, score in top[checked:]:
+                    if matches_filter(self._docs[user_id][3], query_filter):
+                        results.append({"user_id": user_id, "score": score})
+                        if len(results) >= k:
+                            return results
+                if len(top) < window:
+                    return results
+                checked = len(top)
+                window *= 4
+
+    def stats(self) -> Dict:
+        return {"ready": self.ready, "documents": len(self._docs), "terms": len(self._postings)}
+
+
+# Process-wide index shared by VectorService and MatchingService
+lexical_index = LexicalIndex()
@@ -0,0 +1,119 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+from models.project import Project
+from services.background_tasks import background_task
+from services.lexical_index import lexical_index
+from services.matching_service import MatchingService
+from utils.stage_stats import StageStats
+
+STAGES = ("analyze", "embed", "search", "rank", "write")
+
+
+def _timed(stats, stage, fn, *args):
+    started = time.perf_counter()
+    ok = False
+    try:
+        result = fn(*args)
+        ok = True
+        return result
+    finally:
+        stats[stage].record(time.perf_counter() - started, ok=ok)
+
+
+def _analyze(service, stats, project):
+    try:
+        return _timed(stats, "analyze", service.project_analysis, project)
+    except Exception as e:
+        # rank with the project's own required_skills rather than drop it
+        print(f"[Precompute] Analysis failed for project {project['_id']}: {e}")
+        return {}
+
+
+def _precompute_page(service, projects, stats, search_pool, rank_pool, top_k):
+    """Run one page of projects through analyze → embed → search → rank → write."""
+    failed = []
+
+    # analyze: cached per description on the project, LLM misses go through the gateway
+    analyses = list(rank_pool.map(lambda project: _analyze(service, stats, project), projects))
+    queries = [service.build_search_query(project, analysis) for project, analysis in zip(projects, analyses)]
+
+    # embed: one model call for the whole page
+    started = time.perf_counter()
+    vectors = service.vector_service.embed_queries([query["text"] for query in queries])
+    elapsed = time.perf_counter() - started
+    for _ in projects:
+        stats["embed"].record(elapsed / len(projects))
+
+    # search: Pinecone queries are I/O bound, run them concurrently
+    # (fused with the in-memory BM25 index per MATCH_RETRIEVAL_MODE)
+    searches = [
+        search_pool.submit(_timed, stats, "search", service.retrieve,
+                           query, project["founder_id"], top_k, vector)
+        for project, query, vector in zip(projects, queries, vectors)
+    ]
+
+    def rank_and_write(project, analysis, query, search):
+        vector_results = search.result()
+        matches = _timed(stats, "rank", service.rank_matches, project, analysis, query, vector_results)
+        _timed(stats, "write", Project.cache_matches, project["_id"], matches, service.cache_version(project))
+
+    ranking = [
+        (project, rank_pool.submit(rank_and_write, project, analysis, query, search))
+        for project, analysis, query, search in zip(projects, analyses, queries, searches)
+    ]
+    for project, future in ranking:
+        try:
+            future.result()
+        except Exception as e:
+            print(f"[Precompute] Project {project['_id']} failed: {e}")
+            failed.append(project["_id"])
+    return failed
+
+
+def precompute_all_matches(page_size=50, search_concurrency=8, rank_workers=4, top_k=10, only_stale=False):
+    """
+    Recompute and cache matches for every live project, a page at a time.
+    With only_stale, projects whose cache is still fresh are skipped.
+    Returns {"projects", "skipped", "failed", "wall_seconds", "stats"}.
+    """
+    service = MatchingService()
+    if Config.MATCH_RETRIEVAL_MODE != "vector" and not lexical_index.ready:
+        # a batch run should fuse from the first page, not only once the background load lands
+        lexical_index.load()
+    stats = {name: StageStats(name) for name in STAGES}
+    processed, skipped, failed = 0, 0, []
+    started = time.time()
+    cursor = None
+
+    with ThreadPoolExecutor(max_workers=search_concurrency, thread_name_prefix="precompute-search") as search_pool, \
+            ThreadPoolExecutor(max_workers=rank_workers, thread_name_prefix="precompute-rank") as rank_pool:
+        while True:
+            projects, cursor = Project.get_live_projects_page(limit=page_size, cursor=cursor)
+            if only_stale:
+                due = [p for p in projects if service.cache_state(p, Project.get_cached_match_entry(p["_id"])) != "fresh"]
+                skipped += len(projects) - len(due)
+                projects = due
+            if projects:
+                failed.extend(_precompute_page(service, projects, stats, search_pool, rank_pool, top_k))
+                processed += len(projects)
+                print(f"[Precompute] {processed} projects done ({len(failed)} failed)")
+            if not cursor:
+                break
+
+    return {
+        "projects": processed,
+        "skipped": skipped,
+        "failed": failed,
+        "wall_seconds": time.time() - started,
+        "stats": stats,
+    }
+
+
+@background_task(priority=-10, max_attempts=2)
+def run_scheduled_precompute():
+    """Nightly job (services/scheduler.py): refresh every live project's match cache."""
+    result = precompute_all_matches()
+    print(f"[Precompute] {result['projects']} projects in {result['wall_seconds']:.1f}s, "
+          f"{len(result['failed'])} failed")
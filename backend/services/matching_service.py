@@ -1,15 +1,36 @@
+import hashlib
 from datetime import datetime
-from pymongo import MongoClient
 
 from config import Config
+from models.db import get_collection
+from models.project import Project
 from models.user import User
+from services.background_tasks import background_task, enqueue_job
 from services.gemini_service import GeminiService
+from services.lexical_index import lexical_index
 from services.vector_service import VectorService
+from utils.metadata_filter import candidate_filter, merge_filters
 
 
-client = MongoClient(Config.MONGODB_URI)
-db = client[Config.DB_NAME]
-feedback_collection = db["matching_feedback"]
+feedback_collection = get_collection("matching_feedback")
+
+# Bump whenever default_weights or the scoring formula changes so cached
+# matches computed under the old scoring are refreshed.
+WEIGHTS_VERSION = 1
+
+# MatchingService for jobs run by the queue workers (model loads once per process)
+_worker_service = None
+
+
+@background_task(priority=-5)
+def refresh_project_matches(project_id: str, founder_id: str):
+    global _worker_service
+    project = Project.find_by_id(project_id)
+    if not project:
+        return
+    if _worker_service is None:
+        _worker_service = MatchingService()
+    _worker_service.refresh_matches(project, founder_id)
 
 
 class MatchingService:
@@ -35,6 +56,86 @@ class MatchingService:
         doc["_id"] = str(result.inserted_id)
         return doc
 
+    def cache_version(self, project: dict) -> dict:
+        """Inputs a cached match list depends on; a change in any of them invalidates it."""
+        description = f"{project.get('title', '')}\n{project.get('description', '')}\n{','.join(project.get('required_skills', []))}"
+        return {
+            "description_hash": hashlib.sha256(description.encode("utf-8")).hexdigest(),
+            "embedding_model": VectorService.MODEL_NAME,
+            "weights_version": WEIGHTS_VERSION,
+        }
+
+    def refresh_matches(self, project: dict, founder_id: str) -> list:
+        matches = self.find_matches(project, founder_id)
+        Project.cache_matches(project["_id"], matches, version=self.cache_version(project))
+        return matches
+
+    def _refresh_in_background(self, project: dict, founder_id: str):
+        # dedupe_key: at most one queued/running refresh per project
+        project_id = str(project["_id"])
+        enqueue_job(refresh_project_matches, (project_id, founder_id), dedupe_key=f"match-refresh:{project_id}")
+
+    def get_matches(self, project: dict, founder_id: str) -> dict:
+        """
+        Stale-while-revalidate read of a project's matches.
+        Returns {"matches", "cached", "stale", "cached_at"}. A missing,
+        hard-expired or description-mismatched entry is recomputed inline;
+        one that is past the soft TTL, was scored with an older embedding
+        model / weights version, or was invalidated by a candidate profile
+        change, is served as-is while a refresh runs.
+        """
+        entry = Project.get_cached_match_entry(project["_id"])
+        state = self.cache_state(project, entry)
+        if state != "miss":
+            stale = state == "stale"
+            if stale:
+                self._refresh_in_background(project, founder_id)
+            return {"matches": entry["matches"], "cached": True, "stale": stale, "cached_at": entry["cached_at"]}
+
+        matches = self.refresh_matches(project, founder_id)
+        return {"matches": matches, "cached": False, "stale": False, "cached_at": datetime.utcnow()}
+
+    def cache_state(self, project: dict, entry) -> str:
+        """Classify a cached match entry for this project as "fresh", "stale" or "miss"."""
+        # an empty match list is a real result (no candidates), not a miss
+        if not entry or entry.get("matches") is None or not entry["cached_at"]:
+            return "miss"
+        version = self.cache_version(project)
+        cached_version = entry.get("version") or {}
+        age = (datetime.utcnow() - entry["cached_at"]).total_seconds()
+        if cached_version.get("description_hash") != version["description_hash"] \
+                or age >= Config.MATCH_CACHE_HARD_TTL_SECONDS:
+            return "miss"
+        if age >= Config.MATCH_CACHE_SOFT_TTL_SECONDS or cached_version != version or entry.get("invalidated", False):
+            return "stale"
+        return "fresh"
+
+    def project_analysis(self, project: dict) -> dict:
+        """analyze_project_needs, cached on the project document per description hash."""
+        description = project.get("description", "")
+        description_hash = hashlib.sha256(description.encode("utf-8")).hexdigest()
+        cached = project.get("analysis") or {}
+        if cached.get("description_hash") == description_hash:
+            return cached["result"]
+
+        analysis = self.gemini_service.analyze_project_needs(description)
+        # analyze_project_needs returns empty lists on failure; don't pin that
+        if any(analysis.get(key) for key in ("required_skills", "required_roles")):
+            project["analysis"] = Project.cache_analysis(project["_id"], description_hash, analysis)
+        return analysis
+
+    def build_search_query(self, project: dict, project_analysis: dict) -> dict:
+        required_skills = project_analysis.get("required_skills", []) or project.get("required_skills", [])
+        required_roles = project_analysis.get("required_roles", [])
+
+        skills_text = ", ".join(required_skills)
+        roles_text = ", ".join(required_roles)
+        return {
+            "text": f"{project['description']} Required skills: {skills_text}. Roles: {roles_text}",
+            "required_skills": required_skills,
+            "required_roles": required_roles,
+        }
+
     def _normalize_vector_score(self, value: float) -> float:
         return max(0.0, min(1.0, float(value)))
 
@@ -67,27 +168,93 @@ class MatchingService:
     def _weighted_score(self, subscores: dict) -> float:
         return sum(self.default_weights[key] * subscores[key] for key in self.default_weights)
 
-    def find_matches(self, project: dict, founder_id: str, top_k: int = 10) -> list:
-        project_analysis = self.gemini_service.analyze_project_needs(project["description"])
-        required_skills = project_analysis.get("required_skills", []) or project.get("required_skills", [])
-        required_roles = project_analysis.get("required_roles", [])
+    def find_matches(self, project: dict, founder_id: str, top_k: int = 10, metadata_filter: dict = None) -> list:
+        project_analysis = self.project_analysis(project)
+        query = self.build_search_query(project, project_analysis)
+        vector_results = self.retrieve(query, founder_id, top_k, metadata_filter=metadata_filter)
+        return self.rank_matches(project, project_analysis, query, vector_results)
 
-        skills_text = ", ".join(required_skills)
-        roles_text = ", ".join(required_roles)
-        search_query = f"{project['description']} Required skills: {skills_text}. Roles: {roles_text}"
+    def retrieve(self, query: dict, founder_id: str, top_k: int = 10, query_vector: list = None,
+                 metadata_filter: dict = None) -> list:
+        """
+        Candidate retrieval per MATCH_RETRIEVAL_MODE: vector search alone, or
+        fused with BM25 over the in-memory lexical index. In fused modes each
+        side fetches 2 × top_k so the fusion has overlap to work with.
+        Eligibility (the founder, MATCH_EXCLUDE_FOUNDERS, metadata_filter from
+        utils.metadata_filter.candidate_filter) is applied inside both
+        backends, so each returns only eligible candidates.
+        """
+        eligible = merge_filters(
+            candidate_filter(exclude_ids=[founder_id], exclude_founders=Config.MATCH_EXCLUDE_FOUNDERS),
+            metadata_filter,
+        )
+        mode = Config.MATCH_RETRIEVAL_MODE
+        pool = top_k if mode == "vector" else top_k * 2
+        if query_vector is None:
+            vector_results = self.vector_service.search(query_text=query["text"], k=pool, metadata_filter=eligible)
+        else:
+            vector_results = self.vector_service.search_by_vector(query_vector, k=pool, metadata_filter=eligible)
+        if mode == "vector":
+            return vector_results
+        lexical_results = lexical_index.search(
+            query["text"], k=pool, boost_terms=query["required_skills"], metadata_filter=eligible
+        )
+        return self._fuse(vector_results, lexical_results, mode)[:top_k]
+
+    def _fuse(self, vector_results: list, lexical_results: list, mode: str) -> list:
+        """
+        Merge vector and BM25 hits, best first. "rrf" adds weight / (MATCH_RRF_K
+        + rank) per list; "weighted" adds weight × the min-max normalised score.
+        similarity_score stays the cosine similarity (0 for keyword-only hits)
+        because rank_matches scores it as its own subscore.
+        """
+        sources = (
+            ("vector", Config.MATCH_VECTOR_WEIGHT, vector_results, "similarity_score"),
+            ("lexical", Config.MATCH_LEXICAL_WEIGHT, lexical_results, "score"),
+        )
+        fused = {}
+        for source, weight, results, score_key in sources:
+            if not results:
+                continue
+            low = min(result[score_key] for result in results)
+            high = max(result[score_key] for result in results)
+            for rank, result in enumerate(results, start=1):
+                if mode == "weighted":
+                    contribution = (result[score_key] - low) / (high - low) if high > low else 1.0
+                else:
+                    contribution = 1.0 / (Config.MATCH_RRF_K + rank)
+                entry = fused.setdefault(result["user_id"], {
+                    "user_id": result["user_id"],
+                    "similarity_score": 0.0,
+                    "lexical_score": 0.0,
+                    "fused_score": 0.0,
+                    "metadata": {},
+                })
+                entry["fused_score"] += weight * contribution
+                if source == "vector":
+                    entry["similarity_score"] = result["similarity_score"]
+                    entry["metadata"] = result.get("metadata", {})
+                else:
+                    entry["lexical_score"] = result["score"]
+        return sorted(fused.values(), key=lambda entry: entry["fused_score"], reverse=True)
 
-        vector_results = self.vector_service.search(query_text=search_query, k=top_k, exclude_ids=[founder_id])
+    def rank_matches(self, project: dict, project_analysis: dict, query: dict, vector_results: list) -> list:
+        """Hydrate vector hits, LLM-rank them and blend in the weighted subscores."""
         if not vector_results:
             return []
+        required_skills = query["required_skills"]
+        required_roles = query["required_roles"]
 
+        users = User.find_many_by_ids([result["user_id"] for result in vector_results], "index")
         candidates = []
         for result in vector_results:
-            user = User.find_by_id(result["user_id"])
+            user = users.get(str(result["user_id"]))
             if user:
-                user["vector_similarity"] = result["similarity_score"]
-                candidates.append(user)
+                candidates.append({**user, "vector_similarity": result["similarity_score"]})
         if not candidates:
             return []
+        # rank_candidates prompts with the full resume text
+        User.attach_resume_text(candidates)
 
         rankings = self.gemini_service.rank_candidates(
             project=project,
@@ -0,0 +1,110 @@
+from config import Config
+from models.project import Project
+from services.background_tasks import background_task, enqueue_job
+from utils.pagination import InvalidCursor, decode_offset_cursor, encode_offset_cursor
+from utils.ttl_cache import TTLCache
+
+# (user_id, vector_synced_at) -> ranked [{"project_id", "score"}]. Keyed on
+# the profile vector's version so a re-embedded profile is ranked afresh;
+# the TTL bounds how long new or edited projects stay invisible.
+ranking_cache = TTLCache(ttl_seconds=Config.PROJECT_RECOMMENDATION_CACHE_SECONDS, max_entries=5000)
+
+# VectorService for the queue workers (model loads once per process)
+_vector_service = None
+
+
+def _get_vector_service():
+    global _vector_service
+    if _vector_service is None:
+        from services.vector_service import VectorService
+        _vector_service = VectorService()
+    return _vector_service
+
+
+@background_task(priority=5)
+def sync_project_vector(project_id):
+    """Index a live project in the project namespace, or drop it once it isn't live."""
+    project = Project.find_by_id(project_id)
+    vector_service = _get_vector_service()
+    if project and project.get("live"):
+        ok = vector_service.upsert_project(project)
+    else:
+        ok = vector_service.remove_project(project_id)
+    if not ok:
+        raise RuntimeError(f"Project vector sync failed for {project_id}")
+
+
+def queue_project_vector_sync(project_id):
+    """
+    Called by the Project model after writes. The job reads the current
+    state, so edits made while one is queued share it.
+    """
+    try:
+        enqueue_job(
+            sync_project_vector, (str(project_id),),
+            delay_seconds=Config.VECTOR_SYNC_DELAY_SECONDS,
+            dedupe_key=f"project-vector:{project_id}",
+        )
+    except Exception as e:
+        print(f"[Recommendations] Could not queue vector sync for project {project_id}: {e}")
+
+
+def _ranking_for(vector_service, user):
+    """Cached project ranking for a user, or None while their profile has no vector."""
+    key = (str(user["_id"]), user.get("vector_synced_at"))
+    ranking = ranking_cache.get(key)
+    if ranking is None:
+        vector = vector_service.user_profile_vector(user["_id"])
+        if vector is None:
+            return None
+        ranking = vector_service.search_projects(
+            vector,
+            k=Config.PROJECT_RECOMMENDATION_POOL,
+            metadata_filter={"founder_id": {"$ne": str(user["_id"])}},
+        )
+        ranking_cache.set(key, ranking)
+    return ranking
+
+
+def recommend_projects(vector_service, user, limit, cursor=None):
+    """
+    One page of live projects ranked for `user` by similarity to their
+    profile vector: (projects, next_cursor, ranked). Pages are slices of
+    the cached ranking, addressed by offset cursors. Until the user's
+    profile is indexed, falls back to newest-first live projects
+    (ranked=False, keyset cursors as in /api/projects/live); the same
+    fallback is served while the vector index is unreachable.
+    """
+    offset = 0
+    if cursor:
+        try:
+            offset = decode_offset_cursor(cursor)
+        except InvalidCursor:
+            # a keyset cursor handed out by the unranked fallback
+            offset = None
+
+    if offset is not None:
+        try:
+            ranking = _ranking_for(vector_service, user)
+        except Exception as e:
+            # Pinecone unavailable: serve the unranked feed rather than fail
+            print(f"[Recommendations] Ranking failed for user {user['_id']}: {e}")
+            ranking = None
+        if ranking is not None:
+            page = ranking[offset:offset + limit]
+            found = Project.find_many_by_ids([entry["project_id"] for entry in page])
+            projects = []
+            for entry in page:
+                project = found.get(entry["project_id"])
+                # the index lags MongoDB by a sync; skip projects taken offline since
+                if project and project.get("live"):
+                    project.pop("cached_matches", None)
+                    project["recommendation_score"] = entry["score"]
+                    projects.append(project)
+            next_offset = offset + limit
+            next_cursor = encode_offset_cursor(next_offset) if next_offset < len(ranking) else None
+            return projects, next_cursor, True
+        cursor = None
+
+    projects, next_cursor = Project.get_live_projects_page(limit=limit, cursor=cursor)
+    return projects, next_cursor, False
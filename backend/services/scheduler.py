@@ -0,0 +1,126 @@
+import heapq
+import threading
+import time
+from datetime import datetime, timedelta
+
+from pymongo.errors import DuplicateKeyError
+
+from models.db import get_collection
+from services.background_tasks import enqueue_job
+
+# Recurring jobs. One scheduler thread per process sleeps on a timer heap
+# until the next entry is due, then hands the task to the durable job queue
+# — it never runs task code itself, so workers only ever see ready work.
+# One-off delayed jobs don't need this: enqueue_job(..., delay_seconds=N)
+# stores them with a future run_at and no worker claims them until then.
+#
+# Every API process and worker may run a scheduler. The schedules collection
+# records each entry's next due time, and only the process that advances it
+# enqueues the run, so a recurring job fires once per interval cluster-wide.
+
+schedules_collection = get_collection('schedules')
+
+_registry = {}
+_lock = threading.Lock()
+_wakeup = threading.Event()
+_thread = None
+
+
+def every(name, interval_seconds, task, *args, dedupe_key=None, **kwargs):
+    """
+    Register task(*args, **kwargs) to be enqueued every interval_seconds.
+    dedupe_key defaults to "schedule:<name>"; pass the key other enqueuers
+    of the same task use so a scheduled run and an on-demand run never overlap.
+    """
+    with _lock:
+        _registry[name] = {
+            "interval": interval_seconds,
+            "task": task,
+            "args": args,
+            "kwargs": kwargs,
+            "dedupe_key": dedupe_key or f"schedule:{name}",
+        }
+    _wakeup.set()
+
+
+def _claim_run(name, interval, now):
+    """Advance the shared next-run time for `name`; True if this process won the run."""
+    next_run = now + timedelta(seconds=interval)
+    result = schedules_collection.update_one(
+        {"_id": name, "next_run_at": {"$lte": now}},
+        {"$set": {"next_run_at": next_run, "last_run_at": now, "interval_seconds": interval}}
+    )
+    if result.modified_count:
+        return True
+    try:
+        # first run anywhere: start the clock one interval out, matching the old hourly loop
+        schedules_collection.insert_one({"_id": name, "next_run_at": next_run, "interval_seconds": interval})
+    except DuplicateKeyError:
+        pass
+    return False
+
+
+def _next_due(name, interval):
+    doc = schedules_collection.find_one({"_id": name}, {"next_run_at": 1})
+    if not doc:
+        return time.time()
+    return time.time() + max(0.0, (doc["next_run_at"] - datetime.utcnow()).total_seconds())
+
+
+def _run(stop_event):
+    heap = []
+    scheduled = set()
+    while not stop_event.is_set():
+        with _lock:
+            for name in _registry:
+                if name not in scheduled:
+                    heapq.heappush(heap, (time.time(), name))
+                    scheduled.add(name)
+
+        if not heap:
+            _wakeup.wait()
+            _wakeup.clear()
+            continue
+
+        due_at, name = heap[0]
+        delay = due_at - time.time()
+        if delay > 0:
+            # a new registration wakes us early so it can join the heap
+            if _wakeup.wait(delay):
+                _wakeup.clear()
+            continue
+
+        heapq.heappop(heap)
+        entry = _registry[name]
+        try:
+            if _claim_run(name, entry["interval"], datetime.utcnow()):
+                enqueue_job(entry["task"], entry["args"], entry["kwargs"], dedupe_key=entry["dedupe_key"])
+                print(f"[Scheduler] Enqueued {name}")
+            heapq.heappush(heap, (_next_due(name, entry["interval"]), name))
+        except Exception as e:
+            print(f"[Scheduler] {name} failed to schedule: {e}")
+            heapq.heappush(heap, (time.time() + min(60, entry["interval"]), name))
+
+
+def register_default_schedules():
+    from config import Config
+    from models.vector_outbox import SYNC_JOB_KEY
+    from services.match_precompute import run_scheduled_precompute
+    from services.session_service import SessionManager
+    from services.vector_sync import sync_vector_outbox
+
+    every("session_cleanup", Config.SESSION_CLEANUP_INTERVAL_SECONDS, SessionManager.cleanup_expired_sessions)
+    every("vector_outbox_sync", Config.VECTOR_SYNC_INTERVAL_SECONDS, sync_vector_outbox, dedupe_key=SYNC_JOB_KEY)
+    if Config.MATCH_PRECOMPUTE_INTERVAL_SECONDS:
+        every("match_precompute", Config.MATCH_PRECOMPUTE_INTERVAL_SECONDS, run_scheduled_precompute)
+
+
+def start(stop_event=None):
+    """Start this process's scheduler thread (idempotent)."""
+    global _thread
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return _thread
+        _thread = threading.Thread(target=_run, args=(stop_event or threading.Event(),), daemon=True, name="scheduler")
+        _thread.start()
+        return _thread
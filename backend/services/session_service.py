@@ -1,12 +1,10 @@
 from datetime import datetime, timedelta
-from pymongo import MongoClient
 from config import Config
+from models.db import get_collection
 import secrets
 import jwt
 
-client = MongoClient(Config.MONGODB_URI)
-db = client[Config.DB_NAME]
-sessions_collection = db['sessions']
+sessions_collection = get_collection('sessions')
 
 class SessionManager:
     """Manage user sessions with MongoDB"""
@@ -109,21 +107,3 @@ class SessionManager:
             'expires_at': session['expires_at'],
             'time_remaining': (session['expires_at'] - datetime.utcnow()).total_seconds()
         }
-
-# Initialize session cleanup on import
-# In production, use a scheduler like Celery or APScheduler
-def init_session_cleanup():
-    """Initialize periodic session cleanup"""
-    import threading
-    import time
-    
-    def cleanup_task():
-        while True:
-            time.sleep(3600)  # Run every hour
-            SessionManager.cleanup_expired_sessions()
-    
-    cleanup_thread = threading.Thread(target=cleanup_task, daemon=True)
-    cleanup_thread.start()
-
-# Auto-start cleanup
-init_session_cleanup()
\ No newline at end of file
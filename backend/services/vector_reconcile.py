@@ -0,0 +1,103 @@
+import time
+from datetime import timezone
+
+from bson.objectid import ObjectId
+
+from config import Config
+from models.user import User, users_collection
+
+
+def _epoch(value):
+    return value.replace(tzinfo=timezone.utc).timestamp() if value else None
+
+
+def _diff_page(vector_service, users):
+    """Split one page of Mongo users into (missing, stale) against the index."""
+    present = vector_service.fetch_user_metadata([user["_id"] for user in users])
+    missing, stale = [], []
+    for user in users:
+        metadata = present.get(user["_id"])
+        if metadata is None:
+            missing.append(user["_id"])
+        elif (metadata.get("updated_at") or 0) < (_epoch(user.get("updated_at")) or 0):
+            # stamped before the last Mongo write (or never stamped)
+            stale.append(user["_id"])
+    return missing, stale
+
+
+def _orphans_in_page(vector_service, ids):
+    """
+    Index ids on this page with no matching Mongo user, plus pre-chunking
+    single vectors and chunks beyond VECTOR_MAX_CHUNKS.
+    """
+    parsed = {vector_id: vector_service.parse_vector_id(vector_id) for vector_id in ids}
+    object_ids = list({ObjectId(user_id) for user_id, _ in parsed.values() if ObjectId.is_valid(user_id)})
+    existing = {str(doc["_id"]) for doc in users_collection.find({"_id": {"$in": object_ids}}, {"_id": 1})}
+    return [
+        vector_id for vector_id, (user_id, chunk) in parsed.items()
+        if user_id not in existing or chunk is None or chunk >= Config.VECTOR_MAX_CHUNKS
+    ]
+
+
+def _repair_users(vector_service, user_ids):
+    users = list(User.find_many_by_ids(user_ids, "index").values())
+    if not users:
+        return 0
+    User.attach_resume_text(users)
+    if not vector_service.build_index(users):
+        raise RuntimeError(f"Batch upsert of {len(users)} users failed")
+    for user in users:
+        User.mark_vector_synced(user["_id"], user.get("updated_at"), vector_service.text_hash(user))
+    return len(users)
+
+
+def reconcile(vector_service, page_size=500, repair=False, sample_limit=20):
+    """
+    Compare Mongo users with the vector index in two streaming passes and
+    optionally repair the differences. Memory is bounded by page_size:
+      1. users in _id order → fetch their profile chunks → missing / stale
+      2. chunk ids page by page → look their users up in Mongo → orphaned
+    Returns counts plus a few sample ids per category.
+    """
+    started = time.time()
+    report = {
+        "users_scanned": 0, "vectors_scanned": 0,
+        "missing": 0, "stale": 0, "orphaned": 0,
+        "repaired": 0, "deleted": 0, "errors": 0,
+        "samples": {"missing": [], "stale": [], "orphaned": []},
+    }
+
+    def note(kind, ids):
+        report[kind] += len(ids)
+        samples = report["samples"][kind]
+        samples.extend(ids[:max(0, sample_limit - len(samples))])
+
+    # Pinecone fetch takes at most ~100-1000 ids per call depending on plan
+    fetch_size = min(page_size, 100)
+    for users in User.iter_user_pages(projection={"updated_at": 1}, page_size=page_size):
+        report["users_scanned"] += len(users)
+        for i in range(0, len(users), fetch_size):
+            missing, stale = _diff_page(vector_service, users[i:i + fetch_size])
+            note("missing", missing)
+            note("stale", stale)
+            if repair and (missing or stale):
+                try:
+                    report["repaired"] += _repair_users(vector_service, missing + stale)
+                except Exception as e:
+                    print(f"[Reconcile] Repair failed: {e}")
+                    report["errors"] += 1
+        print(f"[Reconcile] users {report['users_scanned']}: "
+              f"missing {report['missing']}, stale {report['stale']}")
+
+    for ids in vector_service.iter_id_pages(page_size=min(page_size, 100)):
+        report["vectors_scanned"] += len(ids)
+        orphaned = _orphans_in_page(vector_service, ids)
+        note("orphaned", orphaned)
+        if repair and orphaned:
+            if vector_service.delete_ids(orphaned):
+                report["deleted"] += len(orphaned)
+            else:
+                report["errors"] += 1
+
+    report["wall_seconds"] = time.time() - started
+    return report
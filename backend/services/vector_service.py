@@ -1,16 +1,40 @@
+import hashlib
+import math
 import os
-from typing import List, Dict, Optional
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from sentence_transformers import SentenceTransformer
 from pinecone import Pinecone, ServerlessSpec
 from config import Config
+from services.lexical_index import lexical_index
+from utils.metadata_filter import candidate_filter, filter_fields, merge_filters
+from utils.stage_stats import StageStats
 
 
 class VectorService:
-    # Embedding dimension for 'all-MiniLM-L6-v2'
+    MODEL_NAME = "all-MiniLM-L6-v2"
+    # Embedding dimension for MODEL_NAME
     DIMENSION = 384
+    # Vectors per Pinecone upsert request (Pinecone's recommended batch size)
+    UPSERT_BATCH_SIZE = 100
+    # Pinecone's limit on ids per delete request
+    DELETE_BATCH_SIZE = 1000
+    # Pinecone's top_k ceiling for queries that include metadata
+    MAX_QUERY_TOP_K = 1000
+    # Temperature of the "softmax" chunk aggregation; lower is closer to max
+    SOFTMAX_TEMPERATURE = 0.05
+    # One vector per live project, kept apart from the user vectors
+    PROJECT_NAMESPACE = "projects"
+    # Bump when _metadata gains or changes fields; it is part of text_hash so
+    # incremental runs rewrite every vector's metadata
+    METADATA_VERSION = 2
 
     def __init__(self):
-        self.model = SentenceTransformer("all-MiniLM-L6-v2")
+        self.model = SentenceTransformer(self.MODEL_NAME)
 
         # --- Pinecone init ---
         api_key = os.getenv("PINECONE_API_KEY")
@@ -45,15 +69,36 @@ class VectorService:
             print(f"[VectorService] Using existing Pinecone index '{self.index_name}'.")
 
     # ------------------------------------------------------------------
-    # Embedding helpers
+    # Chunk ids
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def chunk_id(user_id, chunk: int) -> str:
+        return f"{user_id}#{chunk}"
+
+    @staticmethod
+    def parse_vector_id(vector_id: str) -> Tuple[str, Optional[int]]:
+        """(user_id, chunk) for an index id; chunk is None for pre-chunking single vectors."""
+        user_id, _, chunk = vector_id.partition("#")
+        return user_id, int(chunk) if chunk.isdigit() else None
+
+    def _stale_chunk_ids(self, user_id, keep: int) -> List[str]:
+        """
+        Ids a user may hold beyond their first `keep` chunks, plus the legacy
+        single-vector id. Chunk ids are deterministic, so leftovers from a
+        longer resume are deleted without listing the index.
+        """
+        user_id = str(user_id)
+        return [user_id] + [self.chunk_id(user_id, i) for i in range(keep, Config.VECTOR_MAX_CHUNKS)]
+
+    # ------------------------------------------------------------------
+    # Text building
     # ------------------------------------------------------------------
 
     def _user_to_text(self, user: Dict) -> str:
         """
-        Build a rich text representation of a user so the embedding captures
-        everything meaningful: bio, skills, title, resume content, location.
-        All uploaded content (resume text, etc.) is included here so Pinecone
-        always has the latest full picture of each user.
+        Profile text of a user (chunk 0): bio, skills, title, location,
+        experience. The resume is embedded separately by _chunk_texts.
         """
         parts = []
 
@@ -74,13 +119,62 @@ class VectorService:
         if exp:
             parts.append(f"Experience: {exp} years")
 
-        # Include resume text if it has been parsed and stored on the user doc
-        if user.get("resume_text"):
-            # Truncate to avoid token limits — first 2000 chars is plenty for embedding
-            parts.append(f"Resume: {user['resume_text'][:2000]}")
-
         return " | ".join(parts) if parts else user.get("name", "")
 
+    def _chunk_texts(self, user: Dict) -> List[str]:
+        """
+        Embedding inputs for one user: the profile, then the resume in
+        overlapping VECTOR_CHUNK_CHARS windows cut at whitespace, so the
+        whole resume is searchable instead of its first 2000 characters.
+        """
+        texts = [self._user_to_text(user)]
+        resume = " ".join((user.get("resume_text") or "").split())
+        size = Config.VECTOR_CHUNK_CHARS
+        step = max(1, size - Config.VECTOR_CHUNK_OVERLAP)
+        start = 0
+        while start < len(resume) and len(texts) < Config.VECTOR_MAX_CHUNKS:
+            end = min(len(resume), start + size)
+            if end < len(resume):
+                cut = resume.rfind(" ", start + step, end)
+                end = cut if cut > 0 else end
+            texts.append(f"Resume: {resume[start:end]}")
+            if end >= len(resume):
+                break
+            start = max(start + 1, end - Config.VECTOR_CHUNK_OVERLAP)
+        return texts
+
+    def _metadata(self, user: Dict) -> Dict:
+        metadata = {
+            "name": user.get("name", ""),
+            "email": user.get("email", ""),
+            "professional_title": user.get("professional_title", ""),
+            "skills": user.get("skills", []),
+            "location": user.get("location", ""),
+            # user_id, role, experience_years, location_key, has_resume:
+            # the fields search filters can use
+            **filter_fields(user),
+        }
+        # version stamp compared by the reconciler (epoch seconds; Pinecone
+        # metadata has no date type)
+        if user.get("updated_at"):
+            metadata["updated_at"] = user["updated_at"].replace(tzinfo=timezone.utc).timestamp()
+        return metadata
+
+    def text_hash(self, user: Dict) -> str:
+        """Fingerprint of the embedding input; equal hashes mean re-embedding is pointless."""
+        header = (f"{self.MODEL_NAME}:{Config.VECTOR_CHUNK_CHARS}:{Config.VECTOR_CHUNK_OVERLAP}:"
+                  f"{Config.VECTOR_MAX_CHUNKS}:{self.METADATA_VERSION}")
+        return hashlib.sha256("\n".join([header] + self._chunk_texts(user)).encode("utf-8")).hexdigest()
+
+    def _chunk_vectors(self, user: Dict, vectors: List[List[float]]) -> List[Tuple]:
+        """Pinecone (id, vector, metadata) tuples for one user's chunks."""
+        user_id = str(user["_id"])
+        metadata = self._metadata(user)
+        return [
+            (self.chunk_id(user_id, i), vector, {**metadata, "chunk": i})
+            for i, vector in enumerate(vectors)
+        ]
+
     def _embed(self, text: str) -> List[float]:
         return self.model.encode(text).tolist()
 
@@ -93,85 +187,197 @@ class VectorService:
 
     def upsert_user(self, user: Dict) -> bool:
         """
-        Insert or update a single user vector in Pinecone.
+        Insert or update a user's chunk vectors in Pinecone.
         Called whenever:
           - A new user signs up
           - A user updates their profile
           - A user uploads / deletes a resume
 
-        Because Pinecone is cloud-hosted, this change is instantly visible
-        to every server and developer querying the same index.
+        The new chunk set is written first and leftovers from the previous
+        set are deleted after, so queries see the old or the new chunks but
+        never a user without vectors. Because Pinecone is cloud-hosted, this
+        change is instantly visible to every server querying the same index.
         """
         try:
             user_id = str(user["_id"])
-            text = self._user_to_text(user)
-            vector = self._embed(text)
-
-            metadata = {
-                "name": user.get("name", ""),
-                "email": user.get("email", ""),
-                "professional_title": user.get("professional_title", ""),
-                "skills": user.get("skills", []),
-                "experience_years": user.get("experience_years", 0),
-                "location": user.get("location", ""),
-                "has_resume": bool(user.get("resume")),
-            }
+            vectors = self._chunk_vectors(user, self._embed_batch(self._chunk_texts(user)))
 
-            self.index.upsert(vectors=[(user_id, vector, metadata)])
-            print(f"[VectorService] Upserted user {user_id} ({user.get('name', '')})")
+            self._upsert_with_retry(vectors)
+            self.index.delete(ids=self._stale_chunk_ids(user_id, len(vectors)))
+            lexical_index.upsert(user)
+            print(f"[VectorService] Upserted user {user_id} ({user.get('name', '')}, {len(vectors)} chunks)")
             return True
         except Exception as e:
             print(f"[VectorService] Error upserting user: {e}")
             return False
 
-    def build_index(self, users: List[Dict]) -> bool:
+    def build_index(
+        self,
+        users: Iterable[Dict],
+        encode_batch_size: int = None,
+        upload_workers: int = None,
+        encode_processes: int = None,
+        on_committed: Optional[Callable[[List[Dict]], None]] = None,
+    ) -> bool:
         """
-        Bulk upsert all users — used during initial data ingestion or a full
-        reindex. Sends in batches of 100 (Pinecone's recommended batch size).
+        Bulk upsert users — initial ingestion, reindexing, outbox batches.
+
+        `users` may be a list or any iterable (e.g. a Mongo cursor generator);
+        it is consumed lazily. Three overlapping stages:
+          producer (caller's thread) → encoder thread → upload pool
+        connected by bounded queues, so memory is capped at roughly
+        queue capacity × encode_batch_size users regardless of input size.
+        Each user becomes one vector per chunk (see _chunk_texts). Uploads go
+        out as ~UPSERT_BATCH_SIZE-vector requests holding whole users, retried
+        with backoff, then the users' leftover chunks are deleted.
+        on_committed(users) runs after each batch is committed.
+        Returns True only if every batch was upserted.
         """
-        if not users:
-            print("[VectorService] No users to index.")
-            return False
-
+        encode_batch_size = encode_batch_size or Config.VECTOR_ENCODE_BATCH_SIZE
+        upload_workers = upload_workers or Config.VECTOR_UPLOAD_WORKERS
+        encode_processes = encode_processes if encode_processes is not None else Config.VECTOR_ENCODE_PROCESSES
+
+        encode_queue = queue.Queue(maxsize=Config.VECTOR_PIPELINE_QUEUE_SIZE)
+        stats = {name: StageStats(name) for name in ("read", "encode", "upload")}
+        failures = []
+        started = time.time()
+
+        pool = self.model.start_multi_process_pool(["cpu"] * encode_processes) if encode_processes > 1 else None
+        # bounds upload batches waiting or in flight
+        upload_slots = threading.BoundedSemaphore(upload_workers * 2)
+
+        def upload(batch_users, batch):
+            try:
+                t0 = time.perf_counter()
+                self._upsert_with_retry(batch)
+                counts = {}
+                for vector_id, _, _ in batch:
+                    user_id, _ = self.parse_vector_id(vector_id)
+                    counts[user_id] = counts.get(user_id, 0) + 1
+                # up to VECTOR_MAX_CHUNKS ids per user: split to stay under the per-request limit
+                self._delete_in_batches([
+                    stale for user_id, count in counts.items() for stale in self._stale_chunk_ids(user_id, count)
+                ])
+                stats["upload"].record(time.perf_counter() - t0, count=len(batch))
+                lexical_index.upsert_many(batch_users)
+                if on_committed:
+                    on_committed(batch_users)
+            except Exception as e:
+                print(f"[VectorService] Upload batch failed: {e}")
+                stats["upload"].record(0.0, ok=False, count=len(batch))
+                failures.append(e)
+            finally:
+                upload_slots.release()
+
+        def submit(uploads, batch_users, batch):
+            upload_slots.acquire()
+            try:
+                uploads.submit(upload, batch_users, batch)
+            except Exception:
+                upload_slots.release()
+                raise
+
+        def encode_chunk(uploads, chunk):
+            t0 = time.perf_counter()
+            user_texts = [self._chunk_texts(u) for u in chunk]
+            texts = [text for per_user in user_texts for text in per_user]
+            if pool is not None:
+                vectors = self.model.encode_multi_process(texts, pool, batch_size=encode_batch_size).tolist()
+            else:
+                vectors = self._embed_batch(texts)
+            if len(vectors) != len(texts):
+                raise RuntimeError(f"encoder returned {len(vectors)} vectors for {len(texts)} texts")
+            stats["encode"].record(time.perf_counter() - t0, count=len(texts))
+            # whole users per request, so a committed batch holds complete chunk sets
+            batch_users, batch, offset = [], [], 0
+            for user, per_user in zip(chunk, user_texts):
+                batch_users.append(user)
+                batch.extend(self._chunk_vectors(user, vectors[offset:offset + len(per_user)]))
+                offset += len(per_user)
+                if len(batch) >= self.UPSERT_BATCH_SIZE:
+                    submit(uploads, batch_users, batch)
+                    batch_users, batch = [], []
+            if batch:
+                submit(uploads, batch_users, batch)
+
+        def encoder(uploads):
+            finished = False
+            try:
+                while True:
+                    chunk = encode_queue.get()
+                    if chunk is None:
+                        finished = True
+                        return
+                    try:
+                        encode_chunk(uploads, chunk)
+                    except Exception as e:
+                        print(f"[VectorService] Encode batch failed: {e}")
+                        stats["encode"].record(0.0, ok=False, count=len(chunk))
+                        failures.append(e)
+            finally:
+                if not finished:
+                    # dying early: keep consuming so the producer never blocks on a full queue
+                    failures.append(RuntimeError("vector encoder stopped"))
+                    while encode_queue.get() is not None:
+                        pass
+
+        total = 0
         try:
-            texts = [self._user_to_text(u) for u in users]
-            vectors = self._embed_batch(texts)
-
-            batch_size = 100
-            for i in range(0, len(users), batch_size):
-                batch_users = users[i : i + batch_size]
-                batch_vectors = vectors[i : i + batch_size]
-
-                upsert_data = []
-                for user, vector in zip(batch_users, batch_vectors):
-                    user_id = str(user["_id"])
-                    metadata = {
-                        "name": user.get("name", ""),
-                        "email": user.get("email", ""),
-                        "professional_title": user.get("professional_title", ""),
-                        "skills": user.get("skills", []),
-                        "experience_years": user.get("experience_years", 0),
-                        "location": user.get("location", ""),
-                        "has_resume": bool(user.get("resume")),
-                    }
-                    upsert_data.append((user_id, vector, metadata))
-
-                self.index.upsert(vectors=upsert_data)
-                print(
-                    f"[VectorService] Upserted batch {i // batch_size + 1} "
-                    f"({len(batch_users)} users)"
-                )
-
-            print(f"[VectorService] Total users indexed: {len(users)}")
+            with ThreadPoolExecutor(max_workers=upload_workers, thread_name_prefix="vector-upload") as uploads:
+                encode_thread = threading.Thread(target=encoder, args=(uploads,), daemon=True, name="vector-encode")
+                encode_thread.start()
+
+                try:
+                    chunk = []
+                    t0 = time.perf_counter()
+                    for user in users:
+                        chunk.append(user)
+                        if len(chunk) >= encode_batch_size:
+                            stats["read"].record(time.perf_counter() - t0, count=len(chunk))
+                            total += len(chunk)
+                            encode_queue.put(chunk)
+                            chunk = []
+                            t0 = time.perf_counter()
+                    if chunk:
+                        stats["read"].record(time.perf_counter() - t0, count=len(chunk))
+                        total += len(chunk)
+                        encode_queue.put(chunk)
+                finally:
+                    # let the encoder drain what was queued and stop, even if the producer raised
+                    encode_queue.put(None)
+                    encode_thread.join()
+        finally:
+            if pool is not None:
+                self.model.stop_multi_process_pool(pool)
+
+        if not total:
+            # nothing to index is not a failure (e.g. rebuilding an empty collection)
+            print("[VectorService] No users to index.")
             return True
-        except Exception as e:
-            print(f"[VectorService] Error building index: {e}")
-            return False
+
+        wall = time.time() - started
+        print(f"[VectorService] Indexed {total} users in {wall:.1f}s")
+        for stage in stats.values():
+            print(stage.report(wall, unit="vectors"))
+        return not failures
+
+    def _upsert_with_retry(self, batch, attempts: int = 4, namespace: Optional[str] = None):
+        for attempt in range(1, attempts + 1):
+            try:
+                self.index.upsert(vectors=batch, namespace=namespace)
+                return
+            except Exception as e:
+                if attempt == attempts:
+                    raise
+                delay = 2 ** (attempt - 1)
+                print(f"[VectorService] Upsert attempt {attempt} failed ({e}); retrying in {delay}s")
+                time.sleep(delay)
 
     def remove_user(self, user_id: str) -> bool:
-        """Delete a user vector from Pinecone (e.g. account deletion)."""
+        """Delete all of a user's chunk vectors from Pinecone (e.g. account deletion)."""
         try:
-            self.index.delete(ids=[str(user_id)])
+            self.index.delete(ids=self._stale_chunk_ids(user_id, 0))
+            lexical_index.remove(user_id)
             print(f"[VectorService] Deleted user {user_id} from Pinecone.")
             return True
         except Exception as e:
@@ -182,7 +388,8 @@ class VectorService:
     # Search
     # ------------------------------------------------------------------
 
-    def search(self, query_text: str, k: int = 10, exclude_ids: Optional[List[str]] = None) -> List[Dict]:
+    def search(self, query_text: str, k: int = 10, exclude_ids: Optional[List[str]] = None,
+               metadata_filter: Optional[Dict] = None) -> List[Dict]:
         """
         Query Pinecone for the top-k most semantically similar users.
 
@@ -191,42 +398,73 @@ class VectorService:
                         (project description + required skills + roles work great)
             k:          how many results to return
             exclude_ids: list of user_ids to exclude (e.g. the founder)
+            metadata_filter: Pinecone filter, usually built by
+                        utils.metadata_filter.candidate_filter (role,
+                        experience range, location, has_resume)
 
         Returns:
             List of dicts with keys: user_id, similarity_score, metadata
         """
         try:
-            query_vector = self._embed(query_text)
-
-            # Fetch slightly more than k so we can filter excludes client-side
-            fetch_k = k + len(exclude_ids or []) + 5
-
-            response = self.index.query(
-                vector=query_vector,
-                top_k=fetch_k,
-                include_metadata=True,
-            )
-
-            exclude_set = set(str(uid) for uid in (exclude_ids or []))
-            results = []
-            for match in response.matches:
-                if match.id in exclude_set:
-                    continue
-                results.append(
-                    {
-                        "user_id": match.id,
-                        "similarity_score": float(match.score),
-                        "metadata": match.metadata or {},
-                    }
-                )
-                if len(results) >= k:
-                    break
-
-            return results
+            return self.search_by_vector(self._embed(query_text), k=k, exclude_ids=exclude_ids, metadata_filter=metadata_filter)
         except Exception as e:
             print(f"[VectorService] Error searching: {e}")
             return []
 
+    def search_by_vector(self, query_vector: List[float], k: int = 10, exclude_ids: Optional[List[str]] = None,
+                         metadata_filter: Optional[Dict] = None) -> List[Dict]:
+        """
+        Same as search() for a query that is already embedded. Exclusions
+        and metadata_filter run inside Pinecone, so every hit is eligible. Hits
+        are chunks: the query over-fetches VECTOR_CHUNK_OVERFETCH chunks per
+        result and folds the chunk scores per user before cutting to k.
+        """
+        query_filter = merge_filters(candidate_filter(exclude_ids=exclude_ids), metadata_filter)
+        query = {
+            "vector": query_vector,
+            "top_k": min(self.MAX_QUERY_TOP_K, k * Config.VECTOR_CHUNK_OVERFETCH),
+            "include_metadata": True,
+        }
+        if query_filter:
+            query["filter"] = query_filter
+        response = self.index.query(**query)
+
+        # matches arrive best-first, so the first hit per user is its best chunk
+        hits = {}
+        for match in response.matches:
+            user_id, _ = self.parse_vector_id(match.id)
+            hits.setdefault(user_id, []).append(match)
+
+        results = []
+        for user_id, matches in hits.items():
+            metadata = dict(matches[0].metadata or {})
+            metadata.pop("user_id", None)
+            results.append(
+                {
+                    "user_id": user_id,
+                    "similarity_score": self._aggregate_scores([float(m.score) for m in matches]),
+                    "metadata": metadata,
+                    "matched_chunks": len(matches),
+                }
+            )
+        results.sort(key=lambda result: result["similarity_score"], reverse=True)
+        return results[:k]
+
+    def _aggregate_scores(self, scores: List[float]) -> float:
+        """One similarity per user from its chunk scores (sorted best-first)."""
+        best = scores[0]
+        if Config.VECTOR_CHUNK_AGGREGATION != "softmax" or len(scores) == 1:
+            return best
+        # log-sum-exp: max plus a bonus that grows with the number of strong chunks
+        t = self.SOFTMAX_TEMPERATURE
+        return min(1.0, best + t * math.log(sum(math.exp((score - best) / t) for score in scores)))
+
+    def embed_queries(self, query_texts: List[str]) -> List[List[float]]:
+        """Embed many query strings in one model call (batch jobs)."""
+        if not query_texts:
+            return []
+        return self._embed_batch(query_texts)
+
     # ------------------------------------------------------------------
     # Convenience wrappers (called from profile routes)
     # ------------------------------------------------------------------
@@ -239,6 +477,130 @@ class VectorService:
             success = success and ok
         return success
 
+    # ------------------------------------------------------------------
+    # Reconciliation helpers
+    # ------------------------------------------------------------------
+
+    def iter_id_pages(self, page_size: int = 100) -> Iterator[List[str]]:
+        """Every vector id in the index, one page at a time."""
+        token = None
+        while True:
+            response = self.index.list_paginated(limit=page_size, pagination_token=token)
+            ids = [item.id for item in (response.vectors or [])]
+            if ids:
+                yield ids
+            token = response.pagination.next if response.pagination else None
+            if not token:
+                break
+
+    def fetch_metadata(self, ids: List[str]) -> Dict[str, Dict]:
+        """{id: metadata} for the ids present in the index."""
+        if not ids:
+            return {}
+        response = self.index.fetch(ids=list(ids))
+        return {vector_id: (vector.metadata or {}) for vector_id, vector in response.vectors.items()}
+
+    def fetch_user_metadata(self, user_ids: List[str]) -> Dict[str, Dict]:
+        """{user_id: metadata} read from each user's profile chunk (all chunks share it)."""
+        present = self.fetch_metadata([self.chunk_id(user_id, 0) for user_id in user_ids])
+        return {self.parse_vector_id(vector_id)[0]: metadata for vector_id, metadata in present.items()}
+
+    def _delete_in_batches(self, ids: List[str]):
+        for i in range(0, len(ids), self.DELETE_BATCH_SIZE):
+            self.index.delete(ids=ids[i:i + self.DELETE_BATCH_SIZE])
+
+    def delete_ids(self, ids: List[str]) -> bool:
+        try:
+            self._delete_in_batches(ids)
+            return True
+        except Exception as e:
+            print(f"[VectorService] Error deleting vectors: {e}")
+            return False
+
+    # ------------------------------------------------------------------
+    # Projects (PROJECT_NAMESPACE) — reverse matching
+    # ------------------------------------------------------------------
+
+    def _project_to_text(self, project: Dict) -> str:
+        """
+        Title, skills and the cached analysis first, description last: the
+        model truncates long inputs, and the short fields carry the signal.
+        """
+        description = project.get("description", "")
+        analysis = project.get("analysis") or {}
+        # an analysis of an older description no longer applies
+        description_hash = hashlib.sha256(description.encode("utf-8")).hexdigest()
+        result = (analysis.get("result") or {}) if analysis.get("description_hash") == description_hash else {}
+
+        parts = [f"Project: {project.get('title', '')}"]
+        skills = result.get("required_skills") or project.get("required_skills", [])
+        if skills:
+            parts.append(f"Skills: {', '.join(skills)}")
+        for key, label in (("required_roles", "Roles"), ("key_competencies", "Competencies")):
+            if result.get(key):
+                parts.append(f"{label}: {', '.join(result[key])}")
+        if description:
+            parts.append(f"Description: {description}")
+        return " | ".join(parts)
+
+    def _project_metadata(self, project: Dict) -> Dict:
+        metadata = {
+            "founder_id": str(project.get("founder_id", "")),
+            "title": project.get("title", ""),
+            "required_skills": project.get("required_skills", []),
+        }
+        if project.get("created_at"):
+            metadata["created_at"] = project["created_at"].replace(tzinfo=timezone.utc).timestamp()
+        return metadata
+
+    def upsert_projects(self, projects: List[Dict]) -> bool:
+        """Embed and upsert projects into PROJECT_NAMESPACE."""
+        if not projects:
+            return True
+        try:
+            vectors = self._embed_batch([self._project_to_text(project) for project in projects])
+            batch = [
+                (str(project["_id"]), vector, self._project_metadata(project))
+                for project, vector in zip(projects, vectors)
+            ]
+            for i in range(0, len(batch), self.UPSERT_BATCH_SIZE):
+                self._upsert_with_retry(batch[i:i + self.UPSERT_BATCH_SIZE], namespace=self.PROJECT_NAMESPACE)
+            return True
+        except Exception as e:
+            print(f"[VectorService] Error upserting projects: {e}")
+            return False
+
+    def upsert_project(self, project: Dict) -> bool:
+        return self.upsert_projects([project])
+
+    def remove_project(self, project_id: str) -> bool:
+        try:
+            self.index.delete(ids=[str(project_id)], namespace=self.PROJECT_NAMESPACE)
+            return True
+        except Exception as e:
+            print(f"[VectorService] Error removing project: {e}")
+            return False
+
+    def user_profile_vector(self, user_id: str) -> Optional[List[float]]:
+        """The stored profile-chunk embedding of a user, or None if not indexed yet."""
+        response = self.index.fetch(ids=[self.chunk_id(user_id, 0)])
+        vector = response.vectors.get(self.chunk_id(user_id, 0))
+        return list(vector.values) if vector else None
+
+    def search_projects(self, query_vector: List[float], k: int = 100,
+                        metadata_filter: Optional[Dict] = None) -> List[Dict]:
+        """Top-k projects for a query vector: [{"project_id", "score"}], best first."""
+        query = {
+            "vector": query_vector,
+            "top_k": k,
+            "namespace": self.PROJECT_NAMESPACE,
+            "include_metadata": False,
+        }
+        if metadata_filter:
+            query["filter"] = metadata_filter
+        response = self.index.query(**query)
+        return [{"project_id": match.id, "score": float(match.score)} for match in response.matches]
+
     def get_index_stats(self) -> Dict:
         """Return index statistics (useful for health checks / admin)."""
         try:
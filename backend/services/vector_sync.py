@@ -0,0 +1,97 @@
+from datetime import datetime
+
+from config import Config
+from models.user import User
+from models.vector_outbox import VectorOutbox
+from services.background_tasks import background_task
+from services.websocket_service import ws_service
+
+# VectorService for the queue workers (model loads once per process)
+_vector_service = None
+
+
+def _get_vector_service():
+    global _vector_service
+    if _vector_service is None:
+        from services.vector_service import VectorService
+        _vector_service = VectorService()
+    return _vector_service
+
+
+def _write_pending(entry, user):
+    """True while the user write an upsert entry describes hasn't landed yet."""
+    if entry.get("op", "upsert") != "upsert":
+        return False
+    if user is None:
+        return True
+    return bool(entry["updated_at"] and user.get("updated_at") and entry["updated_at"] > user["updated_at"])
+
+
+def _sync_batch(entries):
+    """Push the current state of every user in `entries` to the index in one batch."""
+    by_user = {}
+    for entry in entries:
+        by_user.setdefault(entry["user_id"], []).append(entry)
+
+    users = User.find_many_by_ids(list(by_user), "index")
+    # Without transactions the entry is written before the user write, so a
+    # drain can see it first: the user isn't inserted yet, or still has the
+    # old state. Those entries wait for the write instead of syncing (or
+    # removing) too early; once out of attempts the write is taken to have
+    # failed and the current state is synced.
+    deferred = [
+        entry for entry in entries
+        if entry.get("attempts", 0) + 1 < Config.JOB_MAX_ATTEMPTS and _write_pending(entry, users.get(entry["user_id"]))
+    ]
+    deferred_ids = {entry["_id"] for entry in deferred}
+    entries = [entry for entry in entries if entry["_id"] not in deferred_ids]
+    VectorOutbox.defer(deferred)
+
+    # entries whose change is already in the index (an earlier batch synced a newer state)
+    done = [
+        entry
+        for entry in entries
+        if entry["user_id"] in users
+        and users[entry["user_id"]].get("vector_synced_at") and entry["updated_at"]
+        and entry["updated_at"] <= users[entry["user_id"]]["vector_synced_at"]
+    ]
+    done_ids = {entry["_id"] for entry in done}
+    pending_users = {entry["user_id"] for entry in entries if entry["_id"] not in done_ids}
+    to_upsert = [users[user_id] for user_id in pending_users if user_id in users]
+    to_remove = [user_id for user_id in pending_users if user_id not in users]
+
+    vector_service = _get_vector_service()
+    if to_upsert:
+        User.attach_resume_text(to_upsert)
+        if not vector_service.build_index(to_upsert):
+            raise RuntimeError(f"Vector batch upsert failed for {len(to_upsert)} users")
+    for user_id in to_remove:
+        if not vector_service.remove_user(user_id):
+            raise RuntimeError(f"Vector delete failed for user {user_id}")
+
+    for user in to_upsert:
+        User.mark_vector_synced(user["_id"], user.get("updated_at") or datetime.utcnow(), vector_service.text_hash(user))
+        ws_service.emit_vector_update(user["_id"], "completed")
+    VectorOutbox.complete(entry["_id"] for entry in entries)
+    return len(to_upsert) + len(to_remove)
+
+
+@background_task(priority=10)
+def sync_vector_outbox(batch_size=None):
+    """Drain the vector outbox in batches until it is empty."""
+    batch_size = batch_size or Config.VECTOR_SYNC_BATCH_SIZE
+    synced = 0
+    while True:
+        entries = VectorOutbox.claim_batch(batch_size)
+        if not entries:
+            break
+        try:
+            synced += _sync_batch(entries)
+        except Exception as e:
+            print(f"[VectorSync] Batch of {len(entries)} failed: {e}")
+            for user_id in VectorOutbox.retry(entries, str(e)):
+                ws_service.emit_vector_update(user_id, "failed")
+            break
+    if synced:
+        print(f"[VectorSync] Synced {synced} users")
+    return synced
@@ -0,0 +1,38 @@
+import os
+import sys
+import uuid
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def mongo_db():
+    """
+    A throwaway database on a real mongod (TEST_MONGODB_URI, default
+    localhost). Tests using it are skipped when no server is reachable.
+    """
+    from pymongo import MongoClient
+    from pymongo.errors import PyMongoError
+
+    uri = os.getenv("TEST_MONGODB_URI", "mongodb://localhost:27017/")
+    probe = MongoClient(uri, serverSelectionTimeoutMS=1000)
+    try:
+        probe.admin.command("ping")
+    except PyMongoError:
+        probe.close()
+        pytest.skip(f"no mongod reachable at {uri}")
+
+    from config import Config
+    from models.db import get_db, reset_client
+
+    name = f"talentmatch_test_{uuid.uuid4().hex[:12]}"
+    Config.MONGODB_URI, Config.DB_NAME = uri, name
+    reset_client()
+    try:
+        yield get_db()
+    finally:
+        reset_client()
+        probe.drop_database(name)
+        probe.close()
@@ -0,0 +1,48 @@
+import pytest
+
+from models.indexes import INDEXES, QUERY_PLANS, check_query_plans, ensure_indexes, explain_query
+
+# Near-miss documents: each matches only part of a registered query, so an
+# index covering just that part does measurable work during plan selection
+# and the planner's choice is deterministic rather than a tie on empty data.
+SEED = {
+    "collaborations": (
+        [{"project_id": "probe", "candidate_id": f"other-{i}", "founder_id": "f", "status": "accepted"}
+         for i in range(20)]
+        + [{"project_id": f"other-{i}", "candidate_id": "probe", "founder_id": "f", "status": "accepted"}
+           for i in range(20)]
+    ),
+    "messages": [
+        {"project_id": "probe", "sender_id": f"s-{i}", "dm_recipient_id": f"r-{i}", "created_at": i}
+        for i in range(20)
+    ],
+}
+
+
+@pytest.fixture(scope="module")
+def indexed_db(mongo_db):
+    for collection, docs in SEED.items():
+        mongo_db[collection].insert_many([dict(doc) for doc in docs])
+    ensure_indexes()
+    return mongo_db
+
+
+@pytest.mark.parametrize(
+    "collection, query, sort, index_name",
+    QUERY_PLANS,
+    ids=[f"{collection}-{index_name}" for collection, _, _, index_name in QUERY_PLANS],
+)
+def test_hot_query_uses_declared_index(indexed_db, collection, query, sort, index_name):
+    stages, index_names = explain_query(collection, query, sort)
+    assert "COLLSCAN" not in stages, f"{collection} {query} scans: {stages}"
+    assert index_names == [index_name], f"{collection} {query} used {index_names}"
+
+
+def test_registry_names_declared_indexes():
+    for collection, _, _, index_name in QUERY_PLANS:
+        declared = {index.document["name"] for index in INDEXES[collection]}
+        assert index_name in declared, f"{collection}.{index_name} is not in INDEXES"
+
+
+def test_check_query_plans_reports_nothing(indexed_db):
+    assert check_query_plans() == []
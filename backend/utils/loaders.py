@@ -0,0 +1,66 @@
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+
+from flask import g, has_app_context
+
+from models.project import Project
+from models.user import User
+
+
+class BatchLoader:
+    """
+    DataLoader-style batching for synchronous request handlers.
+
+    Callers prime() every id they are about to need; the first load()
+    then resolves all pending ids with a single batch_fn call. Results are
+    memoized for the lifetime of the loader (one request).
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Hashable]], Dict[Hashable, dict]]):
+        self._batch_fn = batch_fn
+        self._cache: Dict[Hashable, Optional[dict]] = {}
+        self._pending = set()
+
+    def prime(self, keys: Iterable[Hashable]) -> "BatchLoader":
+        for key in keys:
+            if key and key not in self._cache:
+                self._pending.add(key)
+        return self
+
+    def dispatch(self):
+        if not self._pending:
+            return
+        keys = list(self._pending)
+        self._pending.clear()
+        found = self._batch_fn(keys)
+        for key in keys:
+            self._cache[key] = found.get(key)
+
+    def load(self, key: Hashable) -> Optional[dict]:
+        if key not in self._cache:
+            self.prime([key])
+            self.dispatch()
+        return self._cache.get(key)
+
+    def load_many(self, keys: Iterable[Hashable]) -> List[Optional[dict]]:
+        keys = list(keys)
+        self.prime(keys)
+        self.dispatch()
+        return [self._cache.get(key) for key in keys]
+
+
+def _request_loader(name: str, batch_fn) -> BatchLoader:
+    """One loader per name per request, kept on flask.g."""
+    if not has_app_context():
+        return BatchLoader(batch_fn)
+    loaders = g.setdefault("_batch_loaders", {})
+    if name not in loaders:
+        loaders[name] = BatchLoader(batch_fn)
+    return loaders[name]
+
+
+def user_loader(projection: str = "card") -> BatchLoader:
+    return _request_loader(f"users:{projection}", lambda ids: User.find_many_by_ids(ids, projection))
+
+
+def project_loader() -> BatchLoader:
+    return _request_loader("projects", Project.find_many_by_ids)
@@ -0,0 +1,94 @@
+from typing import Dict, Optional
+
+# Structured candidate filters use Pinecone's metadata filter syntax (a
+# subset of MongoDB query operators); matches_filter evaluates the same
+# syntax for local backends such as services/lexical_index.py.
+FOUNDER_ROLE = "founder"
+
+
+def normalize_location(value) -> str:
+    return " ".join(str(value or "").lower().split())
+
+
+def _number(value) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def filter_fields(user: Dict) -> Dict:
+    """The filterable fields of a user, as stored on every vector / lexical document."""
+    return {
+        "user_id": str(user["_id"]),
+        "role": user.get("role") or "user",
+        "experience_years": _number(user.get("experience_years")),
+        "location_key": normalize_location(user.get("location")),
+        "has_resume": bool(user.get("resume")),
+    }
+
+
+def candidate_filter(exclude_ids=None, exclude_founders=False, min_experience=None, max_experience=None,
+                     locations=None, has_resume=None) -> Optional[Dict]:
+    """
+    Build a filter from search criteria; None when nothing is restricted.
+    Locations match case- and whitespace-insensitively against the
+    profile's location string.
+    """
+    clauses = []
+    if exclude_ids:
+        clauses.append({"user_id": {"$nin": [str(user_id) for user_id in exclude_ids]}})
+    if exclude_founders:
+        clauses.append({"role": {"$ne": FOUNDER_ROLE}})
+    if min_experience is not None:
+        clauses.append({"experience_years": {"$gte": _number(min_experience)}})
+    if max_experience is not None:
+        clauses.append({"experience_years": {"$lte": _number(max_experience)}})
+    if locations:
+        clauses.append({"location_key": {"$in": [normalize_location(location) for location in locations]}})
+    if has_resume is not None:
+        clauses.append({"has_resume": {"$eq": bool(has_resume)}})
+    return merge_filters(*clauses)
+
+
+def merge_filters(*filters) -> Optional[Dict]:
+    """AND together the non-empty filters."""
+    filters = [f for f in filters if f]
+    if not filters:
+        return None
+    return filters[0] if len(filters) == 1 else {"$and": filters}
+
+
+_OPERATORS = {
+    "$eq": lambda value, arg: value == arg,
+    "$ne": lambda value, arg: value != arg,
+    "$gt": lambda value, arg: value is not None and value > arg,
+    "$gte": lambda value, arg: value is not None and value >= arg,
+    "$lt": lambda value, arg: value is not None and value < arg,
+    "$lte": lambda value, arg: value is not None and value <= arg,
+    "$in": lambda value, arg: value in arg,
+    "$nin": lambda value, arg: value not in arg,
+}
+
+
+def matches_filter(metadata: Dict, metadata_filter: Optional[Dict]) -> bool:
+    """Evaluate a filter against one document's metadata."""
+    if not metadata_filter:
+        return True
+    for key, condition in metadata_filter.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_filter(metadata, clause) for clause in condition):
+                return False
+        else:
+            value = metadata.get(key)
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            for operator, arg in condition.items():
+                if operator not in _OPERATORS:
+                    raise ValueError(f"Unsupported filter operator: {operator}")
+                if not _OPERATORS[operator](value, arg):
+                    return False
+    return True
@@ -0,0 +1,146 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from bson.objectid import ObjectId
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+# Keyset orderings. Each is a tuple of (field, direction) ending in _id so
+# the order is total and stable even when created_at ties.
+NEWEST_FIRST = (("created_at", -1), ("_id", -1))
+ID_DESC = (("_id", -1),)
+ID_ASC = (("_id", 1),)
+UPDATED_ASC = (("updated_at", 1), ("_id", 1))
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return {"$oid": str(value)}
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    # cursors come from clients: anything but a scalar or a tagged ObjectId /
+    # datetime could smuggle query operators into the keyset filter
+    if isinstance(value, dict):
+        if set(value) == {"$oid"}:
+            return ObjectId(value["$oid"])
+        if set(value) == {"$date"}:
+            return datetime.fromisoformat(value["$date"])
+        raise ValueError("unsupported cursor value")
+    if value is not None and not isinstance(value, (str, int, float, bool)):
+        raise ValueError("unsupported cursor value")
+    return value
+
+
+def encode_cursor(doc: Dict[str, Any], order: Sequence[Tuple[str, int]]) -> str:
+    """Opaque token holding the sort-key values of the last document on a page."""
+    payload = [_encode_value(doc.get(field)) for field, _ in order]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, order: Sequence[Tuple[str, int]]) -> List[Any]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(order):
+            raise ValueError("cursor shape mismatch")
+        return [_decode_value(v) for v in values]
+    except Exception as exc:
+        raise InvalidCursor(f"Invalid cursor: {exc}") from exc
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Cursor for lists ranked outside MongoDB (e.g. vector search results), where keysets don't apply."""
+    raw = json.dumps({"offset": int(offset)}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_offset_cursor(token: str) -> int:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        value = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        offset = value["offset"]
+        if not isinstance(offset, int) or offset < 0:
+            raise ValueError("bad offset")
+        return offset
+    except Exception as exc:
+        raise InvalidCursor(f"Invalid cursor: {exc}") from exc
+
+
+def _after_clause(values: List[Any], order: Sequence[Tuple[str, int]]) -> Dict[str, Any]:
+    """Filter for documents strictly after `values` in `order` (lexicographic keyset)."""
+    branches = []
+    for i, (field, direction) in enumerate(order):
+        branch = {f: values[j] for j, (f, _) in enumerate(order[:i])}
+        branch[field] = {"$lt" if direction < 0 else "$gt": values[i]}
+        branches.append(branch)
+    return branches[0] if len(branches) == 1 else {"$or": branches}
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    if not limit:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(MAX_PAGE_SIZE, int(limit)))
+
+
+def keyset_page(
+    collection,
+    query: Dict[str, Any],
+    order: Sequence[Tuple[str, int]] = NEWEST_FIRST,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    projection: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Fetch one page of `query` in keyset order. Returns (docs, next_cursor);
+    next_cursor is None on the last page. Reads limit + 1 docs to know
+    whether another page exists, so there is no count() round trip.
+    """
+    limit = clamp_limit(limit)
+    if cursor:
+        after = _after_clause(decode_cursor(cursor, order), order)
+        query = {"$and": [query, after]} if query else after
+
+    docs = list(collection.find(query, projection).sort(list(order)).limit(limit + 1))
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    next_cursor = encode_cursor(docs[-1], order) if has_more and docs else None
+    return docs, next_cursor
+
+
+def iter_keyset_pages(collection, query, order, page_size, projection=None, after=None):
+    """
+    Yield every document matching `query` in keyset order, one list per page,
+    starting strictly after the sort-key values `after` if given. For batch
+    jobs: no MAX_PAGE_SIZE clamp, and memory stays bounded by one page.
+    """
+    while True:
+        page_query = query
+        if after is not None:
+            clause = _after_clause(list(after), order)
+            page_query = {"$and": [query, clause]} if query else clause
+        docs = list(collection.find(page_query, projection).sort(list(order)).limit(page_size))
+        if not docs:
+            return
+        after = [docs[-1].get(field) for field, _ in order]
+        yield docs
+
+
+def parse_page_args(args) -> Tuple[int, Optional[str]]:
+    """Read ?limit= and ?cursor= from request args; bad limits fall back to the default."""
+    try:
+        limit = clamp_limit(int(args.get("limit", DEFAULT_PAGE_SIZE)))
+    except (TypeError, ValueError):
+        limit = DEFAULT_PAGE_SIZE
+    return limit, args.get("cursor") or None
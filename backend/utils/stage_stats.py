@@ -0,0 +1,27 @@
+import threading
+
+
+class StageStats:
+    """Item count and cumulative busy time for one pipeline stage (thread-safe)."""
+
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.failures = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds, ok=True, count=1):
+        with self._lock:
+            self.items += count
+            self.busy_seconds += seconds
+            if not ok:
+                self.failures += count
+
+    def report(self, wall_seconds, unit="items"):
+        rate = self.items / wall_seconds if wall_seconds else 0.0
+        avg_ms = (self.busy_seconds / self.items * 1000) if self.items else 0.0
+        return (
+            f"  {self.name:<8} {self.items:>6} {unit}  {rate:8.2f}/s  "
+            f"avg {avg_ms:8.1f} ms  failures {self.failures}"
+        )
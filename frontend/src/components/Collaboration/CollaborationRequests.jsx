@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import { collaborationAPI } from '../../services/api';
+import { collaborationAPI, fetchAllPages } from '../../services/api';
 import Button from '../Common/Button';
 import palette from '../../palette';
 
@@ -18,8 +18,8 @@ const CollaborationRequests = ({ user, onRequestUpdate }) => {
 
   const fetchRequests = async () => {
     try {
-      const response = await collaborationAPI.getMyRequests();
-      setRequests(response.data.requests.filter(r => r.status === 'pending'));
+      const allRequests = await fetchAllPages(collaborationAPI.getMyRequests, 'requests');
+      setRequests(allRequests.filter(r => r.status === 'pending'));
     } catch (error) {
       console.error('Error fetching requests:', error);
     } finally {
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { projectAPI, matchingAPI, collaborationAPI } from '../../services/api';
+import { projectAPI, matchingAPI, collaborationAPI, fetchAllPages } from '../../services/api';
 import Button from '../Common/Button';
 import TeamView from '../Collaboration/TeamView';
 import MetricTile from '../Common/primitives/MetricTile';
@@ -58,8 +58,7 @@ const FounderDashboard = ({ user }) => {
 
   const fetchProjects = async () => {
     try {
-      const response = await projectAPI.getMyProjects();
-      const projectList = response.data.projects || [];
+      const projectList = await fetchAllPages(projectAPI.getMyProjects, 'projects');
       const liveProjects = projectList.filter((project) => project.live);
       const cachedMatchTotal = liveProjects.reduce(
         (sum, project) => sum + getCachedProjectMatchCount(project._id),
@@ -101,11 +100,11 @@ const FounderDashboard = ({ user }) => {
       );
       const totalMatches = resolvedMatchCounts.reduce((sum, count) => sum + count, 0);
 
-      const requestsResponse = await collaborationAPI.getMyRequests().catch(
-        () => ({ data: { requests: [] } })
+      const requestList = await fetchAllPages(collaborationAPI.getMyRequests, 'requests').catch(
+        () => []
       );
 
-      const pendingRequests = (requestsResponse.data?.requests || []).filter(
+      const pendingRequests = requestList.filter(
         (request) => request.status === 'pending'
       ).length;
 
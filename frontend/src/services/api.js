@@ -51,9 +51,10 @@ export const authAPI = {
 
 export const projectAPI = {
   create: (data) => api.post("/projects", data),
-  getMyProjects: () => api.get("/projects/my-projects"),
+  getMyProjects: (params = {}) => api.get("/projects/my-projects", { params }),
   getProject: (id) => api.get(`/projects/${id}`),
-  getLiveProjects: () => api.get("/projects/live"),
+  getLiveProjects: (params = {}) => api.get("/projects/live", { params }),
+  getRecommendedProjects: (params = {}) => api.get("/projects/recommended", { params }),
 };
 
 export const matchingAPI = {
@@ -84,7 +85,7 @@ export const profileAPI = {
 
 export const collaborationAPI = {
   sendRequest: (data) => api.post("/collaboration/send-request", data),
-  getMyRequests: () => api.get("/collaboration/my-requests"),
+  getMyRequests: (params = {}) => api.get("/collaboration/my-requests", { params }),
   getSentRequestsForProject: (projectId) =>
     api.get(`/collaboration/sent-requests/${projectId}`),
   acceptRequest: (collaborationId) =>
@@ -101,7 +102,7 @@ export const collaborationAPI = {
   getMyProjects: () => api.get("/collaboration/my-projects"),
   withdrawRequest: (collaborationId) =>
     api.post(`/collaboration/withdraw/${collaborationId}`),
-  getRequestHistory: () => api.get("/collaboration/history"),
+  getRequestHistory: (params = {}) => api.get("/collaboration/history", { params }),
 };
 
 export const chatAPI = {
@@ -113,4 +114,17 @@ export const chatAPI = {
   getUnreadCount: (projectId) => api.get(`/chat/unread-count/${projectId}`),
 };
 
+// Follows paging.next_cursor through every page of a cursor-paged list
+// endpoint and returns the concatenated `key` items.
+export const fetchAllPages = async (fetchPage, key, params = {}) => {
+  const items = [];
+  let cursor = null;
+  do {
+    const response = await fetchPage({ ...params, limit: 100, ...(cursor ? { cursor } : {}) });
+    items.push(...(response.data[key] || []));
+    cursor = response.data.paging?.next_cursor || null;
+  } while (cursor);
+  return items;
+};
+
 export default api;